@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks dos extratores sobre o corpus offline (fixtures/).
+
+Mede latência por chamada (mediana e p95) e vazão em páginas/s de:
+- IFoodScraper._extract_all_data, _process_info_text, _process_footer_text e
+  _process_card_texts (páginas de listagem em fixtures/listing)
+- RestaurantDetailsScraper._get_address_info, _extract_payment_methods,
+  _extract_minimum_order (páginas de restaurante em fixtures/merchant)
+
+O corpus é sintético (gerado por generate_fixtures.py). A baseline gravada
+(fixtures/benchmark_baseline.json) tem tempos absolutos de uma máquina só: a
+coluna "vs baseline" é informativa e só vira verificação de regressão com
+--check-baseline, para usar na mesma máquina em que a baseline foi gravada.
+
+Uso:
+    python benchmark_parsers.py                     # todos os parsers instalados
+    python benchmark_parsers.py --parser lxml --repeat 10
+    python benchmark_parsers.py --check-baseline    # sai com 1 se piorar além da tolerância
+    python benchmark_parsers.py --save-baseline     # grava os números atuais como baseline
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from src.ifood_scraper import IFoodScraper
+from src.restaurant_details_scraper import RestaurantDetailsScraper
+from src.html_parser import PARSER_BACKENDS
+
+
+# Seed fixa do hash de strings: o custo das buscas por classe no bs4 varia
+# bastante entre processos conforme a seed, o que mascararia regressões
+HASH_SEED = '0'
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+BASELINE_PATH = FIXTURES / 'benchmark_baseline.json'
+
+# Localização devolvida pelo navegador falso em _extract_all_data
+FIXTURE_LOCATION = {'delivery_lat': -18.9395041, 'delivery_lng': -48.3059029, 'geohash': '6utskb0v3k6t'}
+
+
+class _OfflineBrowser:
+    """Substitui o Chrome no _get_user_location (única chamada ao navegador na extração)."""
+
+    def execute_script(self, *args):
+        return FIXTURE_LOCATION
+
+
+def load_corpus():
+    """Lê as páginas de listagem e de restaurante do corpus."""
+    listing = [p.read_text(encoding='utf-8') for p in sorted((FIXTURES / 'listing').glob('*.html'))]
+    merchant = [p.read_text(encoding='utf-8') for p in sorted((FIXTURES / 'merchant').glob('*.html'))]
+    if not listing or not merchant:
+        raise FileNotFoundError("Corpus incompleto: esperado fixtures/listing/*.html e fixtures/merchant/*.html")
+    return listing, merchant
+
+
+def time_calls(fn, pages, repeat):
+    """
+    Executa fn sobre cada página (lista de argumentos por chamada) `repeat` vezes,
+    após uma passada de aquecimento e com o coletor de lixo desligado (como o timeit).
+
+    Returns:
+        dict: chamadas, mediana e p95 por chamada (µs), melhor mediana entre as
+        passadas (µs, usada na comparação com a baseline por ser a menos ruidosa) e páginas/s
+    """
+    durations = []
+    pass_medians = []
+    total = 0.0
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for calls in pages:
+            for args in calls:
+                fn(*args)
+
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                pass_durations = []
+                for calls in pages:
+                    page_start = time.perf_counter()
+                    for args in calls:
+                        start = time.perf_counter()
+                        fn(*args)
+                        pass_durations.append(time.perf_counter() - start)
+                    total += time.perf_counter() - page_start
+                durations += pass_durations
+                pass_medians.append(statistics.median(pass_durations))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    durations.sort()
+    return {
+        'calls': len(durations),
+        'median_us': statistics.median(durations) * 1e6,
+        'p95_us': durations[int(0.95 * (len(durations) - 1))] * 1e6,
+        'best_us': min(pass_medians) * 1e6,
+        'pages_per_s': repeat * len(pages) / total if total else 0.0,
+    }
+
+
+def build_targets(backend, listing_pages, merchant_pages, with_text=True):
+    """Monta (nome, função, páginas) de cada alvo para um backend de parsing."""
+    listing = IFoodScraper(parser_backend=backend)
+    listing.browser = _OfflineBrowser()
+    details = RestaurantDetailsScraper(parser_backend=backend)
+
+    docs = [[(details.html_parser.parse(html),)] for html in merchant_pages]
+    targets = [
+        (f'_extract_all_data[{backend}]', listing._extract_all_data, [[(html,)] for html in listing_pages]),
+        (f'_get_address_info[{backend}]', details._get_address_info, docs),
+        (f'_extract_payment_methods[{backend}]', details._extract_payment_methods, docs),
+        (f'_extract_minimum_order[{backend}]', details._extract_minimum_order, docs),
+    ]
+
+    if with_text:
+        # Textos dos cards de cada página (independem do parser)
+        info_pages, footer_pages, card_pages = [], [], []
+        for html in listing_pages:
+            containers = listing.html_parser.parse(html).find_all('div', class_='merchant-list-v2__item-wrapper')
+            infos = [c.find('div', class_='merchant-v2__info') for c in containers]
+            footers = [c.find('div', class_='merchant-v2__footer') for c in containers]
+            info_pages.append([(node.text if node else '',) for node in infos])
+            footer_pages.append([(node.text if node else '',) for node in footers])
+            # Lote: todos os textos da página numa chamada
+            card_pages.append([([args[0] for args in info_pages[-1]], [args[0] for args in footer_pages[-1]])])
+        targets += [
+            ('_process_info_text', listing._process_info_text, info_pages),
+            ('_process_footer_text', listing._process_footer_text, footer_pages),
+            ('_process_card_texts', listing._process_card_texts, card_pages),
+        ]
+
+    return targets
+
+
+def load_baseline(path):
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8')).get('results', {})
+
+
+def save_baseline(path, results):
+    path.write_text(json.dumps({
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': results,
+    }, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks dos extratores sobre o corpus offline")
+    parser.add_argument('--parser', '-p', action='append', choices=PARSER_BACKENDS,
+                        help='Backend a medir (repetível; padrão: todos os instalados)')
+    parser.add_argument('--repeat', '-r', type=int, default=10, help='Passadas sobre o corpus (padrão: 10)')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Piora relativa aceita (melhor mediana entre passadas) antes de acusar regressão (padrão: 0.25)')
+    parser.add_argument('--check-baseline', action='store_true',
+                        help='Falha se algum alvo piorar além da tolerância; só faz sentido na máquina da baseline (padrão: só exibe)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH,
+                        help=f'Arquivo de baseline (padrão: {BASELINE_PATH.relative_to(Path(__file__).parent)})')
+    parser.add_argument('--save-baseline', action='store_true', help='Grava os resultados como nova baseline')
+    args = parser.parse_args()
+
+    if os.environ.get('PYTHONHASHSEED') != HASH_SEED:
+        return subprocess.call([sys.executable, *sys.argv], env={**os.environ, 'PYTHONHASHSEED': HASH_SEED})
+
+    listing_pages, merchant_pages = load_corpus()
+    print(f"📂 Corpus: {len(listing_pages)} listagens, {len(merchant_pages)} restaurantes; {args.repeat} passadas\n")
+
+    results = {}
+    for backend in args.parser or PARSER_BACKENDS:
+        try:
+            targets = build_targets(backend, listing_pages, merchant_pages,
+                                    with_text='_process_info_text' not in results)
+        except ImportError as e:
+            print(f"⏭️ {backend}: {e}")
+            continue
+        for name, fn, pages in targets:
+            results[name] = time_calls(fn, pages, args.repeat)
+
+    baseline = load_baseline(args.baseline)
+    regressions = []
+
+    print(f"{'alvo':<38} {'chamadas':>8} {'mediana µs':>11} {'p95 µs':>10} {'melhor µs':>10} "
+          f"{'págs/s':>10} {'vs baseline':>12}")
+    for name, r in results.items():
+        comparison = ''
+        if name in baseline:
+            change = r['best_us'] / baseline[name]['best_us'] - 1
+            comparison = f"{change:+.0%}"
+            if args.check_baseline and change > args.tolerance:
+                regressions.append(name)
+                comparison += ' ❌'
+        print(f"{name:<38} {r['calls']:>8} {r['median_us']:>11.1f} {r['p95_us']:>10.1f} {r['best_us']:>10.1f} "
+              f"{r['pages_per_s']:>10.1f} {comparison:>12}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, {**baseline, **results})
+        print(f"\n💾 Baseline gravada em {args.baseline}")
+    elif regressions:
+        print(f"\n❌ Regressões acima de {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    elif baseline and args.check_baseline:
+        print(f"\n✅ Sem regressões acima de {args.tolerance:.0%}")
+    elif baseline:
+        print("\nℹ️ Comparação só informativa (a baseline tem tempos absolutos de uma máquina); "
+              "use --check-baseline para tratar pioras como regressão")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Comparativo dos perfis de navegador (default x lean) nas páginas de restaurante.
+
+Abre as primeiras N URLs da listagem mais recente com cada perfil e mede o
+tempo até a página ficar pronta e os bytes transferidos (eventos de rede do
+log 'performance' do Chrome).
+
+Uso:
+    python compare_browser_profiles.py                  # 5 restaurantes
+    python compare_browser_profiles.py --urls 10
+    python compare_browser_profiles.py --blocklist meus_dominios.txt
+    python compare_browser_profiles.py --base-url http://127.0.0.1:8765   # contra o mock local
+"""
+
+import argparse
+import time
+
+from src.restaurant_details_scraper import RestaurantDetailsScraper
+from src.browser_profile import BROWSER_PROFILES, load_blocklist, network_usage
+from src.waits import page_ready
+
+
+def measure_profile(profile, urls, directory, blocklist, base_url=None):
+    """Carrega as URLs com um perfil e devolve as medições por página."""
+    scraper = RestaurantDetailsScraper(csv_directory=directory, browser_profile=profile, blocklist=blocklist,
+                                       base_url=base_url)
+    scraper.record_network = True
+
+    results = []
+    try:
+        start = time.perf_counter()
+        scraper._setup_browser()
+        startup = time.perf_counter() - start
+        network_usage(scraper.browser)  # descartar eventos da inicialização
+
+        for url in urls:
+            start = time.perf_counter()
+            try:
+                scraper.browser.get(scraper._page_url(url))
+                ready = scraper.waits.until(scraper.browser, 'page', page_ready())
+            except Exception as e:
+                print(f"   ⚠️ {url}: {e}")
+                ready = False
+            elapsed = time.perf_counter() - start
+
+            results.append({'url': url, 'seconds': elapsed, 'ready': ready, **network_usage(scraper.browser)})
+    finally:
+        if scraper.browser:
+            scraper.browser.quit()
+
+    return startup, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara tempo de carga e bytes dos perfis de navegador")
+    parser.add_argument('--urls', '-n', type=int, default=5, help='Número de restaurantes (padrão: 5)')
+    parser.add_argument('--directory', '-d', default='reports', help='Diretório da listagem (padrão: reports)')
+    parser.add_argument('--blocklist', default=None, help='Domínios de analytics a bloquear (padrão: lista embutida)')
+    parser.add_argument('--base-url', default=None, help='Troca o host das URLs, ex.: mock local (padrão: URLs do CSV)')
+    args = parser.parse_args()
+
+    blocklist = load_blocklist(args.blocklist) if args.blocklist else None
+
+    loader = RestaurantDetailsScraper(csv_directory=args.directory)
+    listing = loader._find_latest_csv()
+    urls = [url for _, url, _ in loader._load_tasks()[:args.urls]]
+    print(f"📂 Listagem: {listing.name} ({len(urls)} URLs)\n")
+
+    summary = {}
+    for profile in BROWSER_PROFILES:
+        print(f"🌐 Perfil {profile}...")
+        startup, results = measure_profile(profile, urls, args.directory, blocklist, args.base_url)
+
+        for r in results:
+            status = "✅" if r['ready'] else "❌"
+            print(f"   {status} {r['seconds']:6.2f}s {r['bytes'] / 1024:9.1f} KB "
+                  f"{r['requests']:4d} req {r['blocked']:4d} bloq  {r['url'][-50:]}")
+
+        pages = max(len(results), 1)
+        summary[profile] = {
+            'startup': startup,
+            'seconds': sum(r['seconds'] for r in results) / pages,
+            'kb': sum(r['bytes'] for r in results) / 1024 / pages,
+            'requests': sum(r['requests'] for r in results) / pages,
+        }
+        print()
+
+    print("📊 Médias por página:")
+    print(f"   {'perfil':<8} {'início':>8} {'carga':>8} {'KB':>10} {'req':>6}")
+    for profile, s in summary.items():
+        print(f"   {profile:<8} {s['startup']:7.2f}s {s['seconds']:7.2f}s {s['kb']:10.1f} {s['requests']:6.1f}")
+
+    default, lean = summary['default'], summary['lean']
+    if default['seconds'] and default['kb']:
+        print(f"\n⚡ lean: {100 * (1 - lean['seconds'] / default['seconds']):.0f}% menos tempo, "
+              f"{100 * (1 - lean['kb'] / default['kb']):.0f}% menos bytes")
+
+
+if __name__ == "__main__":
+    main()
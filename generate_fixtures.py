@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Gera o corpus sintético de fixtures/listing e fixtures/merchant.
+
+As páginas não são gravações do iFood: os nomes de classe que os extratores
+procuram (merchant-v2__info, merchant-details-payment__payment-subtype...) são
+os do site real, mas a marcação ao redor é inventada e o CSS `.cN` é enchimento
+para deixar o tamanho e a quantidade de nós próximos de uma página real.
+Restaurantes, endereços e preços saem de listas fixas com seed fixa, então a
+mesma versão do script gera os mesmos bytes. As listas de nomes, bairros e
+formas de pagamento vêm de synthetic_catalog.py, as mesmas do mock_ifood_server.py.
+
+A resposta do feed em fixtures/feed/ foi escrita à mão e não é gerada aqui.
+
+Uso:
+    python generate_fixtures.py                      # regrava fixtures/listing e fixtures/merchant
+    python generate_fixtures.py --output /tmp/fixtures
+
+Depois de mudar o corpus, regrave a baseline: python benchmark_parsers.py --save-baseline
+"""
+
+import argparse
+import random
+import uuid
+from pathlib import Path
+
+from synthetic_catalog import (
+    CATEGORIES, NAMES, SUFFIXES, CITIES, DISTRICTS, PAYMENT_LABELS, PAYMENT_TITLES, slug, city_slug
+)
+
+
+SEED = 2025
+LISTING_SIZES = (20, 100, 300)
+
+# Pagamento: bandeiras de cada forma (código de PAYMENT_LABELS), por seção (site / entrega)
+PAYMENT_BRANDS = {
+    'site': {'CREDIT': ['Visa', 'Mastercard', 'Elo', 'Amex'], 'DEBIT': ['Visa Débito', 'Elo Débito'],
+             'PIX': ['Pix'], 'MEAL_VOUCHER': ['Ticket', 'VR', 'Alelo', 'Sodexo']},
+    'entrega': {'CREDIT': ['Visa', 'Mastercard', 'Elo'], 'DEBIT': ['Visa Débito', 'Maestro'], 'PIX': ['Pix'],
+                'MEAL_VOUCHER': ['Ticket', 'VR'], 'CASH': ['Dinheiro']},
+}
+
+# Casos de restaurante: (nome, pedido mínimo, (rua, bairro), seções de pagamento, mostra horários)
+MERCHANTS = {
+    'merchant_full': ('Burger Central', 20.0, ('Avenida Sílvio Rugani, 715', 'Tubalina'),
+                      [('site', ['CREDIT', 'DEBIT', 'PIX', 'MEAL_VOUCHER']),
+                       ('entrega', ['CREDIT', 'DEBIT', 'PIX', 'MEAL_VOUCHER', 'CASH'])], True),
+    'merchant_online_only': ('Sushi Tokyo', 45.5, ('Rua Duque de Caxias, 1020', 'Centro'),
+                             [('site', ['CREDIT', 'PIX'])], True),
+    'merchant_no_minimum': ('Padaria da Vila', None, ('Rua Goiás, 88', 'Martins'),
+                            [('entrega', ['CASH', 'DEBIT'])], True),
+    'merchant_no_bairro': ('Cantina Bella Napoli', 1.5, ('Avenida Rondon Pacheco, 4600', None),
+                           [('site', ['CREDIT']), ('entrega', ['CREDIT', 'MEAL_VOUCHER'])], False),
+    'merchant_no_address': ('Empório Express', 15.0, None,
+                            [('site', ['DEBIT', 'PIX'])], True),
+}
+
+HEAD = """<!DOCTYPE html>
+<html lang="pt-BR"><head><meta charset="utf-8"><title>{title}</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<link rel="preload" href="https://static.ifood-static.com.br/webapp/fonts/iFoodRCTextos-Regular.woff2" as="font" crossorigin>
+<link rel="stylesheet" href="https://static.ifood-static.com.br/webapp/_next/static/css/app.css">
+<style>{css}</style>
+<script async src="https://www.googletagmanager.com/gtm.js?id=GTM-XXXX"></script>
+</head><body><div id="__next"><header class="app-header"><nav class="app-header__nav"><a class="app-header__logo" href="/">iFood</a>
+<button class="address-button" aria-label="Usar minha localização"><span class="address-button__label">Usar minha localização</span></button>
+<ul class="app-header__menu">{menu}</ul></nav></header>
+"""
+
+# Enchimento: 600 regras de CSS e o menu de categorias em todas as páginas
+CSS = ''.join(f'.c{i}{{margin:{i % 8}px;padding:{i % 5}px;color:#{i * 7919 % 0xffffff:06x}}}' for i in range(600))
+MENU = ''.join(f'<li class="app-header__menu-item"><a href="/categoria/{t.lower()}">{t}</a></li>' for t in CATEGORIES)
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _head(title):
+    return HEAD.format(title=title, css=CSS, menu=MENU)
+
+
+def listing_card(rng):
+    """Card da listagem; ~8% "Novo" sem nota, ~30% frete grátis, ~3% sem rodapé."""
+    city, uf = rng.choice(CITIES)
+    name = f"{rng.choice(NAMES)} {rng.choice(SUFFIXES)}"
+    url = f"/delivery/{city_slug(city, uf)}/{slug(name)}-{slug(rng.choice(DISTRICTS))}/{_uuid(rng)}"
+
+    if rng.random() < 0.08:
+        rating = '<span class="merchant-v2__rating merchant-v2__rating--new">Novo</span>'
+    else:
+        rating = ('<span class="merchant-v2__rating"><svg class="icon-star" width="10" height="10">'
+                  '<path d="M5 0l1.5 3.5L10 4l-2.7 2.3L8 10 5 8 2 10l.7-3.7L0 4l3.5-.5z"/></svg>'
+                  f'{rng.uniform(3.5, 5.0):.1f}</span>')
+    distance = f"{rng.uniform(0.3, 12):.1f}".replace('.', ',')
+    time_min = rng.choice([10, 15, 20, 25, 30, 35, 40, 45])
+    delivery_time = f"{time_min}-{time_min + 10} min" if rng.random() > 0.1 else f"{time_min} min"
+    fee = 'Grátis' if rng.random() < 0.3 else f"R$ {rng.uniform(1.99, 14.99):.2f}".replace('.', ',')
+
+    footer = ''
+    if rng.random() >= 0.03:
+        free = ' merchant-v2__delivery-fee--free' if fee == 'Grátis' else ''
+        footer = (f'<div class="merchant-v2__footer"><span>{delivery_time}</span>'
+                  f'<span class="merchant-v2__divider"> • </span>'
+                  f'<span class="merchant-v2__delivery-fee{free}">{fee}</span></div>')
+
+    return (f'<div class="merchant-list-v2__item-wrapper"><a class="merchant-v2__link" href="{url}" tabindex="0">'
+            f'<div class="merchant-v2__content"><div class="merchant-v2__logo"><img class="merchant-v2__image" alt="{name}" loading="lazy" '
+            f'src="https://static-images.ifood.com.br/image/upload/t_thumbnail/logosgde/{_uuid(rng)}_LOGO.png"></div>'
+            f'<div class="merchant-v2__info-wrapper"><span class="merchant-v2__name">{name}</span>'
+            f'<div class="merchant-v2__info">{rating}<span class="merchant-v2__divider"> • </span><span>{rng.choice(CATEGORIES)}</span>'
+            f'<span class="merchant-v2__divider"> • </span><span>{distance} km</span></div>{footer}</div></div></a></div>')
+
+
+def listing_page(rng, count):
+    """Página de listagem com `count` cards e o botão "Ver mais"."""
+    cards = ''.join(listing_card(rng) for _ in range(count))
+    return (_head('Restaurantes perto de você | iFood')
+            + '<main class="merchant-list-v2"><h2 class="title-section">Lojas</h2><div class="merchant-list-v2__wrapper">'
+            + cards + '</div><button class="cardstack-nextcontent__button" type="button">Ver mais</button></main>'
+            + '<footer class="app-footer"><p>© iFood</p></footer></div>'
+            + '<script id="__NEXT_DATA__" type="application/json">{"props":{"pageProps":{}},"page":"/restaurantes"}</script></body></html>\n')
+
+
+def payment_section(sections):
+    out = '<div class="merchant-details-payment">'
+    for kind, methods in sections:
+        brands = PAYMENT_BRANDS[kind]
+        out += f'<div class="merchant-details-payment__payment"><p class="merchant-details-payment__payment-type-title">{PAYMENT_TITLES[kind]}</p>'
+        for method in methods:
+            out += f'<p class="merchant-details-payment__payment-subtype">{PAYMENT_LABELS[method]}</p><div class="merchant-details-payment__payment-tags">'
+            out += ''.join(f'<span class="payment-tag"><img class="payment-tag__icon" src="https://static-images.ifood.com.br/image/upload/payment/'
+                           f'{brand.lower().replace(" ", "-")}.png" alt="">{brand}</span>' for brand in brands[method])
+            out += '</div>'
+        out += '</div>'
+    return out + '</div>'
+
+
+def merchant_page(rng, name, minimum, address, payment, schedule=True):
+    """Página de restaurante com aba Sobre, horários, pagamento e 60 pratos."""
+    city, uf = rng.choice(CITIES)
+
+    about = ''
+    if address:
+        street, district = address
+        about += ('<div class="merchant-details-about__info"><p class="merchant-details-about__info-title">Endereço</p>'
+                  f'<p class="merchant-details-about__info-data">{street}{" - " + district if district else ""}</p>'
+                  f'<p class="merchant-details-about__info-data">{city} - {uf}</p>'
+                  f'<p class="merchant-details-about__info-data">CEP: 38{rng.randint(100, 999)}-{rng.randint(0, 999):03d}</p></div>')
+    about += ('<div class="merchant-details-about__info"><p class="merchant-details-about__info-title">Outras informações</p>'
+              f'<p class="merchant-details-about__info-data">CNPJ: {rng.randint(10, 99)}.{rng.randint(100, 999)}.'
+              f'{rng.randint(100, 999)}/0001-{rng.randint(10, 99)}</p></div>')
+    if schedule:
+        about += '<div class="merchant-details-schedule">' + ''.join(
+            f'<div class="merchant-details-schedule__day"><span class="merchant-details-schedule__day-name">{day}</span><span>11:00 - 23:00</span></div>'
+            for day in ['Domingo', 'Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado']) + '</div>'
+
+    minimum_html = (f'<div class="merchant-info__minimum-order">Pedido mínimo R$ {minimum:.2f}</div>'.replace('.', ',', 1)
+                    if minimum is not None else '')
+    dishes = ''.join(
+        f'<li class="dish-card-wrapper"><a class="dish-card" href="#"><div class="dish-card__info"><h3 class="dish-card__description">Item {i}</h3>'
+        f'<p class="dish-card__details">Descrição do prato {i} com ingredientes selecionados da casa.</p>'
+        f'<span class="dish-card__price">R$ {rng.uniform(9, 89):.2f}'.replace('.', ',') + '</span></div>'
+        f'<img class="dish-card__image" src="https://static-images.ifood.com.br/image/upload/t_low/pratos/{_uuid(rng)}.jpg" alt=""></a></li>'
+        for i in range(60))
+
+    return (_head(f'{name} | iFood')
+            + '<main class="merchant-page"><div class="merchant-info"><div class="merchant-info__content">'
+            + f'<h1 class="merchant-info__title">{name}</h1><div class="merchant-info__detail-container">'
+            + '<span class="merchant-info__rating">4,7</span>' + minimum_html + '</div></div></div>'
+            + '<div class="merchant-details"><div class="marmita-tabs" role="tablist">'
+            + '<button class="marmita-tab marmita-tab--active" role="tab">Sobre</button><button class="marmita-tab" role="tab">Horário</button>'
+            + '<button class="marmita-tab" role="tab">Pagamento</button></div>'
+            + '<div class="merchant-details-about"><p class="merchant-details-about__description">Desde 1998 servindo a cidade com carinho.</p>'
+            + '<button class="merchant-details-about__description-see-more-button">Ver mais</button>'
+            + about + '</div>' + payment_section(payment) + '</div>'
+            + f'<section class="restaurant-menu"><ul class="restaurant-menu-group__list">{dishes}</ul></section></main>'
+            + '<footer class="app-footer"><p>© iFood</p></footer></div></body></html>\n')
+
+
+def generate(output, seed=SEED):
+    """Grava listing/*.html e merchant/*.html em `output`; devolve os arquivos gravados."""
+    rng = random.Random(seed)
+    written = []
+
+    (output / 'listing').mkdir(parents=True, exist_ok=True)
+    for count in LISTING_SIZES:
+        path = output / 'listing' / f'listing_{count}.html'
+        path.write_text(listing_page(rng, count), encoding='utf-8')
+        written.append(path)
+
+    (output / 'merchant').mkdir(parents=True, exist_ok=True)
+    for filename, (name, minimum, address, payment, schedule) in MERCHANTS.items():
+        path = output / 'merchant' / f'{filename}.html'
+        path.write_text(merchant_page(rng, name, minimum, address, payment, schedule), encoding='utf-8')
+        written.append(path)
+
+    return written
+
+
+def main():
+    default_output = Path(__file__).parent / 'fixtures'
+    parser = argparse.ArgumentParser(description="Gera o corpus sintético de páginas de listagem e de restaurante")
+    parser.add_argument('--output', '-o', type=Path, default=default_output,
+                        help='Diretório de saída (padrão: fixtures)')
+    parser.add_argument('--seed', type=int, default=SEED, help=f'Seed do corpus (padrão: {SEED})')
+    args = parser.parse_args()
+
+    for path in generate(args.output, args.seed):
+        print(f"📝 {path} ({path.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
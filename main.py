@@ -5,7 +5,18 @@ Script principal simplificado para executar o scraping do iFood.
 Uso:
     python main.py                           # Padrão: 10 scrolls
     python main.py --scrolls 15              # Customizar scrolls
+    python main.py --target-count 500        # Carrega até 500 restaurantes, sem esperas fixas
+    python main.py --pagination script       # Loop do "Ver mais" inteiro dentro da página
+    python main.py --prune-dom collapse      # Memória limitada: coleta em lotes e poda os cards do DOM
     python main.py --timeout 15              # Customizar timeout
+    python main.py --parser lxml             # Parser HTML mais rápido
+    python main.py --incremental             # Coleta os cards a cada "Ver mais"
+    python main.py --source network          # Lê o feed JSON da rede em vez do DOM
+    python main.py --format parquet          # Salva em Parquet tipado (requer pyarrow)
+    python main.py --browser-profile lean    # Chrome headless sem imagens/fontes/analytics
+    python main.py --offline                 # Sem rede para o ChromeDriver (usa o driver em cache)
+    python main.py --base-url http://127.0.0.1:8765  # Roda contra o mock local (mock_ifood_server.py)
+    python main.py --max-retries 3 --retry-delay 0.5  # Mais tentativas (com backoff) no botão "Ver mais"
 """
 
 import argparse
@@ -14,11 +25,6 @@ from pathlib import Path
 
 # Adicionar src ao path
 sys.path.append(str(Path(__file__).parent / 'src'))
-try:
-    from src.ifood_scraper import IFoodScraper
-except ImportError:
-    print("Erro: Arquivo src/ifood_scraper.py não encontrado.")
-    sys.exit(1)
 
 
 def main():
@@ -32,6 +38,29 @@ def main():
         help='Número de cliques no botão "Ver mais" (padrão: 10)'
     )
     
+    parser.add_argument(
+        '--target-count', '-k',
+        type=int,
+        default=None,
+        help='Clica "Ver mais" até ter K restaurantes ou a lista parar de crescer; ignora --scrolls (padrão: desligado)'
+    )
+    
+    parser.add_argument(
+        '--pagination',
+        choices=['driver', 'script'],
+        default='driver',
+        help='driver: um comando WebDriver por passo; script: loop do "Ver mais" num único script na página, '
+             'só com --source dom sem --incremental (padrão: driver)'
+    )
+    
+    parser.add_argument(
+        '--prune-dom',
+        choices=['collapse', 'remove'],
+        default=None,
+        help='Memória limitada: coleta os cards em lotes (implica --incremental) e depois os esvazia (collapse) '
+             'ou remove (remove) do DOM da página (padrão: desligado)'
+    )
+    
     parser.add_argument(
         '--timeout', '-t',
         type=int,
@@ -39,16 +68,111 @@ def main():
         help='Timeout em segundos (padrão: 10)'
     )
     
+    parser.add_argument(
+        '--parser', '-p',
+        choices=['html.parser', 'strainer', 'lxml', 'selectolax'],
+        default='html.parser',
+        help='Backend de parsing HTML (padrão: html.parser)'
+    )
+    
+    parser.add_argument(
+        '--incremental', '-i',
+        action='store_true',
+        help='Coleta e parseia apenas os cards novos após cada "Ver mais"'
+    )
+    
+    parser.add_argument(
+        '--source',
+        choices=['dom', 'network'],
+        default='dom',
+        help='dom: raspa os cards renderizados; network: lê o feed JSON dos logs de rede (padrão: dom)'
+    )
+    
+    parser.add_argument(
+        '--format',
+        choices=['csv', 'parquet'],
+        default='csv',
+        help='Formato do arquivo de saída; parquet grava colunas tipadas e comprimidas (padrão: csv)'
+    )
+    
+    parser.add_argument(
+        '--browser-profile',
+        choices=['default', 'lean'],
+        default='default',
+        help='lean: headless, viewport pequeno, bloqueia imagens/fontes/mídia e analytics (padrão: default)'
+    )
+    
+    parser.add_argument(
+        '--blocklist',
+        default=None,
+        help='Arquivo com domínios de analytics a bloquear no perfil lean, um por linha (padrão: lista embutida)'
+    )
+    
+    parser.add_argument(
+        '--driver-path',
+        default=None,
+        help='Caminho fixo do ChromeDriver (padrão: $CHROMEDRIVER_PATH, cache local ou download)'
+    )
+    
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Não consulta a rede para resolver o ChromeDriver; usa apenas drivers locais/em cache'
+    )
+    
+    parser.add_argument(
+        '--base-url',
+        default='https://www.ifood.com.br',
+        help='URL base do site; use a do mock local para testes offline (padrão: https://www.ifood.com.br)'
+    )
+    
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=1,
+        help='Novas tentativas quando o botão "Ver mais" ainda não apareceu (padrão: 1)'
+    )
+    
+    parser.add_argument(
+        '--retry-delay',
+        type=float,
+        default=1.0,
+        help='Espera base (s) do backoff exponencial com jitter entre tentativas (padrão: 1.0)'
+    )
+    
     args = parser.parse_args()
     
+    # Dependências pesadas (pandas, selenium, bs4) só depois do argparse:
+    # --help e erros de argumento respondem sem carregá-las
+    try:
+        from src.ifood_scraper import IFoodScraper
+        from src.browser_profile import load_blocklist
+    except ImportError:
+        print("Erro: Arquivo src/ifood_scraper.py não encontrado.")
+        return 1
+    
     print("Iniciando scraping simplificado do iFood...")
-    print(f"Configurações: {args.scrolls} scrolls, timeout {args.timeout}s")
+    print(f"Configurações: {args.scrolls} scrolls, timeout {args.timeout}s, parser {args.parser}")
     
     try:
         # Criar scraper (ele mesmo gera o nome do arquivo e cria diretórios)
         scraper = IFoodScraper(
             n_scrolls=args.scrolls,
-            timeout=args.timeout
+            target_count=args.target_count,
+            pagination=args.pagination,
+            prune_dom=args.prune_dom,
+            timeout=args.timeout,
+            parser_backend=args.parser,
+            incremental=args.incremental,
+            listing_source=args.source,
+            output_format=args.format,
+            browser_profile=args.browser_profile,
+            blocklist=load_blocklist(args.blocklist) if args.blocklist else None,
+            driver_path=args.driver_path,
+            offline=args.offline,
+            base_url=args.base_url,
+            max_retries=args.max_retries,
+            retry_delay=args.retry_delay
             # output_path não especificado = geração automática
         )
         
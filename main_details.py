@@ -5,6 +5,22 @@ Script principal simplificado para executar o scraping de detalhes dos restauran
 Uso:
     python main_details.py                   # Usar diretório padrão
     python main_details.py --timeout 15     # Customizar timeout
+    python main_details.py --workers 4      # 4 navegadores em paralelo
+    python main_details.py --extraction js  # Extração direto no DOM (sem page_source)
+    python main_details.py --parser lxml    # Parser HTML mais rápido
+    python main_details.py --fetch http     # HTTP puro, Selenium só como fallback
+    python main_details.py --resume         # Retoma uma execução interrompida
+    python main_details.py --cache-ttl 72   # Reusa detalhes extraídos nas últimas 72h
+    python main_details.py --seen-set reports/seen.bin  # Pula restaurantes já raspados por outro shard
+    python main_details.py --format parquet  # Salva em Parquet tipado (requer pyarrow)
+    python main_details.py --browser-profile lean  # Chrome headless sem imagens/fontes/analytics
+    python main_details.py --offline        # Sem rede para o ChromeDriver (usa o driver em cache)
+    python main_details.py --base-url http://127.0.0.1:8765  # Abre as páginas no mock local
+    python main_details.py --metrics-port 9108  # Métricas Prometheus em http://127.0.0.1:9108/metrics
+    python main_details.py --workers 8 --adaptive --max-rate 3  # Ritmo adaptativo até 8 workers / 3 pág/s
+    python main_details.py --metrics-file /var/lib/node_exporter/ifood.prom  # Textfile collector
+    python main_details.py --max-retries 2 --retry-budget 50  # 2 tentativas extras por etapa, 50 na execução
+    python main_details.py --step-retries page=3 --step-retries payment_tab=0  # Orçamento por etapa
 """
 
 import argparse
@@ -14,11 +30,21 @@ from pathlib import Path
 # Adicionar src ao path
 sys.path.append(str(Path(__file__).parent / 'src'))
 
-try:
-    from src.restaurant_details_scraper import RestaurantDetailsScraper
-except ImportError:
-    print("Erro: Arquivo src\restaurant_details_scraper.py não encontrado.")
-    sys.exit(1)
+
+# Etapas com retry no scraper de detalhes (chaves de STEP_RETRY_ON em src/retry_policy.py,
+# repetidas aqui para validar o --step-retries sem importar o selenium)
+RETRY_STEPS = ('page', 'about', 'payment_tab')
+
+
+def _step_retries(value):
+    """Converte 'etapa=N' do --step-retries em (etapa, N)."""
+    step, sep, count = value.partition('=')
+    step, count = step.strip(), count.strip()
+    if not sep or not count.isdigit():
+        raise argparse.ArgumentTypeError(f"use etapa=N (ex.: page=2), recebido: {value}")
+    if step not in RETRY_STEPS:
+        raise argparse.ArgumentTypeError(f"etapa inválida: {step} (use {', '.join(RETRY_STEPS)})")
+    return step, int(count)
 
 
 def main():
@@ -39,19 +65,234 @@ def main():
         help='Diretório onde buscar o CSV (padrão: reports)'
     )
     
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Número de navegadores Chrome em paralelo (padrão: 1)'
+    )
+    
+    parser.add_argument(
+        '--extraction', '-e',
+        choices=['soup', 'js'],
+        default='soup',
+        help='soup: page_source + BeautifulSoup; js: script injetado lê o DOM vivo (padrão: soup)'
+    )
+    
+    parser.add_argument(
+        '--parser', '-p',
+        choices=['html.parser', 'strainer', 'lxml', 'selectolax'],
+        default='html.parser',
+        help='Backend de parsing HTML do modo soup (padrão: html.parser)'
+    )
+    
+    parser.add_argument(
+        '--fetch', '-f',
+        choices=['browser', 'http'],
+        default='browser',
+        help='browser: Selenium para todos; http: requests primeiro, Selenium só onde faltar dado (padrão: browser)'
+    )
+    
+    parser.add_argument(
+        '--http-concurrency',
+        type=int,
+        default=8,
+        help='Requisições HTTP simultâneas no modo --fetch http (padrão: 8)'
+    )
+    
+    parser.add_argument(
+        '--resume', '-r',
+        action='store_true',
+        help='Retoma a execução anterior pulando as URLs já gravadas no journal'
+    )
+    
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=None,
+        help='Reusa detalhes em cache mais novos que N horas (padrão: cache desligado)'
+    )
+    
+    parser.add_argument(
+        '--cache-max',
+        type=int,
+        default=50000,
+        help='Número máximo de restaurantes no cache; os mais antigos são descartados (padrão: 50000)'
+    )
+    
+    parser.add_argument(
+        '--seen-set',
+        default=None,
+        help='Arquivo compartilhado entre shards com os restaurantes já raspados (padrão: desligado)'
+    )
+    
+    parser.add_argument(
+        '--format',
+        choices=['csv', 'parquet'],
+        default='csv',
+        help='Formato do arquivo de saída; parquet grava colunas tipadas e comprimidas (padrão: csv)'
+    )
+    
+    parser.add_argument(
+        '--browser-profile',
+        choices=['default', 'lean'],
+        default='default',
+        help='lean: headless, viewport pequeno, bloqueia imagens/fontes/mídia e analytics (padrão: default)'
+    )
+    
+    parser.add_argument(
+        '--blocklist',
+        default=None,
+        help='Arquivo com domínios de analytics a bloquear no perfil lean, um por linha (padrão: lista embutida)'
+    )
+    
+    parser.add_argument(
+        '--driver-path',
+        default=None,
+        help='Caminho fixo do ChromeDriver (padrão: $CHROMEDRIVER_PATH, cache local ou download)'
+    )
+    
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Não consulta a rede para resolver o ChromeDriver; usa apenas drivers locais/em cache'
+    )
+    
+    parser.add_argument(
+        '--base-url',
+        default=None,
+        help='Troca o host das URLs da listagem ao abrir as páginas, ex.: mock local (padrão: URLs do CSV)'
+    )
+    
+    parser.add_argument(
+        '--metrics-file',
+        default=None,
+        help='Arquivo .prom (textfile collector do node_exporter) com as métricas da execução (padrão: desligado)'
+    )
+    
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=None,
+        help='Porta local para expor as métricas Prometheus em /metrics (padrão: desligado)'
+    )
+    
+    parser.add_argument(
+        '--metrics-interval',
+        type=float,
+        default=15.0,
+        help='Segundos entre regravações do --metrics-file (padrão: 15)'
+    )
+    
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Controle de ritmo: token bucket + concorrência AIMD; --workers vira o teto de navegadores ativos'
+    )
+    
+    parser.add_argument(
+        '--max-rate',
+        type=float,
+        default=2.0,
+        help='Teto de páginas por segundo no modo --adaptive (padrão: 2.0)'
+    )
+    
+    parser.add_argument(
+        '--target-latency',
+        type=float,
+        default=8.0,
+        help='Latência mediana por página (s) acima da qual o --adaptive reduz o ritmo (padrão: 8.0)'
+    )
+    
+    parser.add_argument(
+        '--max-error-rate',
+        type=float,
+        default=0.2,
+        help='Fração de páginas com erro acima da qual o --adaptive reduz o ritmo (padrão: 0.2)'
+    )
+    
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=1,
+        help='Novas tentativas por etapa para falhas transitórias (timeout, stale, queda do Chrome) (padrão: 1)'
+    )
+    
+    parser.add_argument(
+        '--step-retries',
+        type=_step_retries,
+        action='append',
+        default=[],
+        metavar='ETAPA=N',
+        help=f"Tentativas de uma etapa ({', '.join(RETRY_STEPS)}); repetível (padrão: --max-retries)"
+    )
+    
+    parser.add_argument(
+        '--retry-budget',
+        type=int,
+        default=None,
+        help='Total de novas tentativas na execução; esgotado, as falhas não se repetem (padrão: sem limite)'
+    )
+    
+    parser.add_argument(
+        '--retry-delay',
+        type=float,
+        default=1.0,
+        help='Espera base (s) do backoff exponencial com jitter entre tentativas (padrão: 1.0)'
+    )
+    
     args = parser.parse_args()
     
+    # Dependências pesadas (pandas, selenium, bs4) só depois do argparse:
+    # --help e erros de argumento respondem sem carregá-las
+    try:
+        from src.restaurant_details_scraper import RestaurantDetailsScraper
+        from src.browser_profile import load_blocklist
+    except ImportError:
+        print("Erro: Arquivo src\restaurant_details_scraper.py não encontrado.")
+        return 1
+    
     print("Iniciando scraping de detalhes dos restaurantes...")
     print(f"Diretório de busca: {args.directory}")
     print(f"Timeout configurado: {args.timeout}")
+    print(f"Workers: {args.workers}")
     
     try:
         scraper = RestaurantDetailsScraper(
             csv_directory=args.directory,
-            timeout=args.timeout
+            timeout=args.timeout,
+            workers=args.workers,
+            extraction_mode=args.extraction,
+            parser_backend=args.parser,
+            fetch_mode=args.fetch,
+            http_concurrency=args.http_concurrency,
+            resume=args.resume,
+            cache_ttl_hours=args.cache_ttl,
+            cache_max_entries=args.cache_max,
+            seen_set_path=args.seen_set,
+            output_format=args.format,
+            browser_profile=args.browser_profile,
+            blocklist=load_blocklist(args.blocklist) if args.blocklist else None,
+            driver_path=args.driver_path,
+            offline=args.offline,
+            base_url=args.base_url,
+            metrics_file=args.metrics_file,
+            metrics_port=args.metrics_port,
+            metrics_interval=args.metrics_interval,
+            adaptive=args.adaptive,
+            max_rate=args.max_rate,
+            target_latency=args.target_latency,
+            max_error_rate=args.max_error_rate,
+            max_retries=args.max_retries,
+            step_retries=dict(args.step_retries),
+            retry_budget=args.retry_budget,
+            retry_delay=args.retry_delay
         )
         
         output_path = scraper.scrape_details()
+        if output_path is None:
+            print("Nenhum restaurante novo para raspar; nenhum arquivo gerado.")
+            return 0
         
         print("Scraping de detalhes concluído com sucesso!")
         print(f"Arquivo gerado: {Path(output_path).name}")
@@ -60,6 +301,7 @@ def main():
             
     except KeyboardInterrupt:
         print("Scraping interrompido pelo usuário.")
+        print("Para continuar de onde parou: python main_details.py --resume")
         return 1
     except Exception as e:
         print(f"Erro durante o scraping: {e}")
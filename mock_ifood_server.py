@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local que imita o iFood para testes e benchmarks offline.
+
+Serve a listagem (/restaurantes), o feed JSON paginado (/v1/merchants?page=N,
+o mesmo formato lido pelo modo --source network) e as páginas dos
+restaurantes (/delivery/<cidade-uf>/<slug>/<id>), com os nomes de classe
+reais e os botões "Ver mais" / "Pagamento". Latência, erros HTTP e atraso de
+renderização (conteúdo inserido por JavaScript) são configuráveis. Nomes,
+bairros e formas de pagamento vêm de synthetic_catalog.py, as mesmas listas
+do corpus de generate_fixtures.py. Com
+--feed-dir, o feed serve as respostas JSON de um diretório (uma por página,
+em ordem de nome, sem alterações) no lugar do catálogo sintético.
+
+Uso:
+    python mock_ifood_server.py                                  # http://127.0.0.1:8765, 500 restaurantes
+    python mock_ifood_server.py --merchants 5000 --latency 0.2 --error-rate 0.05 --render-delay 1.5
+    python mock_ifood_server.py --listing-csv reports/bd_scrap_ifood_mock.csv
+    python mock_ifood_server.py --feed-dir fixtures/feed                 # Feed a partir dos JSON do diretório
+
+    # Em outro terminal
+    python main.py --base-url http://127.0.0.1:8765 --scrolls 5
+    python main_details.py --base-url http://127.0.0.1:8765 --workers 4
+"""
+
+import argparse
+import html
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+from synthetic_catalog import (
+    CATEGORIES, NAMES, SUFFIXES, CITIES, DISTRICTS, STREETS, PAYMENT_LABELS, PAYMENT_TITLES, slug, city_slug
+)
+
+
+PAYMENT_METHODS = list(PAYMENT_LABELS)
+
+USER_LOCATION = {'lat': -18.9395041, 'lng': -48.3059029, 'geohash': '6utskb0v3k6t'}
+
+
+def build_catalog(count, seed=42):
+    """Restaurantes determinísticos (mesma seed, mesmo catálogo)."""
+    rng = random.Random(seed)
+    catalog = []
+
+    for _ in range(count):
+        city, uf = rng.choice(CITIES)
+        name = f"{rng.choice(NAMES)} {rng.choice(SUFFIXES)}"
+        district = rng.choice(DISTRICTS)
+        time_min = rng.choice([10, 15, 20, 25, 30, 35, 40, 45])
+        fee = 0 if rng.random() < 0.3 else rng.randint(199, 1499)
+
+        online = [m for m in PAYMENT_METHODS if m != 'CASH' and rng.random() < 0.8]
+        offline = [m for m in PAYMENT_METHODS if m != 'PIX' and rng.random() < 0.6]
+
+        catalog.append({
+            'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'name': name,
+            'slug': f"{city_slug(city, uf)}/{slug(name)}-{slug(district)}",
+            'userRating': None if rng.random() < 0.08 else round(rng.uniform(3.5, 5.0), 1),
+            'mainCategory': rng.choice(CATEGORIES),
+            'distance': round(rng.uniform(0.3, 12), 1),
+            'deliveryInfo': {'timeMinMinutes': time_min, 'timeMaxMinutes': time_min + 10, 'fee': fee},
+            'deliveryFee': {'type': 'FREE' if fee == 0 else 'FIXED', 'value': fee},
+            'available': True,
+            # Campos só da página do restaurante (não vão no feed)
+            'minimumOrderValue': rng.choice([0, 10, 15, 20, 25.5, 30, 45]),
+            'address': {
+                'streetName': rng.choice(STREETS),
+                'streetNumber': str(rng.randint(1, 4999)),
+                'district': district,
+                'city': city,
+                'state': uf,
+                'zipCode': f"38{rng.randint(100, 999)}{rng.randint(0, 999):03d}",
+            },
+            'paymentMethods': (
+                [{'type': {'name': 'ONLINE'}, 'method': {'name': m}} for m in online]
+                + [{'type': {'name': 'OFFLINE'}, 'method': {'name': m}} for m in offline]
+            ),
+        })
+    return catalog
+
+
+_FEED_FIELDS = ('id', 'name', 'slug', 'userRating', 'mainCategory', 'distance', 'deliveryInfo', 'deliveryFee', 'available')
+
+_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="pt-BR"><head><meta charset="utf-8"><title>{title}</title>
+<meta name="viewport" content="width=device-width, initial-scale=1"></head>
+<body><div id="__next"><header class="app-header"><nav class="app-header__nav">
+<a class="app-header__logo" href="/restaurantes">iFood (mock)</a>
+<button class="address-button" aria-label="Usar minha localização">Usar minha localização</button>
+</nav></header>
+"""
+
+_LISTING_JS = """
+const CONFIG = __CONFIG__;
+localStorage.setItem('fstr.session', JSON.stringify({
+    geoPoint: {latitude: CONFIG.location.lat, longitude: CONFIG.location.lng},
+    properties: {delLat: CONFIG.location.lat, delLon: CONFIG.location.lng}
+}));
+window.geohash = CONFIG.location.geohash;
+
+const wrapper = document.querySelector('.merchant-list-v2__wrapper');
+const button = document.querySelector('.cardstack-nextcontent__button');
+let nextPage = 0;
+let loading = false;
+
+function esc(text) {
+    const span = document.createElement('span');
+    span.textContent = text;
+    return span.innerHTML;
+}
+
+function card(m) {
+    // Formatos do feed real também aceitos (slug no action, categoria objeto, tempo único)
+    const slug = m.slug || ((m.action || '').match(/slug=([^&]+)/) || [])[1];
+    const category = typeof m.mainCategory === 'object' ? m.mainCategory.name : m.mainCategory;
+    const info = m.deliveryInfo || {timeMinMinutes: m.deliveryTime, timeMaxMinutes: m.deliveryTime};
+    const rating = m.userRating == null
+        ? '<span class="merchant-v2__rating merchant-v2__rating--new">Novo</span>'
+        : `<span class="merchant-v2__rating">${m.userRating.toFixed(1)}</span>`;
+    const cents = m.deliveryFee ? m.deliveryFee.value : info.fee;
+    const fee = !cents ? 'Grátis' : 'R$ ' + (cents / 100).toFixed(2).replace('.', ',');
+    return `<div class="merchant-list-v2__item-wrapper"><a class="merchant-v2__link" href="/delivery/${slug}/${m.id}">`
+        + `<div class="merchant-v2__content"><div class="merchant-v2__info-wrapper">`
+        + `<span class="merchant-v2__name">${esc(m.name)}</span>`
+        + `<div class="merchant-v2__info">${rating}<span class="merchant-v2__divider"> • </span><span>${esc(category)}</span>`
+        + `<span class="merchant-v2__divider"> • </span><span>${m.distance.toFixed(1).replace('.', ',')} km</span></div>`
+        + `<div class="merchant-v2__footer"><span>${info.timeMinMinutes}-${info.timeMaxMinutes} min</span>`
+        + `<span class="merchant-v2__divider"> • </span><span class="merchant-v2__delivery-fee">${fee}</span></div>`
+        + `</div></div></a></div>`;
+}
+
+function loadPage() {
+    if (loading || nextPage === null) return;
+    loading = true;
+    fetch('/v1/merchants?page=' + nextPage)
+        .then(response => { if (!response.ok) throw new Error(response.status); return response.json(); })
+        .then(feed => {
+            const data = feed.sections[0].cards[0].data;
+            setTimeout(() => {
+                wrapper.insertAdjacentHTML('beforeend', data.contents.map(card).join(''));
+                // Respostas do --feed-dir não trazem nextPage: segue até o último arquivo
+                nextPage = 'nextPage' in data ? data.nextPage : (nextPage + 1 < CONFIG.feedPages ? nextPage + 1 : null);
+                if (nextPage === null) button.remove();
+                loading = false;
+            }, CONFIG.renderDelay);
+        })
+        .catch(() => { loading = false; });  // erro: o próximo "Ver mais" tenta de novo
+}
+
+document.querySelector('.address-button').addEventListener('click', event => event.target.remove());
+button.addEventListener('click', loadPage);
+loadPage();
+"""
+
+_MERCHANT_JS = """
+const CONFIG = __CONFIG__;
+const m = JSON.parse(document.getElementById('__NEXT_DATA__').textContent).props.initialState.merchant;
+const root = document.getElementById('merchant-root');
+
+function esc(text) {
+    const span = document.createElement('span');
+    span.textContent = text;
+    return span.innerHTML;
+}
+
+function money(value) {
+    return 'R$ ' + Number(value).toFixed(2).replace('.', ',');
+}
+
+function addressInfo() {
+    const a = m.address;
+    const cep = a.zipCode.slice(0, 5) + '-' + a.zipCode.slice(5);
+    return '<div class="merchant-details-about__info"><p class="merchant-details-about__info-title">Endereço</p>'
+        + `<p class="merchant-details-about__info-data">${esc(a.streetName)}, ${a.streetNumber} - ${esc(a.district)}</p>`
+        + `<p class="merchant-details-about__info-data">${esc(a.city)} - ${a.state}</p>`
+        + `<p class="merchant-details-about__info-data">CEP: ${cep}</p></div>`;
+}
+
+function paymentPanel() {
+    const sections = [['ONLINE', CONFIG.titles.site], ['OFFLINE', CONFIG.titles.entrega]].map(([kind, title]) => {
+        const methods = m.paymentMethods.filter(p => p.type.name === kind).map(p => p.method.name);
+        if (!methods.length) return '';
+        return `<div class="merchant-details-payment__payment"><p class="merchant-details-payment__payment-type-title">${title}</p>`
+            + methods.map(method => `<p class="merchant-details-payment__payment-subtype">${CONFIG.labels[method]}</p>`
+                + `<div class="merchant-details-payment__payment-tags"><span class="payment-tag">${CONFIG.labels[method]}</span></div>`).join('')
+            + '</div>';
+    }).join('');
+    return `<div class="merchant-details-payment">${sections}</div>`;
+}
+
+function render() {
+    const minimum = m.minimumOrderValue ? `<div class="merchant-info__minimum-order">Pedido mínimo ${money(m.minimumOrderValue)}</div>` : '';
+    root.innerHTML = `<div class="merchant-info"><h1 class="merchant-info__title">${esc(m.name)}</h1>${minimum}</div>`
+        + '<div class="merchant-details"><div class="marmita-tabs" role="tablist">'
+        + '<button class="marmita-tab marmita-tab--active" role="tab">Sobre</button>'
+        + '<button class="marmita-tab" role="tab">Pagamento</button></div>'
+        + '<div class="merchant-details-about"><p class="merchant-details-about__description">Restaurante de testes.</p>'
+        + '<button class="merchant-details-about__description-see-more-button">Ver mais</button></div></div>';
+
+    root.querySelector('.merchant-details-about__description-see-more-button').addEventListener('click', () => {
+        setTimeout(() => {
+            const about = root.querySelector('.merchant-details-about');
+            if (!about.querySelector('.merchant-details-about__info')) about.insertAdjacentHTML('beforeend', addressInfo());
+        }, CONFIG.renderDelay);
+    });
+    root.querySelectorAll('.marmita-tab')[1].addEventListener('click', () => {
+        setTimeout(() => {
+            root.querySelector('.merchant-details-about').style.display = 'none';
+            if (!root.querySelector('.merchant-details-payment')) {
+                root.querySelector('.merchant-details').insertAdjacentHTML('beforeend', paymentPanel());
+            }
+        }, CONFIG.renderDelay);
+    });
+}
+
+setTimeout(render, CONFIG.renderDelay);
+"""
+
+
+class MockIFood:
+    """Catálogo de restaurantes + servidor HTTP com latência, erros e renderização lenta."""
+
+    def __init__(self, merchants=500, page_size=20, latency=0.0, jitter=0.0, error_rate=0.0,
+                 render_delay=0.0, seed=42, host='127.0.0.1', port=8765, feed_dir=None):
+        self.catalog = build_catalog(merchants, seed)
+        # Respostas do feed servidas no lugar do catálogo (uma por página, em ordem de nome)
+        self.feed_files = sorted(Path(feed_dir).glob('*.json')) if feed_dir else None
+        if self.feed_files == []:
+            raise ValueError(f"Nenhum .json em {feed_dir}")
+        self.by_id = {m['id']: m for m in self.catalog}
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.render_delay = render_delay
+        self.host = host
+        self.port = port
+
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def merchant_url(self, merchant):
+        return f"{self.base_url}/delivery/{merchant['slug']}/{merchant['id']}"
+
+    # --- respostas ---
+
+    def _config_js(self):
+        return json.dumps({
+            'renderDelay': int(self.render_delay * 1000),
+            'location': USER_LOCATION,
+            'labels': PAYMENT_LABELS,
+            'titles': PAYMENT_TITLES,
+            'feedPages': len(self.feed_files) if self.feed_files else None,
+        })
+
+    def listing_page(self):
+        return (_PAGE_HEAD.format(title='Restaurantes | iFood (mock)')
+                + '<main class="merchant-list-v2"><h2 class="title-section">Lojas</h2>'
+                + '<div class="merchant-list-v2__wrapper"></div>'
+                + '<button class="cardstack-nextcontent__button" aria-label="Ver mais" type="button">Ver mais</button>'
+                + '</main></div><script>' + _LISTING_JS.replace('__CONFIG__', self._config_js())
+                + '</script></body></html>')
+
+    def feed_body(self, page):
+        """Corpo JSON da página `page` do feed (None = página inexistente)."""
+        if self.feed_files is None:
+            return json.dumps(self.feed_page(page), ensure_ascii=False)
+        if 0 <= page < len(self.feed_files):
+            return self.feed_files[page].read_text(encoding='utf-8')
+        return None
+
+    def feed_page(self, page):
+        start = page * self.page_size
+        contents = [{key: m[key] for key in _FEED_FIELDS} for m in self.catalog[start:start + self.page_size]]
+        next_page = page + 1 if start + self.page_size < len(self.catalog) else None
+        return {'sections': [{'id': 'home-merchant-list', 'cards': [{
+            'id': 'merchant-list-card',
+            'cardType': 'MERCHANT_LIST_V2',
+            'data': {'contents': contents, 'nextPage': next_page},
+        }]}]}
+
+    def merchant_page(self, merchant):
+        state = {'props': {'initialState': {'merchant': {
+            key: merchant[key] for key in ('id', 'name', 'minimumOrderValue', 'address', 'paymentMethods')
+        }}}, 'page': '/delivery/[...slug]'}
+        return (_PAGE_HEAD.format(title=f"{html.escape(merchant['name'])} | iFood (mock)")
+                + '<main class="merchant-page" id="merchant-root"></main></div>'
+                + '<script id="__NEXT_DATA__" type="application/json">'
+                + json.dumps(state, ensure_ascii=False).replace('</', '<\\/') + '</script>'
+                + '<script>' + _MERCHANT_JS.replace('__CONFIG__', self._config_js()) + '</script></body></html>')
+
+    def _should_fail(self):
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        time.sleep(delay)
+        return failed
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                path = parts.path.rstrip('/')
+
+                if path == '/favicon.ico':
+                    return self._send(404, '', 'text/plain')
+                if mock._should_fail():
+                    return self._send(503, 'Service Unavailable', 'text/plain')
+
+                if path in ('', '/restaurantes'):
+                    return self._send(200, mock.listing_page(), 'text/html; charset=utf-8')
+
+                if path == '/v1/merchants':
+                    try:
+                        page = int(parse_qs(parts.query).get('page', ['0'])[0])
+                    except ValueError:
+                        page = 0
+                    body = mock.feed_body(page)
+                    if body is not None:
+                        return self._send(200, body, 'application/json; charset=utf-8')
+
+                if path.startswith('/delivery/'):
+                    merchant = mock.by_id.get(path.rsplit('/', 1)[-1].lower())
+                    if merchant:
+                        return self._send(200, mock.merchant_page(merchant), 'text/html; charset=utf-8')
+
+                self._send(404, 'Not Found', 'text/plain')
+
+        return Handler
+
+    # --- ciclo de vida ---
+
+    def start(self):
+        """Sobe o servidor numa thread (port=0 escolhe uma porta livre) e devolve a URL base."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def write_listing_csv(self, path):
+        """Grava uma listagem (mesmas colunas do main.py) apontando para este servidor."""
+        from src.csv_sink import StreamingCsvWriter
+        from src.ifood_scraper import LISTING_COLUMNS
+        from src.merchant_feed import merchant_to_row
+
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        location = {'delivery_lat': USER_LOCATION['lat'], 'delivery_lng': USER_LOCATION['lng'],
+                    'geohash': USER_LOCATION['geohash']}
+        with StreamingCsvWriter(Path(path), LISTING_COLUMNS) as sink:
+            for merchant in self.catalog:
+                sink.write(merchant_to_row(merchant, current_time, location, self.base_url))
+        return sink.rows_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita o iFood (listagem, feed e restaurantes)")
+    parser.add_argument('--host', default='127.0.0.1', help='Endereço (padrão: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Porta (padrão: 8765)')
+    parser.add_argument('--merchants', '-m', type=int, default=500, help='Restaurantes no catálogo (padrão: 500)')
+    parser.add_argument('--page-size', type=int, default=20, help='Restaurantes por "Ver mais" (padrão: 20)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Latência fixa por requisição, em segundos (padrão: 0)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Latência extra aleatória, até N segundos (padrão: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fração de respostas 503 (padrão: 0)')
+    parser.add_argument('--render-delay', type=float, default=0.0,
+                        help='Atraso da renderização no navegador (cards, página, "Ver mais", aba Pagamento), em segundos (padrão: 0)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed do catálogo e dos erros (padrão: 42)')
+    parser.add_argument('--listing-csv', default=None, help='Grava uma listagem com todos os restaurantes e sai')
+    parser.add_argument('--feed-dir', default=None,
+                        help='Serve os .json do diretório como páginas do feed, em ordem de nome (padrão: catálogo sintético)')
+    args = parser.parse_args()
+
+    mock = MockIFood(merchants=args.merchants, page_size=args.page_size, latency=args.latency, jitter=args.jitter,
+                     error_rate=args.error_rate, render_delay=args.render_delay, seed=args.seed,
+                     host=args.host, port=args.port, feed_dir=args.feed_dir)
+
+    if args.listing_csv:
+        rows = mock.write_listing_csv(args.listing_csv)
+        print(f"Listagem gravada: {args.listing_csv} ({rows} restaurantes em {mock.base_url})")
+        return 0
+
+    base_url = mock.start()
+    print(f"Mock do iFood em {base_url} ({len(mock.catalog)} restaurantes). Ctrl+C para parar.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.stop()
+        print(f"\nRequisições: {mock.requests}, erros injetados: {mock.errors}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
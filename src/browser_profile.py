@@ -0,0 +1,132 @@
+"""
+Perfis do Chrome usados pelos scrapers.
+
+- default: Chrome com janela, carrega tudo (comportamento original)
+- lean: headless=new, viewport pequeno, imagens/fontes/mídia e domínios de
+  analytics bloqueados via DevTools (Network.setBlockedURLs). Só o DOM e os
+  scripts da própria página são baixados, que é o que a extração usa.
+"""
+
+import json
+from pathlib import Path
+
+
+BROWSER_PROFILES = ('default', 'lean')
+
+# Viewport do perfil lean (ainda no layout desktop do iFood)
+LEAN_WINDOW_SIZE = '1024,768'
+
+# Extensões de imagens, fontes e mídia bloqueadas no perfil lean
+BLOCKED_EXTENSIONS = [
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico',
+    'woff', 'woff2', 'ttf', 'otf', 'eot',
+    'mp4', 'webm', 'mp3', 'm3u8',
+]
+
+# Hosts inteiros de imagens
+BLOCKED_HOSTS = ['static-images.ifood.com.br']
+
+# Domínios de analytics/tracking bloqueados por padrão (substituível por --blocklist)
+DEFAULT_ANALYTICS_BLOCKLIST = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googleadservices.com',
+    'connect.facebook.net',
+    'hotjar.com',
+    'clarity.ms',
+    'segment.io',
+    'amplitude.com',
+    'app.link',
+    'nr-data.net',
+    'newrelic.com',
+    'datadoghq-browser-agent.com',
+    'browser-intake-datadoghq.com',
+]
+
+
+def extension_patterns(extension):
+    """
+    Padrões do Network.setBlockedURLs para uma extensão.
+
+    O padrão casa com a URL inteira: a extensão precisa terminar o caminho (com
+    ou sem query string), então '/svg-burger/...' ou '?icon=.svg' não são bloqueados.
+    """
+    return [f'*.{extension}', f'*.{extension}?*']
+
+
+def host_patterns(domain):
+    """Padrões que casam só com o host `domain` e seus subdomínios (não com caminhos ou outros hosts)."""
+    return [f'*://{domain}/*', f'*://*.{domain}/*']
+
+
+def blocked_url_patterns(blocklist=None):
+    """Todos os padrões do perfil lean: mídia, hosts de imagens e domínios de analytics."""
+    domains = DEFAULT_ANALYTICS_BLOCKLIST if blocklist is None else blocklist
+    patterns = [pattern for extension in BLOCKED_EXTENSIONS for pattern in extension_patterns(extension)]
+    for domain in BLOCKED_HOSTS + list(domains):
+        patterns += host_patterns(domain)
+    return patterns
+
+
+def load_blocklist(path):
+    """Lê um domínio por linha (linhas vazias e '#' são ignoradas)."""
+    domains = []
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line:
+            domains.append(line)
+    return domains
+
+
+def apply_profile(options, profile='default'):
+    """Acrescenta às ChromeOptions os argumentos do perfil."""
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(f"Perfil de navegador inválido: {profile} (use {', '.join(BROWSER_PROFILES)})")
+
+    if profile == 'lean':
+        options.add_argument('--headless=new')
+        options.add_argument(f'--window-size={LEAN_WINDOW_SIZE}')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--mute-audio')
+        options.add_argument('--disable-extensions')
+    return options
+
+
+def enable_blocking(browser, profile='default', blocklist=None):
+    """
+    Liga o bloqueio de recursos via DevTools no navegador já aberto.
+
+    Vale para todas as navegações seguintes da aba. No perfil default não faz nada.
+    """
+    if profile != 'lean':
+        return
+
+    browser.execute_cdp_cmd('Network.enable', {})
+    browser.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_url_patterns(blocklist)})
+
+
+def network_usage(browser):
+    """
+    Soma os eventos de rede acumulados no log 'performance' (e esvazia o buffer).
+
+    Requer o capability goog:loggingPrefs {'performance': 'ALL'}.
+
+    Returns:
+        dict: bytes (encodedDataLength), requests concluídas e bloqueadas
+    """
+    usage = {'bytes': 0, 'requests': 0, 'blocked': 0}
+
+    for entry in browser.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+
+        if message.get('method') == 'Network.loadingFinished':
+            usage['bytes'] += int(message['params'].get('encodedDataLength', 0))
+            usage['requests'] += 1
+        elif message.get('method') == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+            usage['blocked'] += 1
+
+    return usage
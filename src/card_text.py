@@ -0,0 +1,76 @@
+"""
+Normalização em lote dos textos dos cards da listagem.
+
+Os textos de info ('4.6 • Lanches • 2,9 km') e footer ('20-30 min • R$ 9,99')
+de todos os cards de uma página passam numa única passada por regexes
+pré-compiladas, sem a filtragem caractere a caractere de
+_process_info_text/_process_footer_text. Os valores são os mesmos do caminho
+escalar: textos fora do formato canônico ('1.234,56', dígitos unicode,
+'+15 min'...) são delegados às funções escalares, que continuam sendo a
+referência.
+"""
+
+import re
+
+
+# Formato canônico; nota sem dígitos ('Novo') vira 0.0 como no escalar
+INFO_PATTERN = re.compile(
+    r'\s*(?:(?P<nota>[0-9]+(?:\.[0-9]+)?)|[A-Za-z!]*)\s*'
+    r'•(?P<tipo>[^•]*)•'
+    r'\s*(?P<distancia>[0-9]+(?:[.,][0-9]+)?)\s*km\s*'
+    r'(?:•.*)?',
+    re.DOTALL
+)
+
+FOOTER_PATTERN = re.compile(
+    r'\s*(?P<tempo_min>[0-9]{1,9})(?:\s*-\s*(?P<tempo_max>[0-9]{1,9}))?\s*min\s*'
+    r'•\s*(?:(?P<gratis>[Gg]r[áa]tis)|R\$\s*(?P<frete>[0-9]+(?:[.,][0-9]+)?))\s*'
+    r'(?:•.*)?',
+    re.DOTALL
+)
+
+
+def normalize_info(texts, fallback):
+    """
+    Nota, tipo e distância de cada texto 'nota • tipo • distância'.
+
+    Returns:
+        list: tuplas (nota, tipo, distancia), iguais às de fallback(texto) card a card
+    """
+    results = []
+    append = results.append
+    match = INFO_PATTERN.fullmatch
+
+    for text in texts:
+        m = match(text) if text else None
+        if m is None:
+            append(fallback(text))
+            continue
+        nota = m['nota']
+        append((float(nota) if nota else 0.0, m['tipo'].strip(), float(m['distancia'].replace(',', '.'))))
+
+    return results
+
+
+def normalize_footer(texts, fallback):
+    """
+    Tempo mínimo, máximo e frete de cada texto 'min-max min • frete'.
+
+    Returns:
+        list: tuplas (tempo_min, tempo_max, frete), iguais às de fallback(texto) card a card
+    """
+    results = []
+    append = results.append
+    match = FOOTER_PATTERN.fullmatch
+
+    for text in texts:
+        m = match(text) if text else None
+        if m is None:
+            append(fallback(text))
+            continue
+        tempo_min = int(m['tempo_min'])
+        tempo_max = int(m['tempo_max']) if m['tempo_max'] else tempo_min
+        frete = 0.0 if m['gratis'] else float(m['frete'].replace(',', '.'))
+        append((tempo_min, tempo_max, frete))
+
+    return results
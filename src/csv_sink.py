@@ -0,0 +1,95 @@
+"""
+Escrita de CSV em streaming.
+
+As linhas são anexadas ao arquivo em pequenos lotes à medida que são
+produzidas, com a mesma ordem de colunas e encoding utf-8-sig do
+DataFrame.to_csv original. Assim o arquivo pode ser acompanhado (tail)
+enquanto o scraping ainda está rodando, sem manter tudo em memória.
+"""
+
+import csv
+import os
+import threading
+
+
+class StreamingCsvWriter:
+    """Anexa linhas (dicionários) a um CSV em lotes de `batch_size`."""
+
+    def __init__(self, path, columns, batch_size=20):
+        self.path = path
+        self.columns = list(columns)
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._buffer = []
+        self._file = None
+        self._writer = None
+
+    def _open(self):
+        """Abre o arquivo e grava o cabeçalho (no primeiro lote, não antes)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns,
+                                      extrasaction='ignore', lineterminator=os.linesep)
+        self._writer.writeheader()
+
+    def _write_rows(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def write(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Grava o lote pendente e descarrega no disco."""
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._open()
+
+        self._write_rows(self._buffer)
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class OrderedCsvWriter(StreamingCsvWriter):
+    """
+    Versão thread-safe que recebe linhas fora de ordem (índice, linha).
+
+    Cada linha é gravada assim que todas as anteriores chegaram, mantendo o
+    arquivo na ordem do CSV de entrada mesmo com vários workers.
+    """
+
+    def __init__(self, path, columns, batch_size=20):
+        super().__init__(path, columns, batch_size)
+        self._pending = {}
+        self._next_index = 0
+        self._lock = threading.Lock()
+
+    def put(self, index, row):
+        with self._lock:
+            self._pending[index] = row
+            while self._next_index in self._pending:
+                self.write(self._pending.pop(self._next_index))
+                self._next_index += 1
+
+    def close(self):
+        with self._lock:
+            # Linhas que ficaram órfãs (índices nunca preenchidos) vão no fim, em ordem
+            for index in sorted(self._pending):
+                self.write(self._pending.pop(index))
+            super().close()
@@ -0,0 +1,79 @@
+"""
+Cache persistente (SQLite) das linhas de detalhes por restaurante.
+
+Endereço, pedido mínimo e pagamentos quase não mudam de um dia para o outro:
+linhas extraídas com sucesso ficam guardadas pelo id do restaurante e são reusadas
+enquanto estiverem dentro do TTL. O tamanho é limitado descartando as
+entradas mais antigas.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from .merchant_ids import merchant_id
+
+
+class DetailCache:
+    """Cache chave -> linha do CSV de detalhes, com TTL e número máximo de entradas."""
+
+    def __init__(self, path, ttl_hours=24, max_entries=50000, clock=time.time):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self._clock = clock  # horário de parede em segundos (gravado no SQLite; trocável nos testes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            " key TEXT PRIMARY KEY, stored_at REAL NOT NULL, row TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_details_stored_at ON details (stored_at)")
+        self._purge_expired()
+        self._conn.commit()
+
+    def _purge_expired(self):
+        self._conn.execute("DELETE FROM details WHERE stored_at < ?", (self._clock() - self.ttl_seconds,))
+
+    def _evict(self):
+        """Remove as entradas mais antigas além de max_entries."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM details").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM details WHERE key IN (SELECT key FROM details ORDER BY stored_at LIMIT ?)",
+                (excess,)
+            )
+
+    def get(self, url):
+        """Linha em cache ainda dentro do TTL, ou None."""
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT row FROM details WHERE key = ? AND stored_at >= ?",
+                (merchant_id(url), self._clock() - self.ttl_seconds)
+            ).fetchone()
+
+            if found is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(found[0])
+
+    def put(self, url, row):
+        """Guarda (ou renova) a linha de um restaurante."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO details (key, stored_at, row) VALUES (?, ?, ?)",
+                (merchant_id(url), self._clock(), json.dumps(row, ensure_ascii=False, default=str))
+            )
+            self._evict()
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
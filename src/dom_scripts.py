@@ -0,0 +1,199 @@
+"""
+Scripts JavaScript injetados no navegador.
+
+Leem os campos direto do DOM vivo e devolvem um dicionário compacto, evitando
+serializar a página inteira com page_source e re-parsear no Python.
+"""
+
+# Extrai pedido mínimo, endereço e/ou métodos de pagamento da página do restaurante.
+# arguments[0]: lista de seções ('minimum_order', 'address', 'payment').
+# As chaves e valores padrão são os mesmos de _extract_minimum_order,
+# _get_address_info e _extract_payment_methods.
+DETAILS_EXTRACTION_JS = """
+const sections = arguments[0];
+const result = {};
+
+const text = el => (el ? el.textContent : '');
+
+if (sections.includes('minimum_order')) {
+    result.pedido_minimo = 0.0;
+    try {
+        const div = document.querySelector('div.merchant-info__minimum-order');
+        if (div) {
+            const match = text(div).match(/R\\$\\s*([\\d,]+\\.?\\d*)/);
+            if (match) {
+                const value = Number(match[1].replace(/,/g, '.'));
+                result.pedido_minimo = Number.isNaN(value) ? 0.0 : value;
+            }
+        }
+    } catch (e) {}
+}
+
+if (sections.includes('address')) {
+    const fill = value => {
+        for (const key of ['endereco', 'bairro', 'cidade', 'uf', 'cep']) result[key] = value;
+    };
+    fill('Não encontrado');
+    try {
+        const addressDiv = Array.from(document.querySelectorAll('div.merchant-details-about__info')).find(div => {
+            const title = div.querySelector('p.merchant-details-about__info-title');
+            return title && text(title).includes('Endereço');
+        });
+        const data = addressDiv ? addressDiv.querySelectorAll('p.merchant-details-about__info-data') : [];
+        if (data.length >= 3) {
+            const splitOnce = (value, fallback) => {
+                const idx = value.indexOf(' - ');
+                return idx === -1 ? [value, fallback] : [value.slice(0, idx).trim(), value.slice(idx + 3).trim()];
+            };
+            const [endereco, bairro] = splitOnce(text(data[0]).trim(), 'Não identificado');
+            const [cidade, uf] = splitOnce(text(data[1]).trim(), 'Não identificado');
+            Object.assign(result, {
+                endereco, bairro, cidade, uf,
+                cep: text(data[2]).trim().split('CEP: ').join('').trim()
+            });
+        }
+    } catch (e) {
+        fill('Erro na extração');
+    }
+}
+
+if (sections.includes('payment')) {
+    for (const prefix of ['pag_site_', 'pag_entrega_']) {
+        for (const kind of ['debito', 'credito', 'pix', 'vale_refeicao']) result[prefix + kind] = false;
+    }
+    result.pag_entrega_dinheiro = false;
+    try {
+        const paymentDiv = document.querySelector('div.merchant-details-payment');
+        const sectionsEls = paymentDiv ? paymentDiv.querySelectorAll('div.merchant-details-payment__payment') : [];
+        for (const section of sectionsEls) {
+            const title = section.querySelector('p.merchant-details-payment__payment-type-title');
+            if (!title) continue;
+            const sectionTitle = text(title).trim().toLowerCase();
+            let prefix;
+            if (sectionTitle.includes('pagamento pelo site')) prefix = 'pag_site_';
+            else if (sectionTitle.includes('pagamento na entrega')) prefix = 'pag_entrega_';
+            else continue;
+
+            let subtype = null;
+            for (const el of section.querySelectorAll('p, span')) {
+                if (el.tagName === 'P' && el.classList.contains('merchant-details-payment__payment-subtype')) {
+                    subtype = text(el).trim().toLowerCase();
+                } else if (el.tagName === 'SPAN' && el.classList.contains('payment-tag') && subtype) {
+                    if (subtype.includes('débito')) result[prefix + 'debito'] = true;
+                    else if (subtype.includes('crédito')) result[prefix + 'credito'] = true;
+                    else if (subtype.includes('pix')) result[prefix + 'pix'] = true;
+                    else if (subtype.includes('vale-refeição')) result[prefix + 'vale_refeicao'] = true;
+                    else if (subtype.includes('dinheiro')) result[prefix + 'dinheiro'] = true;
+                }
+            }
+        }
+    } catch (e) {}
+}
+
+return result;
+"""
+
+
+# outerHTML dos cards da listagem a partir do índice arguments[0]
+# (ou seja, apenas os cards adicionados desde a última coleta).
+NEW_CARDS_JS = """
+return Array.from(document.querySelectorAll('div.merchant-list-v2__item-wrapper'))
+    .slice(arguments[0])
+    .map(card => card.outerHTML);
+"""
+
+
+# Quantidade de cards da listagem já renderizados.
+CARD_COUNT_JS = """
+return document.querySelectorAll('div.merchant-list-v2__item-wrapper').length;
+"""
+
+
+# Loop completo de "Ver mais" dentro da página (execute_async_script).
+# Argumentos: máximo de cliques (0 = sem limite), alvo de cards (0 = sem alvo),
+# espera máxima pelo crescimento da lista após cada clique (ms) e prazo total (ms).
+# Um MutationObserver acorda o loop assim que novos cards entram no DOM; o
+# retorno traz a contagem final, o motivo da parada e o tempo de cada clique.
+PAGINATE_JS = """
+const [maxClicks, targetCount, growthTimeoutMs, deadlineMs] = arguments;
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+const cards = document.getElementsByClassName('merchant-list-v2__item-wrapper');
+const clicks = [];
+const buttonWaitMs = Math.min(growthTimeoutMs, 1000);
+
+const findButton = () =>
+    document.querySelector('button[aria-label="Ver mais"]') ||
+    document.querySelector('button.cardstack-nextcontent__button');
+
+function waitFor(check, timeoutMs) {
+    return new Promise(resolve => {
+        if (check()) return resolve(true);
+        let finished = false;
+        const finish = ok => {
+            if (finished) return;
+            finished = true;
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(ok);
+        };
+        const observer = new MutationObserver(() => { if (check()) finish(true); });
+        const timer = setTimeout(() => finish(!!check()), timeoutMs);
+        observer.observe(document.body, {childList: true, subtree: true});
+    });
+}
+
+async function paginate() {
+    await waitFor(() => cards.length > 0, growthTimeoutMs);
+
+    while (true) {
+        if (targetCount > 0 && cards.length >= targetCount) return 'target';
+        if (maxClicks > 0 && clicks.length >= maxClicks) return 'max_clicks';
+        if (performance.now() - start > deadlineMs) return 'deadline';
+
+        let button = findButton();
+        if (!button && await waitFor(() => (button = findButton()), buttonWaitMs) === false) return 'no_button';
+
+        const before = cards.length;
+        const clickStart = performance.now();
+        window.scrollTo(0, document.body.scrollHeight);
+        button.click();
+        const grew = await waitFor(() => cards.length > before, growthTimeoutMs);
+        clicks.push({ms: performance.now() - clickStart, added: cards.length - before});
+        if (!grew) return 'plateau';
+    }
+}
+
+paginate()
+    .then(reason => done({count: cards.length, reason, clicks, ms: performance.now() - start}))
+    .catch(error => done({count: cards.length, reason: 'error: ' + error, clicks, ms: performance.now() - start}));
+"""
+
+
+# Modo de memória limitada: outerHTML dos cards ainda não coletados e, logo
+# depois, poda desses cards no DOM vivo. arguments[0] = 'collapse' (esvazia o
+# card e o esconde, mantendo o wrapper para o React e para a contagem) ou
+# 'remove' (tira o card da página). Devolve também o tamanho do DOM e do heap.
+HARVEST_AND_PRUNE_JS = """
+const mode = arguments[0];
+const fresh = Array.from(
+    document.querySelectorAll('div.merchant-list-v2__item-wrapper:not([data-harvested])')
+);
+const cards = fresh.map(card => card.outerHTML);
+
+for (const card of fresh) {
+    if (mode === 'remove') {
+        card.remove();
+    } else {
+        card.replaceChildren();
+        card.setAttribute('data-harvested', '');
+        card.style.display = 'none';
+    }
+}
+
+return {
+    cards: cards,
+    nodes: document.getElementsByTagName('*').length,
+    heap: performance.memory ? performance.memory.usedJSHeapSize : null
+};
+"""
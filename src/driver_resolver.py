@@ -0,0 +1,177 @@
+"""
+Resolução do ChromeDriver sem depender da rede a cada execução.
+
+Ordem de busca (a primeira que existir vence):
+1. caminho fixo passado pelo usuário (--driver-path)
+2. variável de ambiente CHROMEDRIVER_PATH
+3. caminho resolvido numa execução anterior (cache em ~/.cache/desafio-ifood)
+4. cache do Selenium Manager (~/.cache/selenium) e do webdriver-manager (~/.wdm)
+5. chromedriver no PATH
+6. ChromeDriverManager().install() (rede) — não usado no modo offline
+
+O resultado fica memorizado no processo, então vários workers resolvem uma vez só.
+Se o Chrome recusar o driver por versão (Chrome atualizado), launch_chrome
+descarta o caminho memorizado/em cache e resolve de novo uma vez: online pelo
+ChromeDriverManager, offline pelos demais drivers locais.
+"""
+
+import glob
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.service import Service
+
+
+DRIVER_ENV_VAR = 'CHROMEDRIVER_PATH'
+DRIVER_CACHE_FILE = Path.home() / '.cache' / 'desafio-ifood' / 'chromedriver.json'
+
+_DRIVER_NAME = 'chromedriver.exe' if os.name == 'nt' else 'chromedriver'
+
+_lock = threading.Lock()
+_resolved = {}
+_sources = {}     # caminho -> origem em que foi encontrado
+_rejected = set()  # drivers recusados pelo Chrome instalado (versão incompatível)
+
+# Origens escolhidas pelo usuário: nunca trocadas automaticamente
+_EXPLICIT_SOURCES = ('caminho fixo', DRIVER_ENV_VAR)
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _version_key(path):
+    """Ordena caminhos .../<versão>/... pela versão numérica."""
+    key = []
+    for part in Path(path).parts:
+        numbers = part.split('.')
+        if all(n.isdigit() for n in numbers):
+            key.extend(int(n) for n in numbers)
+    return key
+
+
+def _newest(pattern):
+    found = [path for path in glob.glob(pattern, recursive=True) if _is_executable(path)]
+    return max(found, key=_version_key) if found else None
+
+
+def _read_cache():
+    try:
+        return json.loads(DRIVER_CACHE_FILE.read_text(encoding='utf-8')).get('path')
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(path):
+    try:
+        DRIVER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        DRIVER_CACHE_FILE.write_text(json.dumps({'path': path, 'resolved_at': time.time()}), encoding='utf-8')
+    except OSError as e:
+        print(f"⚠️ Não foi possível gravar o cache do ChromeDriver: {e}")
+
+
+def _candidates(driver_path, offline):
+    home = Path.home()
+    yield 'caminho fixo', driver_path
+    yield DRIVER_ENV_VAR, os.environ.get(DRIVER_ENV_VAR)
+    if _rejected and not offline:
+        return  # já houve driver incompatível: o download resolve a versão do Chrome instalado
+    yield 'cache', _read_cache()
+    yield 'Selenium Manager', _newest(str(home / '.cache' / 'selenium' / 'chromedriver' / '**' / _DRIVER_NAME))
+    yield 'webdriver-manager', _newest(str(home / '.wdm' / 'drivers' / 'chromedriver' / '**' / _DRIVER_NAME))
+    yield 'PATH', shutil.which(_DRIVER_NAME)
+
+
+def resolve_driver_path(driver_path=None, offline=False):
+    """
+    Caminho do ChromeDriver, resolvido uma única vez por processo.
+
+    Args:
+        driver_path: caminho fixo (opcional), tem prioridade sobre tudo
+        offline: não consultar a rede; falha se não houver driver local
+
+    Returns:
+        str: caminho do executável
+    """
+    with _lock:
+        key = (driver_path, offline)
+        if key in _resolved:
+            return _resolved[key]
+
+        if driver_path and not _is_executable(driver_path):
+            raise FileNotFoundError(f"ChromeDriver não encontrado ou sem permissão de execução: {driver_path}")
+
+        start = time.perf_counter()
+        for source, path in _candidates(driver_path, offline):
+            if _is_executable(path) and (source in _EXPLICIT_SOURCES or path not in _rejected):
+                break
+        else:
+            if offline:
+                raise FileNotFoundError(
+                    f"ChromeDriver não encontrado localmente (modo offline). "
+                    f"Use --driver-path ou a variável {DRIVER_ENV_VAR}."
+                )
+            from webdriver_manager.chrome import ChromeDriverManager
+            source, path = 'download', ChromeDriverManager().install()
+
+        if source != 'cache':
+            _write_cache(path)
+
+        print(f"ChromeDriver ({source}): {path} [{time.perf_counter() - start:.2f}s]")
+        _resolved[key] = path
+        _sources[path] = source
+        return path
+
+
+def forget_driver_path(path):
+    """
+    Descarta um driver recusado pelo Chrome: memória do processo e cache em disco.
+
+    Returns:
+        bool: False se o driver foi escolhido pelo usuário (--driver-path / CHROMEDRIVER_PATH)
+    """
+    with _lock:
+        if _sources.get(path) in _EXPLICIT_SOURCES:
+            return False
+
+        _rejected.add(path)
+        for key, value in list(_resolved.items()):
+            if value == path:
+                del _resolved[key]
+        if _read_cache() == path:
+            try:
+                DRIVER_CACHE_FILE.unlink()
+            except OSError:
+                pass
+        return True
+
+
+def is_version_mismatch(error):
+    """SessionNotCreated por versão do ChromeDriver diferente da do Chrome instalado."""
+    message = (getattr(error, 'msg', None) or str(error)).lower()
+    return isinstance(error, SessionNotCreatedException) and (
+        'only supports chrome version' in message or 'current browser version' in message
+    )
+
+
+def launch_chrome(options, driver_path=None, offline=False):
+    """
+    Abre o Chrome com o driver resolvido; com versão incompatível, resolve de novo uma vez.
+
+    Returns:
+        WebDriver: navegador aberto
+    """
+    path = resolve_driver_path(driver_path, offline)
+    try:
+        return webdriver.Chrome(service=Service(path), options=options)
+    except SessionNotCreatedException as e:
+        if not is_version_mismatch(e) or not forget_driver_path(path):
+            raise
+        print(f"⚠️ ChromeDriver incompatível com o Chrome instalado ({path}); resolvendo de novo")
+        return webdriver.Chrome(service=Service(resolve_driver_path(driver_path, offline)), options=options)
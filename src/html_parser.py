@@ -0,0 +1,162 @@
+"""
+Backends de parsing HTML intercambiáveis.
+
+Todos expõem a mesma interface usada pelos scrapers (subconjunto do
+BeautifulSoup): find/find_all com name e class_, get_text/text, get e name.
+
+Backends:
+    html.parser  BeautifulSoup + html.parser (padrão, comportamento original)
+    strainer     BeautifulSoup restrito às subárvores de interesse (SoupStrainer)
+    lxml         lxml.html (C, pip install lxml)
+    selectolax   selectolax/lexbor (C, pip install selectolax)
+"""
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+PARSER_BACKENDS = ('html.parser', 'strainer', 'lxml', 'selectolax')
+
+# Subárvores necessárias em cada página (usadas pelo backend "strainer")
+LISTING_CLASSES = ['merchant-list-v2__item-wrapper']
+DETAIL_CLASSES = ['merchant-info__minimum-order', 'merchant-details-about__info', 'merchant-details-payment']
+
+
+def _names(name):
+    """Normaliza o filtro de tag: None, 'div' ou ['p', 'span']."""
+    if name is None:
+        return None
+    return {name} if isinstance(name, str) else set(name)
+
+
+class _Node:
+    """Base dos adaptadores: implementa find/text em cima de find_all/get_text."""
+
+    def find(self, name=None, class_=None):
+        for node in self._iter_matches(name, class_):
+            return node
+        return None
+
+    def find_all(self, name=None, class_=None):
+        return list(self._iter_matches(name, class_))
+
+    @property
+    def text(self):
+        return self.get_text()
+
+
+class _LxmlNode(_Node):
+    """Adaptador de um elemento lxml.html."""
+
+    def __init__(self, element):
+        self._el = element
+
+    @property
+    def name(self):
+        return self._el.tag
+
+    def _iter_matches(self, name, class_):
+        # Filtro simples: XPath em C quando há tag e classe únicas
+        if isinstance(name, str) and class_:
+            xpath = f".//{name}[contains(concat(' ', normalize-space(@class), ' '), ' {class_} ')]"
+            for element in self._el.xpath(xpath):
+                yield _LxmlNode(element)
+            return
+
+        names = _names(name)
+        for element in self._el.iterdescendants():
+            if not isinstance(element.tag, str):
+                continue  # comentários / instruções de processamento
+            if names is not None and element.tag not in names:
+                continue
+            if class_ and class_ not in (element.get('class') or '').split():
+                continue
+            yield _LxmlNode(element)
+
+    def get_text(self):
+        return self._el.text_content()
+
+    def get(self, attr, default=None):
+        value = self._el.get(attr)
+        if value is None:
+            return default
+        return value.split() if attr == 'class' else value
+
+
+class _SelectolaxNode(_Node):
+    """Adaptador de um nó selectolax (lexbor)."""
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def name(self):
+        return self._node.tag
+
+    def _iter_matches(self, name, class_):
+        # Filtro simples: seletor CSS do lexbor
+        if isinstance(name, str) and class_:
+            for node in self._node.css(f"{name}.{class_}"):
+                yield _SelectolaxNode(node)
+            return
+
+        names = _names(name)
+        for node in self._node.traverse(include_text=False):
+            if node.mem_id == self._node.mem_id:
+                continue
+            if not isinstance(node.tag, str) or node.tag.startswith('-'):
+                continue  # comentários / nós especiais
+            if names is not None and node.tag not in names:
+                continue
+            if class_ and class_ not in (node.attributes.get('class') or '').split():
+                continue
+            yield _SelectolaxNode(node)
+
+    def get_text(self):
+        return self._node.text(deep=True)
+
+    def get(self, attr, default=None):
+        value = self._node.attributes.get(attr)
+        if value is None:
+            return default
+        return value.split() if attr == 'class' else value
+
+
+class HtmlParser:
+    """Fábrica de documentos para o backend escolhido."""
+
+    def __init__(self, backend='html.parser', only_classes=None):
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"Parser inválido: {backend} (use {', '.join(PARSER_BACKENDS)})")
+
+        self.backend = backend
+        self.only_classes = only_classes
+
+        if backend == 'lxml':
+            try:
+                import lxml.html
+            except ImportError:
+                raise ImportError("Backend 'lxml' requer: pip install lxml")
+            self._lxml = lxml.html
+        elif backend == 'selectolax':
+            try:
+                from selectolax.lexbor import LexborHTMLParser
+            except ImportError:
+                raise ImportError("Backend 'selectolax' requer: pip install selectolax")
+            self._lexbor = LexborHTMLParser
+
+    def parse(self, html):
+        """Faz o parsing do HTML e retorna o nó raiz do documento."""
+        if self.backend == 'html.parser':
+            return BeautifulSoup(html, 'html.parser')
+
+        if self.backend == 'strainer':
+            strainer = SoupStrainer(class_=self.only_classes) if self.only_classes else None
+            return BeautifulSoup(html, 'html.parser', parse_only=strainer)
+
+        if self.backend == 'lxml':
+            if not html or not html.strip():
+                html = '<html></html>'
+            # document_fromstring garante a raiz <html>: fragmentos viram descendentes
+            return _LxmlNode(self._lxml.document_fromstring(html))
+
+        return _SelectolaxNode(self._lexbor(html or '').root)
@@ -0,0 +1,206 @@
+"""
+Busca de detalhes via HTTP puro (sem navegador).
+
+Usa uma requests.Session com pool de conexões keep-alive e concorrência
+limitada. Os campos são lidos do HTML renderizado no servidor (mesmos
+extratores do modo Selenium) e, quando ausentes, do estado embutido da página
+(__NEXT_DATA__). Páginas sem os campos obrigatórios voltam como None para o
+fallback com Selenium.
+"""
+
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/126.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9',
+}
+
+_NEXT_DATA_RE = re.compile(r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+
+# Métodos de pagamento do estado embutido -> sufixo das colunas
+_PAYMENT_METHODS = {
+    'DEBIT': 'debito',
+    'CREDIT': 'credito',
+    'PIX': 'pix',
+    'MEAL_VOUCHER': 'vale_refeicao',
+    'CASH': 'dinheiro',
+}
+
+
+def _find_dict(payload, predicate):
+    """Primeiro dicionário (busca em profundidade) que satisfaz o predicado."""
+    if isinstance(payload, dict):
+        if predicate(payload):
+            return payload
+        values = payload.values()
+    elif isinstance(payload, list):
+        values = payload
+    else:
+        return None
+
+    for value in values:
+        found = _find_dict(value, predicate)
+        if found is not None:
+            return found
+    return None
+
+
+def _find_list(payload, key):
+    """Primeira lista não vazia guardada na chave `key`."""
+    found = _find_dict(payload, lambda d: isinstance(d.get(key), list) and d[key])
+    return found[key] if found else []
+
+
+def parse_embedded_state(html):
+    """
+    Extrai pedido mínimo, endereço e pagamentos do __NEXT_DATA__ da página.
+
+    Returns:
+        dict: apenas as chaves encontradas (mesmos nomes dos extratores)
+    """
+    match = _NEXT_DATA_RE.search(html)
+    if not match:
+        return {}
+
+    try:
+        state = json.loads(match.group(1))
+    except ValueError:
+        return {}
+
+    data = {}
+
+    merchant = _find_dict(state, lambda d: 'minimumOrderValue' in d)
+    if merchant is not None:
+        try:
+            data['pedido_minimo'] = float(merchant['minimumOrderValue'] or 0.0)
+        except (TypeError, ValueError):
+            pass
+
+    address = _find_dict(state, lambda d: 'streetName' in d and 'city' in d)
+    if address is not None:
+        street = (address.get('streetName') or '').strip()
+        number = str(address.get('streetNumber') or '').strip()
+        zip_code = re.sub(r'\D', '', str(address.get('zipCode') or ''))
+        data.update({
+            'endereco': f"{street}, {number}" if number else street,
+            'bairro': (address.get('district') or 'Não identificado').strip(),
+            'cidade': (address.get('city') or 'Não identificado').strip(),
+            'uf': (address.get('state') or 'Não identificado').strip(),
+            'cep': f"{zip_code[:5]}-{zip_code[5:]}" if len(zip_code) == 8 else zip_code or 'Não encontrado'
+        })
+
+    payments = _find_list(state, 'paymentMethods')
+    if payments:
+        for payment in payments:
+            kind = payment.get('type') or {}
+            kind = (kind.get('name') if isinstance(kind, dict) else kind) or ''
+            method = payment.get('method') or {}
+            method = (method.get('name') if isinstance(method, dict) else method) or ''
+
+            prefix = 'pag_site_' if kind.upper() == 'ONLINE' else 'pag_entrega_' if kind.upper() == 'OFFLINE' else None
+            suffix = _PAYMENT_METHODS.get(method.upper())
+            if prefix and suffix:
+                data[f'{prefix}{suffix}'] = True
+
+    return data
+
+
+class HttpDetailFetcher:
+    """Busca páginas de restaurante com sessão HTTP compartilhada e concorrência limitada."""
+
+    def __init__(self, scraper, concurrency=8, timeout=10):
+        self.scraper = scraper
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=self.concurrency,
+            pool_maxsize=self.concurrency,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def fetch(self, url):
+        """
+        Busca uma página e extrai os detalhes.
+
+        Returns:
+            dict | None: detalhes completos, ou None se endereço ou pagamentos não vieram no HTML
+            (ou se a página não pôde ser lida: o restaurante vai para o fallback com Selenium)
+        """
+        timer = self.scraper.timer
+        start = time.perf_counter()
+        try:
+            with timer.phase('http.request'):
+                response = self.session.get(self.scraper._page_url(url), timeout=self.timeout)
+                response.raise_for_status()
+        except Exception:  # requests.RequestException e erros inesperados na requisição: fallback
+            return None
+        finally:
+            self.scraper.metrics.observe_page(time.perf_counter() - start, 'http')
+
+        # Sem charset no cabeçalho o requests assume ISO-8859-1 ("Endereço" quebraria)
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            response.encoding = 'utf-8'
+        try:
+            return self._details_from_html(response.text)
+        except Exception as e:
+            # Formato inesperado (estado embutido, tipos dos campos...) não derruba a fase HTTP
+            print(f"⚠️ HTTP: falha ao ler {url} ({type(e).__name__}: {e}); segue para o navegador")
+            return None
+
+    def _details_from_html(self, html):
+        """Detalhes extraídos do HTML (None se faltarem campos obrigatórios)."""
+        with self.scraper.timer.phase('http.parse_html'):
+            doc = self.scraper.html_parser.parse(html)
+
+        details = {
+            'pedido_minimo': self.scraper._extract_minimum_order(doc),
+            **self.scraper._get_address_info(doc),
+            **self.scraper._extract_payment_methods(doc)
+        }
+
+        # Completar com o estado embutido o que não veio renderizado
+        embedded = parse_embedded_state(html)
+        if details['endereco'] in ('Não encontrado', 'Erro na extração'):
+            for key in ('endereco', 'bairro', 'cidade', 'uf', 'cep'):
+                if key in embedded:
+                    details[key] = embedded[key]
+        if not details['pedido_minimo'] and embedded.get('pedido_minimo'):
+            details['pedido_minimo'] = embedded['pedido_minimo']
+        for key, value in embedded.items():
+            if key.startswith('pag_') and value:
+                details[key] = True
+
+        # Campos obrigatórios: endereço e ao menos uma forma de pagamento
+        if details['endereco'] in ('Não encontrado', 'Erro na extração'):
+            return None
+        if not any(value for key, value in details.items() if key.startswith('pag_')):
+            return None
+        return details
+
+    def fetch_many(self, tasks):
+        """
+        Busca as tarefas (índice, URL, Restaurante) em paralelo.
+
+        Yields:
+            tuple: (índice, detalhes ou None quando precisa de fallback), na ordem das tarefas
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            yield from executor.map(lambda task: (task[0], self.fetch(task[1])), tasks)
+
+    def close(self):
+        self.session.close()
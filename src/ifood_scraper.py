@@ -1,24 +1,93 @@
-import pandas as pd
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import itertools
 import time
 import re
 from pathlib import Path
 from datetime import datetime
 
+from .html_parser import HtmlParser, LISTING_CLASSES
+from .dom_scripts import NEW_CARDS_JS, CARD_COUNT_JS, PAGINATE_JS, HARVEST_AND_PRUNE_JS
+from .merchant_feed import DEFAULT_FEED_URL_PATTERN, read_performance_log, rows_from_payloads
+from .driver_resolver import resolve_driver_path, launch_chrome
+from .browser_profile import BROWSER_PROFILES, apply_profile, enable_blocking
+from .merchant_ids import IFOOD_BASE_URL
+from .phase_timer import PhaseTimer, timings_path
+from .card_text import normalize_info, normalize_footer
+from .parquet_sink import OUTPUT_FORMATS, open_writer, output_suffix, require_pyarrow
+from .retry_policy import RetryPolicy, DEFAULT_BASE_DELAY
+
+
+# Motores do loop de "Ver mais": driver (um comando WebDriver por passo) ou
+# script (o loop inteiro roda na página, num único execute_async_script)
+PAGINATION_ENGINES = ('driver', 'script')
+
+# Poda dos cards já coletados no modo de memória limitada
+PRUNE_MODES = ('collapse', 'remove')
+
+# Limite (s) do execute_async_script da paginação na página
+PAGINATION_SCRIPT_TIMEOUT = 30 * 60
+
+# Ordem das colunas do CSV da listagem
+LISTING_COLUMNS = [
+    'Data', 'User_Latitude', 'User_Longitude', 'Geohash', 'URL', 'Restaurante', 'Nota',
+    'Tipo de comida', 'Distancia', 'Tempo Min', 'Tempo Max', 'Preco do Frete'
+]
+
 class IFoodScraper:
-    def __init__(self, n_scrolls=10, output_path=None, timeout=10):
+    def __init__(self, n_scrolls=10, output_path=None, timeout=10, parser_backend='html.parser',
+                 incremental=False, listing_source='dom', feed_url_pattern=DEFAULT_FEED_URL_PATTERN,
+                 output_format='csv', browser_profile='default', blocklist=None,
+                 driver_path=None, offline=False, base_url=IFOOD_BASE_URL, target_count=None,
+                 pagination='driver', prune_dom=None, max_retries=1, retry_delay=DEFAULT_BASE_DELAY):
         """Inicializa o scraper com configurações básicas."""
+        if listing_source not in ('dom', 'network'):
+            raise ValueError(f"Fonte da listagem inválida: {listing_source} (use dom, network)")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Formato de saída inválido: {output_format} (use {', '.join(OUTPUT_FORMATS)})")
+        if output_format == 'parquet':
+            require_pyarrow()  # falhar antes de abrir o navegador, não na hora de salvar
+        if browser_profile not in BROWSER_PROFILES:
+            raise ValueError(f"Perfil de navegador inválido: {browser_profile} (use {', '.join(BROWSER_PROFILES)})")
+        if target_count is not None and target_count < 1:
+            raise ValueError(f"target_count deve ser positivo: {target_count}")
+        if pagination not in PAGINATION_ENGINES:
+            raise ValueError(f"Motor de paginação inválido: {pagination} (use {', '.join(PAGINATION_ENGINES)})")
+        if prune_dom is not None and prune_dom not in PRUNE_MODES:
+            raise ValueError(f"Poda do DOM inválida: {prune_dom} (use {', '.join(PRUNE_MODES)})")
+        if prune_dom and listing_source == 'network':
+            raise ValueError("prune_dom só funciona com listing_source='dom'")
+        incremental = incremental or bool(prune_dom)  # a poda depende da coleta em lotes
+        if pagination == 'script' and (incremental or listing_source == 'network'):
+            # Esses modos precisam do Python entre um clique e outro (lotes de cards / logs de rede)
+            raise ValueError("pagination='script' só funciona com listing_source='dom' sem incremental")
+        
         self.n_scrolls = n_scrolls
+        self.target_count = target_count  # None = n_scrolls ciclos fixos; K = carregar até K cards
+        self.pagination = pagination
+        self.prune_dom = prune_dom  # None = DOM intacto; collapse/remove = poda os cards já coletados
+        self.dom_stats = None
+        self.load_stats = None
         self.timeout = timeout
+        self.incremental = incremental
+        self.listing_source = listing_source
+        self.feed_url_pattern = feed_url_pattern
+        self.feed_payloads = []
+        self._feed_pending = {}  # respostas do feed ainda sem loadingFinished
+        self.output_format = output_format
+        self.browser_profile = browser_profile
+        self.blocklist = blocklist
+        self.driver_path = driver_path
+        self.offline = offline
+        self.html_parser = HtmlParser(parser_backend, only_classes=LISTING_CLASSES)
+        self.timer = PhaseTimer()
+        self.retry_policy = RetryPolicy(max_retries, base_delay=retry_delay)  # só a etapa 'ver_mais'
         self.browser = None
-        self.ifood_url = 'https://www.ifood.com.br/restaurantes'
+        self.base_url = base_url.rstrip('/')  # outro host = servidor local (mock_ifood_server.py)
+        self.ifood_url = f'{self.base_url}/restaurantes'
         
         # Output path
         if output_path:
@@ -35,15 +104,22 @@ class IFoodScraper:
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--no-sandbox')
         
-        self.browser = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options
-        )
-    
-    print(" Navegador inicializado.")
+        # Perfil lean: headless, viewport pequeno, sem imagens/fontes/analytics
+        apply_profile(options, self.browser_profile)
         
-    def _load_restaurants(self):
-        """Navega para iFood e carrega restaurantes com retry simples."""
+        # Modo network: registrar eventos de rede para ler o feed JSON
+        if self.listing_source == 'network':
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        
+        resolve_driver_path(self.driver_path, self.offline)  # fora do tempo de inicialização
+        start = time.perf_counter()
+        self.browser = launch_chrome(options, self.driver_path, self.offline)
+        enable_blocking(self.browser, self.browser_profile, self.blocklist)
+        
+        print(f" Navegador inicializado em {time.perf_counter() - start:.2f}s.")
+        
+    def _open_listing(self):
+        """Navega para a listagem do iFood e aceita a localização."""
         print(f"Acessando {self.ifood_url}")
         self.browser.get(self.ifood_url)
         
@@ -58,46 +134,289 @@ class IFoodScraper:
         except:
             print("Falha na localização, continuando...")
         
-        # Carregar mais restaurantes
+    def _load_restaurants(self):
+        """Navega para iFood e carrega restaurantes com retry simples."""
+        with self.timer.phase('load_restaurants.open_listing'):
+            self._open_listing()
+        if self.listing_source == 'network':
+            self._capture_feed()
+        
+        if self.pagination == 'script':
+            self._load_in_page()
+        elif self.target_count:
+            self._load_until_target()
+        else:
+            self._load_fixed_cycles()
+        
+        print("Carregamento concluído")
+        
+        if self.listing_source == 'network':
+            self._capture_feed(flush=True)
+            return None
+        with self.timer.phase('load_restaurants.page_source'):
+            return self.browser.page_source
+    
+    def _load_fixed_cycles(self):
+        """Clica "Ver mais" n_scrolls vezes, com esperas fixas."""
         print(f"Carregando mais restaurantes ({self.n_scrolls} tentativas)")
         
         for i in range(self.n_scrolls):
-            # Scroll
-            self.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            with self.timer.phase('load_restaurants.ver_mais_cycle'):
+                # Scroll
+                self.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(2)
+                
+                # Tentar clicar "Ver mais" - retry simples
+                if not self._click_ver_mais():
+                    print(f"⚠️ Parou no ciclo {i+1} - sem mais botões")
+                    break
+                
+                time.sleep(3)
+                
+                # Modo network: ler as respostas antes que o Chrome descarte os corpos
+                if self.listing_source == 'network':
+                    self._capture_feed()
+    
+    def _load_until_target(self):
+        """
+        Clica "Ver mais" até haver target_count cards na página.
+        
+        Cada ciclo espera só até a contagem de cards crescer (no máximo
+        self.timeout); se ela não cresce, a listagem acabou e o loop para.
+        """
+        print(f"Carregando até {self.target_count} restaurantes")
+        start = time.perf_counter()
+        count = self._wait_for_more_cards(0)
+        
+        for i in itertools.count(1):
+            if count >= self.target_count:
+                break
             
-            # Tentar clicar "Ver mais" - retry simples
-            if not self._click_ver_mais():
-                print(f"⚠️ Parou no ciclo {i+1} - sem mais botões")
+            with self.timer.phase('load_restaurants.ver_mais_cycle'):
+                self.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                if not self._click_ver_mais():
+                    print(f"⚠️ Parou no ciclo {i} - sem mais botões")
+                    break
+                
+                new_count = self._wait_for_more_cards(count)
+                
+                if self.listing_source == 'network':
+                    self._capture_feed()
+            
+            if new_count <= count:
+                print(f"⚠️ Parou no ciclo {i} - contagem estável em {count} cards")
                 break
+            count = new_count
+        
+        self._report_load_rate(count, time.perf_counter() - start)
+    
+    def _load_in_page(self):
+        """
+        Roda o loop de "Ver mais" inteiro na página, com um único execute_async_script.
+        
+        Sem alvo, faz até n_scrolls cliques; com target_count, clica até o alvo.
+        Em ambos os casos cada clique espera só até novos cards aparecerem
+        (MutationObserver, limite self.timeout) e o loop para se a lista estabiliza.
+        """
+        max_clicks = 0 if self.target_count else self.n_scrolls
+        if self.target_count:
+            print(f"Carregando na página até {self.target_count} restaurantes")
+        else:
+            print(f"Carregando na página ({max_clicks} cliques)")
+        
+        self.browser.set_script_timeout(PAGINATION_SCRIPT_TIMEOUT)
+        deadline_ms = (PAGINATION_SCRIPT_TIMEOUT - 30) * 1000  # devolve o resultado antes do limite do driver
+        start = time.perf_counter()
+        result = self.browser.execute_async_script(
+            PAGINATE_JS, max_clicks, self.target_count or 0, int(self.timeout * 1000), deadline_ms
+        )
+        elapsed = time.perf_counter() - start
+        
+        click_times = [click['ms'] / 1000 for click in result['clicks']]
+        for seconds in click_times:
+            self.timer.record('load_restaurants.ver_mais_click', seconds)
+        
+        print(f"{len(click_times)} cliques, parada: {result['reason']}")
+        if click_times:
+            print(f"Por clique: média {sum(click_times) / len(click_times):.2f}s, máx {max(click_times):.2f}s "
+                  f"(overhead do protocolo: {elapsed - result['ms'] / 1000:.2f}s no total)")
+        self._report_load_rate(result['count'], elapsed)
+        self.load_stats.update(clicks=len(click_times), stop_reason=result['reason'])
+    
+    def _card_count(self):
+        return self.browser.execute_script(CARD_COUNT_JS)
+    
+    def _wait_for_more_cards(self, previous):
+        """
+        Espera a quantidade de cards passar de `previous` (limite: self.timeout).
+        
+        Returns:
+            int: a nova contagem, ou a atual se ela não cresceu a tempo
+        """
+        try:
+            return WebDriverWait(self.browser, self.timeout, poll_frequency=0.1).until(
+                lambda driver: (count := driver.execute_script(CARD_COUNT_JS)) > previous and count
+            )
+        except TimeoutException:
+            return self._card_count()
+    
+    def _report_load_rate(self, count, elapsed):
+        """Imprime (e guarda para o JSON de tempos) a vazão do carregamento em cards/s."""
+        rate = count / elapsed if elapsed > 0 else 0.0
+        self.load_stats = {'target_count': self.target_count, 'cards': count,
+                           'seconds': round(elapsed, 3), 'cards_per_s': round(rate, 2)}
+        print(f"{count} cards carregados em {elapsed:.1f}s ({rate:.1f} cards/s)")
+
+    def _capture_feed(self, flush=False):
+        """Acumula os payloads JSON do feed registrados nos logs de rede (flush na última leitura)."""
+        payloads = read_performance_log(self.browser, self.feed_url_pattern, self._feed_pending, flush)
+        self.feed_payloads.extend(payloads)
+        return len(payloads)
+
+    def _extract_feed_data(self):
+        """Monta as linhas direto do feed JSON capturado (sem parsing de HTML)."""
+        print(f"Extraindo dados de {len(self.feed_payloads)} respostas do feed")
+        
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        user_location = self._get_user_location()
+        
+        restaurants_data = rows_from_payloads(self.feed_payloads, current_time, user_location, self.base_url)
+        print(f" {len(restaurants_data)} restaurantes processados com sucesso")
+        return restaurants_data
+
+    def _collect_new_cards(self, already_harvested):
+        """Retorna o HTML apenas dos cards carregados após os já coletados (podando-os se prune_dom)."""
+        with self.timer.phase('harvest.collect_new_cards'):
+            if not self.prune_dom:
+                return self.browser.execute_script(NEW_CARDS_JS, already_harvested)
+            result = self.browser.execute_script(HARVEST_AND_PRUNE_JS, self.prune_dom)
+        
+        self._track_dom_size(result['nodes'], result['heap'])
+        return result['cards']
+    
+    def _track_dom_size(self, nodes, heap):
+        """Guarda o tamanho atual e o pico do DOM/heap (vão para o JSON de tempos)."""
+        heap_mb = round(heap / 2**20, 1) if heap else None
+        previous = self.dom_stats or {'max_nodes': 0, 'max_heap_mb': None}
+        self.dom_stats = {
+            'nodes': nodes,
+            'heap_mb': heap_mb,
+            'max_nodes': max(previous['max_nodes'], nodes),
+            'max_heap_mb': max(filter(None, (previous['max_heap_mb'], heap_mb)), default=None),
+        }
+    
+    def _wait_for_new_cards(self, harvested):
+        """
+        Espera cards além dos `harvested` já coletados.
+        
+        Returns:
+            int: total de cards vistos (coletados + novos na página)
+        """
+        if self.prune_dom == 'remove':
+            # Cards coletados saem do DOM: todos os que estão na página são novos
+            return harvested + self._wait_for_more_cards(0)
+        return self._wait_for_more_cards(harvested)
+
+    def _parse_card_batch(self, cards_html, current_time, user_location):
+        """Parseia um lote de cards (outerHTML) em dicionários de restaurante."""
+        if not cards_html:
+            return []
+        
+        with self.timer.phase('harvest.parse_card_batch'):
+            soup = self.html_parser.parse(''.join(cards_html))
+            containers = soup.find_all('div', class_='merchant-list-v2__item-wrapper')
+            return self._parse_containers(containers, current_time, user_location)
+
+    def _harvest_restaurants(self):
+        """
+        Carrega restaurantes coletando só os cards novos a cada "Ver mais".
+        
+        O lote anterior é parseado enquanto a página carrega o próximo. Se o
+        carregamento falhar no meio, os lotes já coletados são mantidos.
+        
+        Yields:
+            dict: um restaurante por vez
+        """
+        self._open_listing()
+        
+        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        user_location = self._get_user_location()
+        
+        if self.target_count:
+            print(f"Carregando e coletando até {self.target_count} restaurantes")
+        else:
+            print(f"Carregando e coletando restaurantes ({self.n_scrolls} tentativas)")
+        if self.prune_dom:
+            print(f"Cards coletados são podados do DOM ({self.prune_dom})")
+        harvested = 0
+        pending = []
+        load_start = time.perf_counter()
+        
+        try:
+            if self.target_count:
+                self._wait_for_more_cards(0)
+            pending = self._collect_new_cards(harvested)
+            harvested += len(pending)
             
-            time.sleep(3)
+            for i in itertools.count() if self.target_count else range(self.n_scrolls):
+                if self.target_count and harvested >= self.target_count:
+                    break
+                
+                self.browser.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                if not self.target_count:
+                    time.sleep(2)
+                
+                with self.timer.phase('harvest.click'):
+                    clicked = self._click_ver_mais()
+                if not clicked:
+                    print(f"⚠️ Parou no ciclo {i+1} - sem mais botões")
+                    break
+                
+                # Parsear o lote anterior enquanto os novos cards carregam
+                start = time.perf_counter()
+                batch, pending = pending, []
+                yield from self._parse_card_batch(batch, current_time, user_location)
+                if not self.target_count:
+                    time.sleep(max(0.0, 3 - (time.perf_counter() - start)))
+                elif self._wait_for_new_cards(harvested) <= harvested:
+                    print(f"⚠️ Parou no ciclo {i+1} - contagem estável em {harvested} cards")
+                    break
+                
+                pending = self._collect_new_cards(harvested)
+                harvested += len(pending)
+                dom = f" | DOM {self.dom_stats['nodes']} nós, heap {self.dom_stats['heap_mb']} MB" if self.prune_dom else ""
+                print(f"Ciclo {i+1}: +{len(pending)} restaurantes ({harvested} no total){dom}")
+                
+        except Exception as e:
+            print(f"⚠️ Carregamento interrompido: {e}")
+            print(f"Mantendo {harvested} restaurantes já coletados")
         
+        if self.target_count:
+            self._report_load_rate(harvested, time.perf_counter() - load_start)
+        yield from self._parse_card_batch(pending, current_time, user_location)
         print("Carregamento concluído")
-        return self.browser.page_source
 
     def _click_ver_mais(self):
-        """Clica 'Ver mais' com retry simples (apenas 1 tentativa extra)."""
+        """Clica 'Ver mais'; botão ainda ausente ou stale é repetido com backoff (política de retry)."""
         selectors = [
             '//button[@aria-label="Ver mais"]',
             '//button[contains(@class, "cardstack-nextcontent__button")]'
         ]
         
-        for selector in selectors:
-            try:
-                button = self.browser.find_element(By.XPATH, selector)
-                self.browser.execute_script("arguments[0].click();", button)
-                return True
-            except:
-                continue
+        def attempt(_):
+            error = None
+            for selector in selectors:
+                try:
+                    button = self.browser.find_element(By.XPATH, selector)
+                    self.browser.execute_script("arguments[0].click();", button)
+                    return True
+                except NoSuchElementException as e:
+                    error = e
+            raise error
         
-        # Uma tentativa extra (retry simples)
         try:
-            time.sleep(1)
-            button = self.browser.find_element(By.XPATH, selectors[0])
-            self.browser.execute_script("arguments[0].click();", button)
-            return True
-        except:
+            return self.retry_policy.run('ver_mais', attempt)
+        except Exception:
             return False
         
     def _get_user_location(self):
@@ -143,18 +462,31 @@ class IFoodScraper:
         """Extrai todos os dados do html"""
         print("Extraindo dados")
         
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Buscar todos os containers de restaurantes
-        containers = soup.find_all('div', class_='merchant-list-v2__item-wrapper')
+        with self.timer.phase('extract_all_data.parse_html'):
+            soup = self.html_parser.parse(html)
+            
+            # Buscar todos os containers de restaurantes
+            containers = soup.find_all('div', class_='merchant-list-v2__item-wrapper')
         print(f"Encontrados {len(containers)} restaurantes")
         
         # Dados globais do scraping
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        user_location = self._get_user_location()
+        with self.timer.phase('extract_all_data.user_location'):
+            user_location = self._get_user_location()
 
-        # Listas para dados
-        restaurants_data = []
+        with self.timer.phase('extract_all_data.parse_containers'):
+            restaurants_data = self._parse_containers(containers, current_time, user_location)
+        
+        print(f" {len(restaurants_data)} restaurantes processados com sucesso")
+        return restaurants_data
+    
+
+    def _parse_containers(self, containers, current_time, user_location):
+        """Converte containers merchant-list-v2__item-wrapper em dicionários de restaurante."""
+        # Campos crus de cada card; os textos de info/footer são normalizados juntos no fim
+        cards = []
+        info_texts = []
+        footer_texts = []
         
         # LOOP ÚNICO - extrai tudo de uma vez
         for container in containers:
@@ -163,43 +495,53 @@ class IFoodScraper:
                 link = container.find('a', class_='merchant-v2__link')
                 url = link.get('href') if link else ''
                 if url.startswith('/'):
-                    url = f"https://www.ifood.com.br{url}"
+                    url = f"{self.base_url}{url}"
                 
                 # Nome
                 name_span = container.find('span', class_='merchant-v2__name')
                 nome = name_span.text.strip() if name_span else 'N/A'
                 
-                # Info (nota • tipo • distância)
+                # Info (nota • tipo • distância) e footer (tempo • frete)
                 info_div = container.find('div', class_='merchant-v2__info')
-                nota, tipo, distancia = self._process_info_text(info_div.text if info_div else '')
-                
-                # Footer (tempo • frete)
                 footer_div = container.find('div', class_='merchant-v2__footer')
-                tempo_min, tempo_max, frete = self._process_footer_text(footer_div.text if footer_div else '')
                 
-                # Adicionar à lista (um restaurante completo)
-                restaurants_data.append({
-                    'Data' : current_time,
-                    'User_Latitude': user_location.get('delivery_lat'),
-                    'User_Longitude': user_location.get('delivery_lng'),
-                    'Geohash': user_location.get('geohash'),
-                    'URL': url,
-                    'Restaurante': nome,
-                    'Nota': nota,
-                    'Tipo de comida': tipo,
-                    'Distancia': distancia,
-                    'Tempo Min': tempo_min,
-                    'Tempo Max': tempo_max,
-                    'Preco do Frete': frete
-                })
+                cards.append((url, nome))
+                info_texts.append(info_div.text if info_div else '')
+                footer_texts.append(footer_div.text if footer_div else '')
                 
             except Exception as e:
                 print(f"⚠️ Erro ao processar restaurante: {e}")
                 continue
         
-        print(f" {len(restaurants_data)} restaurantes processados com sucesso")
-        return restaurants_data
+        infos, footers = self._process_card_texts(info_texts, footer_texts)
+        
+        return [
+            {
+                'Data' : current_time,
+                'User_Latitude': user_location.get('delivery_lat'),
+                'User_Longitude': user_location.get('delivery_lng'),
+                'Geohash': user_location.get('geohash'),
+                'URL': url,
+                'Restaurante': nome,
+                'Nota': nota,
+                'Tipo de comida': tipo,
+                'Distancia': distancia,
+                'Tempo Min': tempo_min,
+                'Tempo Max': tempo_max,
+                'Preco do Frete': frete
+            }
+            for (url, nome), (nota, tipo, distancia), (tempo_min, tempo_max, frete) in zip(cards, infos, footers)
+        ]
     
+    def _process_card_texts(self, info_texts, footer_texts):
+        """
+        Normaliza os textos de info e footer de todos os cards numa única passada.
+        
+        Returns:
+            tuple: (lista de (nota, tipo, distancia), lista de (tempo_min, tempo_max, frete))
+        """
+        return (normalize_info(info_texts, self._process_info_text),
+                normalize_footer(footer_texts, self._process_footer_text))
 
     def _process_info_text(self, text):
         """
@@ -267,7 +609,6 @@ class IFoodScraper:
         else:
             try:
                 # Remove tudo exceto números, vírgulas e pontos
-                import re
                 frete_numbers = re.sub(r'[^\d,.]', '', parts[1])
                 frete_numbers = frete_numbers.replace(',', '.')
                 frete = float(frete_numbers) if frete_numbers else 0.0
@@ -277,30 +618,29 @@ class IFoodScraper:
         return tempo_min, tempo_max, frete
         
     def _save_data(self, restaurants_data):
-        """Salva dados direto em CSV - sem batches, sem complicação."""
+        """Grava as linhas (CSV ou Parquet) em streaming, em lotes, à medida que chegam."""
         print("Salvando dados...")
         
-        if not restaurants_data:
-            print("Nenhum dado para salvar")
-            return False
-        
-        # Criar DataFrame
-        df = pd.DataFrame(restaurants_data)
-        
-        # Gerar nome do arquivo (inline)
+        # Gerar nome do arquivo (inline): n_scrolls, ou k<alvo> com --target-count
+        # (o nome é escolhido antes do carregamento, quando os cliques ainda não são conhecidos)
         if not self.output_path:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"bd_scrap_ifood_{self.n_scrolls}_{timestamp}.csv"
+            size = f"k{self.target_count}" if self.target_count else self.n_scrolls
+            filename = f"bd_scrap_ifood_{size}_{timestamp}{output_suffix(self.output_format)}"
             self.output_path = Path("reports") / filename
         
-        # Garantir que diretório existe (uma linha)
-        self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Salvar CSV
+        # Salvar (diretório e cabeçalho/schema criados no primeiro lote)
         try:
-            df.to_csv(self.output_path, encoding='utf-8-sig', index=False)
+            with open_writer(self.output_path, LISTING_COLUMNS, self.output_format) as sink:
+                for restaurant in restaurants_data:
+                    sink.write(restaurant)
+            
+            if sink.rows_written == 0:
+                print("Nenhum dado para salvar")
+                return False
+            
             print(f"Arquivo salvo: {self.output_path}")
-            print(f"Total de restaurantes: {len(df)}")
+            print(f"Total de restaurantes: {sink.rows_written}")
             return True
             
         except Exception as e:
@@ -314,25 +654,42 @@ class IFoodScraper:
         Returns:
             bool: True se bem-sucedido, False caso contrário
         """
+        scrape_start = time.perf_counter()
         try:
             print("Iniciando scraping do iFood...")
             
             # 1. Setup navegador
-            self._setup_browser()
-            
-            # 2. Carregar restaurantes (navegar + clicar "ver mais")
-            html = self._load_restaurants()
+            with self.timer.phase('setup_browser'):
+                self._setup_browser()
             
-            # 3. Extrair TODOS os dados com loop único
-            restaurants_data = self._extract_all_data(html)
+            if self.listing_source == 'network':
+                # 2+3. Carregar e montar as linhas a partir do feed JSON
+                with self.timer.phase('load_restaurants'):
+                    self._load_restaurants()
+                with self.timer.phase('extract_feed_data'):
+                    restaurants_data = self._extract_feed_data()
+            elif self.incremental:
+                # 2+3. Carregar e extrair em lotes, a cada "ver mais"
+                # (gerador: cada lote vai para o CSV assim que é parseado,
+                # então save_data inclui o carregamento; ver harvest.*)
+                restaurants_data = self._harvest_restaurants()
+            else:
+                # 2. Carregar restaurantes (navegar + clicar "ver mais")
+                with self.timer.phase('load_restaurants'):
+                    html = self._load_restaurants()
+                
+                # 3. Extrair TODOS os dados com loop único
+                with self.timer.phase('extract_all_data'):
+                    restaurants_data = self._extract_all_data(html)
             
-            # 4. Validação simples
-            if not restaurants_data:
+            # 4. Validação simples (no modo incremental é feita ao gravar)
+            if isinstance(restaurants_data, list) and not restaurants_data:
                 print("Nenhum restaurante encontrado")
                 return False
             
             # 5. Salvar dados
-            success = self._save_data(restaurants_data)
+            with self.timer.phase('save_data'):
+                success = self._save_data(restaurants_data)
             
             if success:
                 print("Scraping concluído com sucesso!")
@@ -349,4 +706,22 @@ class IFoodScraper:
             # Cleanup simples
             if self.browser:
                 self.browser.quit()
-                print("Navegador fechado")
\ No newline at end of file
+                print("Navegador fechado")
+            # Execução inteira, inclusive as que falharam ou não acharam restaurantes
+            self.timer.record('scrape', time.perf_counter() - scrape_start)
+            self._write_timings()
+    
+    def _write_timings(self):
+        """Grava o resumo por fase (p50/p95/máx) ao lado do arquivo de saída."""
+        if not self.output_path or not self.timer.durations:
+            return
+        try:
+            path = self.timer.write(timings_path(self.output_path), output=str(self.output_path),
+                                    listing_source=self.listing_source, incremental=self.incremental,
+                                    n_scrolls=self.n_scrolls, pagination=self.pagination,
+                                    prune_dom=self.prune_dom, loading=self.load_stats, dom=self.dom_stats,
+                                    retry_policy=self.retry_policy.summary())
+            self.timer.print_summary()
+            print(f"Tempos por fase: {path}")
+        except Exception as e:
+            print(f"Erro ao gravar tempos: {e}")
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Journal append-only (JSONL) das linhas concluídas no scraping de detalhes.
+
+Cada restaurante finalizado vira uma linha gravada e sincronizada em disco
+imediatamente. Se o processo cair (Ctrl+C, crash do Chrome, reboot), a
+execução pode ser retomada pulando as URLs já registradas.
+"""
+
+import json
+import os
+import threading
+
+
+class DetailJournal:
+    """Registro append-only de linhas do CSV de detalhes, indexado por URL."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Lê as linhas já registradas.
+
+        Returns:
+            dict: URL -> linha (a última gravada vence); linha final truncada é ignorada
+        """
+        rows = {}
+        if not self.path.exists():
+            return rows
+
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # escrita interrompida no meio da linha
+                rows[row['URL']] = row
+        return rows
+
+    def open(self, resume=False):
+        """Abre o journal para escrita (anexando se for retomada, senão recomeçando)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+        # Isolar uma eventual linha truncada da próxima gravação
+        if resume and self._file.tell() > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write('\n')
+
+    def append(self, row):
+        """Grava uma linha e força a sincronização em disco."""
+        with self._lock:
+            self._file.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Apaga o journal (após o CSV final ter sido salvo)."""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,168 @@
+"""
+Leitura do feed JSON de restaurantes capturado nos logs de rede do Chrome.
+
+A listagem do iFood é preenchida por chamadas XHR que retornam os restaurantes
+em JSON. Em vez de raspar o texto renderizado ("4.6 • Lanches • 2.9 km"),
+estas funções montam as linhas direto dos campos numéricos do feed.
+"""
+
+import base64
+import json
+import re
+
+from .merchant_ids import IFOOD_BASE_URL
+
+
+# Respostas XHR que carregam o feed da listagem (cardstack / merchant list)
+DEFAULT_FEED_URL_PATTERN = r'marketplace\.ifood\.com\.br/.*(cardstack|merchant)|/v\d+/(home|merchants)'
+
+# Campos que identificam um restaurante no JSON (além de id e name)
+_MERCHANT_HINTS = ('userRating', 'mainCategory', 'distance', 'deliveryFee', 'deliveryInfo', 'slug')
+
+
+def _response_body(browser, request_id):
+    """Corpo JSON de uma resposta já concluída (Network.getResponseBody)."""
+    body = browser.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+    text = base64.b64decode(body['body']).decode('utf-8') if body.get('base64Encoded') else body['body']
+    return json.loads(text)
+
+
+def read_performance_log(browser, url_pattern=DEFAULT_FEED_URL_PATTERN, pending=None, flush=False):
+    """
+    Lê os eventos de rede acumulados e devolve os corpos JSON das respostas do feed.
+
+    Os eventos são consumidos (get_log esvazia o buffer), então deve ser
+    chamado periodicamente durante o carregamento. O corpo só é lido depois
+    do Network.loadingFinished da resposta; respostas ainda em andamento
+    ficam em `pending` (requestId -> URL) para a próxima leitura.
+
+    Args:
+        pending: dict compartilhado entre as leituras (None = só esta leitura)
+        flush: na última leitura, tenta também os corpos ainda pendentes
+    """
+    pattern = re.compile(url_pattern)
+    pending = {} if pending is None else pending
+    payloads = []
+
+    def fetch(request_id):
+        url = pending.pop(request_id)
+        try:
+            payloads.append(_response_body(browser, request_id))
+        except Exception as e:
+            print(f"⚠️ Resposta do feed ignorada ({url}): {e}")
+
+    for entry in browser.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+            method = message.get('method')
+            params = message['params']
+        except (KeyError, ValueError):
+            continue
+
+        if method == 'Network.responseReceived':
+            response = params['response']
+            if pattern.search(response.get('url', '')) and 'json' in response.get('mimeType', ''):
+                pending[params['requestId']] = response.get('url')
+        elif method == 'Network.loadingFinished' and params.get('requestId') in pending:
+            fetch(params['requestId'])
+        elif method == 'Network.loadingFailed' and params.get('requestId') in pending:
+            url = pending.pop(params['requestId'])
+            print(f"⚠️ Resposta do feed falhou ({url}): {params.get('errorText')}")
+
+    if flush:
+        for request_id in list(pending):
+            fetch(request_id)
+
+    return payloads
+
+
+def iter_merchants(payload):
+    """Percorre o JSON e retorna (em ordem) os objetos que representam restaurantes."""
+    if isinstance(payload, dict):
+        if 'id' in payload and 'name' in payload and any(key in payload for key in _MERCHANT_HINTS):
+            yield payload
+            return
+        for value in payload.values():
+            yield from iter_merchants(value)
+    elif isinstance(payload, list):
+        for item in payload:
+            yield from iter_merchants(item)
+
+
+def _to_float(value, default=0.0):
+    try:
+        return float(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_int(value, default=0):
+    try:
+        return int(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def merchant_url(merchant, base_url=IFOOD_BASE_URL):
+    """Monta a URL da página do restaurante (/delivery/<cidade-uf>/<slug>/<id>)."""
+    slug = merchant.get('slug')
+    if not slug:
+        match = re.search(r'slug=([^&]+)', merchant.get('action') or '')
+        slug = match.group(1) if match else ''
+
+    if not slug:
+        return ''
+    return f"{base_url}/delivery/{slug.strip('/')}/{merchant['id']}"
+
+
+def merchant_to_row(merchant, current_time, user_location, base_url=IFOOD_BASE_URL):
+    """Converte um restaurante do feed na mesma linha produzida por _extract_all_data."""
+    category = merchant.get('mainCategory')
+    if isinstance(category, dict):
+        category = category.get('name') or category.get('description')
+
+    # Tempo: faixa explícita (deliveryInfo) ou um único valor (deliveryTime)
+    delivery = merchant.get('deliveryInfo') or {}
+    tempo_min = delivery.get('timeMinMinutes', merchant.get('timeMinMinutes'))
+    tempo_max = delivery.get('timeMaxMinutes', merchant.get('timeMaxMinutes'))
+    if tempo_min is None and tempo_max is None:
+        tempo_min = tempo_max = merchant.get('deliveryTime')
+    tempo_min = _to_int(tempo_min if tempo_min is not None else tempo_max)
+    tempo_max = _to_int(tempo_max if tempo_max is not None else tempo_min)
+
+    # Frete: valores do feed vêm em centavos
+    fee = merchant.get('deliveryFee')
+    if isinstance(fee, dict):
+        frete = 0.0 if fee.get('type') == 'FREE' else _to_float(fee.get('value')) / 100
+    elif 'fee' in delivery:
+        frete = _to_float(delivery.get('fee')) / 100
+    else:
+        frete = _to_float(fee)
+
+    return {
+        'Data': current_time,
+        'User_Latitude': user_location.get('delivery_lat'),
+        'User_Longitude': user_location.get('delivery_lng'),
+        'Geohash': user_location.get('geohash'),
+        'URL': merchant_url(merchant, base_url),
+        'Restaurante': (merchant.get('name') or 'N/A').strip(),
+        'Nota': _to_float(merchant.get('userRating')),
+        'Tipo de comida': category or 'N/A',
+        'Distancia': _to_float(merchant.get('distance')),
+        'Tempo Min': tempo_min,
+        'Tempo Max': tempo_max,
+        'Preco do Frete': frete
+    }
+
+
+def rows_from_payloads(payloads, current_time, user_location, base_url=IFOOD_BASE_URL):
+    """Monta as linhas de todos os payloads, sem repetir restaurantes (por id)."""
+    seen = set()
+    rows = []
+    for payload in payloads:
+        for merchant in iter_merchants(payload):
+            if merchant['id'] in seen:
+                continue
+            seen.add(merchant['id'])
+            rows.append(merchant_to_row(merchant, current_time, user_location, base_url))
+    return rows
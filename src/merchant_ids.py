@@ -0,0 +1,92 @@
+"""
+Identificação canônica de restaurantes.
+
+A mesma loja pode aparecer com URLs diferentes (query strings de tracking,
+slug alterado, http/https). O identificador estável é o UUID no fim do
+caminho (/delivery/<cidade-uf>/<slug>/<uuid>).
+"""
+
+import hashlib
+import os
+import re
+import threading
+import uuid
+from urllib.parse import urlsplit, urlunsplit
+
+
+IFOOD_BASE_URL = 'https://www.ifood.com.br'
+
+_UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.I)
+
+
+def canonical_url(url):
+    """URL sem query string, fragmento e barra final, com host em minúsculas."""
+    parts = urlsplit(str(url).strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), '', ''))
+
+
+def rebase_url(url, base_url):
+    """Troca esquema e host da URL pelos de base_url (ex.: servidor local de testes)."""
+    base = urlsplit(base_url.rstrip('/'))
+    parts = urlsplit(str(url).strip())
+    return urlunsplit((base.scheme, base.netloc, base.path + parts.path, parts.query, parts.fragment))
+
+
+def merchant_id(url):
+    """UUID do restaurante na URL; sem UUID, a URL canônica."""
+    matches = _UUID_RE.findall(urlsplit(str(url).strip()).path)
+    if matches:
+        return matches[-1].lower()
+    return canonical_url(url)
+
+
+class SeenSet:
+    """
+    Conjunto persistente de restaurantes já raspados (compartilhável entre shards).
+
+    Cada id ocupa 16 bytes no arquivo (bytes do UUID, ou MD5 para ids sem
+    UUID), gravados em modo append.
+    """
+
+    RECORD_SIZE = 16
+
+    def __init__(self, path):
+        self.path = path
+        self._keys = set()
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            data = self.path.read_bytes()
+            usable = len(data) - len(data) % self.RECORD_SIZE  # ignora registro truncado
+            self._keys = {data[i:i + self.RECORD_SIZE] for i in range(0, usable, self.RECORD_SIZE)}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'ab')
+        if self._file.tell() % self.RECORD_SIZE:
+            self._file.truncate(self._file.tell() - self._file.tell() % self.RECORD_SIZE)
+
+    @staticmethod
+    def _key(mid):
+        try:
+            return uuid.UUID(mid).bytes
+        except ValueError:
+            return hashlib.md5(mid.encode('utf-8')).digest()
+
+    def __contains__(self, mid):
+        return self._key(mid) in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, mid):
+        key = self._key(mid)
+        with self._lock:
+            if key in self._keys:
+                return
+            self._keys.add(key)
+            self._file.write(key)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
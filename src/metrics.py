@@ -0,0 +1,252 @@
+"""
+Métricas do scraping de detalhes no formato texto do Prometheus.
+
+Contadores (processados, sucessos, erros, retries, reinícios do navegador),
+histograma de latência por página e restaurantes por minuto, publicados num
+arquivo .prom (textfile collector do node_exporter) reescrito a cada
+intervalo e/ou num endpoint HTTP local (/metrics).
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+PREFIX = 'ifood_details'
+
+# Limites (segundos) do histograma de latência por página
+PAGE_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+
+# Janela (segundos) da vazão em restaurantes por minuto; antes de a janela
+# encher, a vazão só é publicada com pelo menos RATE_MIN_SAMPLES páginas
+RATE_WINDOW = 60
+RATE_MIN_SAMPLES = 10
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value)
+
+
+class _Histogram:
+    """Histograma cumulativo no estilo Prometheus (buckets le=...)."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class DetailMetrics:
+    """
+    Registro das métricas de uma execução (thread-safe).
+
+    Os contadores processed/success/errors continuam no scraper; `counters`
+    é chamado a cada exportação para lê-los.
+    """
+
+    def __init__(self, counters, buckets=PAGE_BUCKETS, rate_window=RATE_WINDOW,
+                 rate_min_samples=RATE_MIN_SAMPLES, clock=time.monotonic):
+        self._counters = counters
+        self._buckets = buckets
+        self._rate_window = rate_window
+        self._rate_min_samples = rate_min_samples
+        self._clock = clock  # relógio monotônico da vazão (trocável nos testes)
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self._run_start = clock()
+        self.total = 0
+        self.events = {'retries': 0, 'browser_starts': 0, 'browser_restarts': 0}
+        self.page_latency = {}
+        self.gauges = {}
+        self._completed = deque()
+
+    def start_run(self, total):
+        """Início das páginas: total de tarefas e relógio do restaurantes/minuto."""
+        with self._lock:
+            self.total = total
+            self.started_at = time.time()
+            self._run_start = self._clock()
+
+    def inc(self, event, amount=1):
+        """Incrementa um evento (retries, browser_starts, browser_restarts)."""
+        with self._lock:
+            self.events[event] = self.events.get(event, 0) + amount
+
+    def set_gauge(self, name, value, help_text):
+        """Valor instantâneo extra (ex.: limites do controle de ritmo)."""
+        with self._lock:
+            self.gauges[name] = (value, help_text)
+
+    def observe_page(self, seconds, source='browser'):
+        """Registra a latência de uma página (source: browser ou http)."""
+        with self._lock:
+            if source not in self.page_latency:
+                self.page_latency[source] = _Histogram(self._buckets)
+            self.page_latency[source].observe(seconds)
+
+    def mark_processed(self):
+        """
+        Marca um restaurante buscado agora, no navegador ou via HTTP (base do
+        restaurantes/minuto). Linhas vindas do cache ou do journal não contam.
+        """
+        now = self._clock()
+        with self._lock:
+            self._completed.append(now)
+            self._trim(now)
+
+    def _trim(self, now):
+        while self._completed and self._completed[0] < now - self._rate_window:
+            self._completed.popleft()
+
+    def per_minute(self):
+        """
+        Restaurantes por minuto na janela recente.
+
+        Returns:
+            float | None: None enquanto a janela não encheu e há menos de
+            rate_min_samples páginas (uma janela curta extrapolaria picos falsos)
+        """
+        now = self._clock()
+        with self._lock:
+            self._trim(now)
+            elapsed = now - self._run_start
+            if elapsed < self._rate_window and len(self._completed) < self._rate_min_samples:
+                return None
+            window = min(self._rate_window, max(elapsed, 1e-9))
+            return len(self._completed) * 60 / window
+
+    def render(self):
+        """Todas as métricas no formato texto de exposição do Prometheus."""
+        counters = self._counters()
+        per_minute = self.per_minute()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}' if labels else ''
+                lines.append(f"{PREFIX}_{name}{suffix}{label_text} {_format_value(value)}")
+
+        with self._lock:
+            metric('processed_total', 'counter', 'Restaurantes processados.', [('', (), counters['processed'])])
+            metric('success_total', 'counter', 'Restaurantes com endereço extraído.', [('', (), counters['success'])])
+            metric('errors_total', 'counter', 'Restaurantes sem endereço ou com erro na extração.',
+                   [('', (), counters['errors'])])
+            metric('retries_total', 'counter',
+                   'Novas tentativas após falha, somando as etapas (página, "Ver mais" do Sobre, aba Pagamento).',
+                   [('', (), self.events['retries'])])
+            metric('browser_starts_total', 'counter', 'Inicializações do Chrome.',
+                   [('', (), self.events['browser_starts'])])
+            metric('browser_restarts_total', 'counter', 'Reinicializações do Chrome num worker que já tinha navegador.',
+                   [('', (), self.events['browser_restarts'])])
+
+            samples = []
+            for source, hist in sorted(self.page_latency.items()):
+                for bound, count in zip(hist.buckets, hist.counts):
+                    samples.append(('_bucket', (('source', source), ('le', _format_value(float(bound)))), count))
+                samples.append(('_sum', (('source', source),), round(hist.sum, 6)))
+                samples.append(('_count', (('source', source),), hist.count))
+            metric('page_seconds', 'histogram', 'Latência por página de restaurante.', samples)
+
+            metric('tasks', 'gauge', 'Restaurantes a processar nesta execução.', [('', (), self.total)])
+            # Sem amostra enquanto não há dados suficientes (a série fica ausente, não zerada)
+            metric('restaurants_per_minute', 'gauge',
+                   f'Restaurantes buscados por minuto, sem cache/journal (últimos {self._rate_window}s).',
+                   [('', (), round(per_minute, 3))] if per_minute is not None else [])
+            metric('start_time_seconds', 'gauge', 'Início da execução (epoch).', [('', (), round(self.started_at, 3))])
+            for name, (value, help_text) in sorted(self.gauges.items()):
+                metric(name, 'gauge', help_text, [('', (), value)])
+
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """Grava o .prom de forma atômica (o coletor nunca lê um arquivo pela metade)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(self.render(), encoding='utf-8')
+        os.replace(tmp, path)
+
+
+class MetricsExporter:
+    """Publica as métricas num arquivo .prom (a cada `interval` s) e/ou em http://host:port/metrics."""
+
+    def __init__(self, metrics, textfile=None, port=None, host='127.0.0.1', interval=15.0):
+        self.metrics = metrics
+        self.textfile = Path(textfile) if textfile else None
+        self.port = port
+        self.host = host
+        self.interval = interval
+        self._server = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _handler(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            self._write()
+
+    def _write(self):
+        try:
+            self.metrics.write_textfile(self.textfile)
+        except OSError as e:
+            print(f"Erro ao gravar métricas: {e}")
+
+    def start(self):
+        if self.port is not None:
+            self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+            self._server.daemon_threads = True
+            self.port = self._server.server_address[1]
+            self._threads.append(threading.Thread(target=self._server.serve_forever, daemon=True))
+            print(f"📈 Métricas em http://{self.host}:{self.port}/metrics")
+        if self.textfile:
+            self._write()
+            self._threads.append(threading.Thread(target=self._write_loop, daemon=True))
+            print(f"📈 Métricas em {self.textfile} (a cada {self.interval:g}s)")
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Para as threads; o arquivo recebe os valores finais."""
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self.textfile:
+            self._write()
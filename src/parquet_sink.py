@@ -0,0 +1,162 @@
+"""
+Escrita em Parquet com schema explícito.
+
+Mesma interface dos writers de CSV (write/flush/close, em lotes), mas cada
+lote vira um row group tipado: notas, distâncias e fretes como float, tempos
+como inteiros pequenos, tipo de comida/cidade/UF como categoria (dicionário),
+formas de pagamento como bool e datas como timestamp. Quem lê o arquivo não
+precisa reinferir nenhum tipo.
+
+Requer pyarrow (opcional): pip install pyarrow
+"""
+
+from datetime import datetime
+
+from .csv_sink import StreamingCsvWriter, OrderedCsvWriter
+
+
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+# Tipo de cada coluna conhecida (listagem e detalhes); o resto é texto
+COLUMN_TYPES = {
+    'Data': 'timestamp',
+    'Data_Scraping': 'timestamp',
+    'User_Latitude': 'float',
+    'User_Longitude': 'float',
+    'Nota': 'float',
+    'Distancia': 'float',
+    'Preco do Frete': 'float',
+    'Pedido_Minimo': 'float',
+    'Tempo Min': 'int',
+    'Tempo Max': 'int',
+    'Tipo de comida': 'category',
+    'Cidade': 'category',
+    'UF': 'category',
+}
+
+DEFAULT_COMPRESSION = 'zstd'
+
+
+def require_pyarrow():
+    """Importa pyarrow ou falha com a instrução de instalação."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Formato 'parquet' requer: pip install pyarrow")
+    return pyarrow, pyarrow.parquet
+
+
+def output_suffix(output_format):
+    """Extensão do arquivo de saída para o formato."""
+    return '.parquet' if output_format == 'parquet' else '.csv'
+
+
+def _column_kind(column):
+    if column.startswith('Pag_'):
+        return 'bool'
+    return COLUMN_TYPES.get(column, 'string')
+
+
+def _is_missing(value):
+    return value is None or value != value or (isinstance(value, str) and value.strip() in ('', 'N/A'))
+
+
+def _to_float(value):
+    if _is_missing(value):
+        return None
+    if isinstance(value, str):
+        value = value.replace(',', '.')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value):
+    number = _to_float(value)
+    return None if number is None else int(number)
+
+
+def _to_bool(value):
+    if _is_missing(value):
+        return None
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'sim')
+    return bool(value)
+
+
+def _to_timestamp(value):
+    if _is_missing(value):
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value).strip(), '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+
+def _to_string(value):
+    return None if value is None or value != value else str(value)
+
+
+_CONVERTERS = {
+    'float': _to_float,
+    'int': _to_int,
+    'bool': _to_bool,
+    'timestamp': _to_timestamp,
+    'category': _to_string,
+    'string': _to_string,
+}
+
+
+def build_schema(columns):
+    """Schema pyarrow das colunas, na ordem dada."""
+    pa, _ = require_pyarrow()
+    arrow_types = {
+        'float': pa.float64(),
+        'int': pa.int16(),
+        'bool': pa.bool_(),
+        'timestamp': pa.timestamp('s'),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'string': pa.string(),
+    }
+    return pa.schema([(column, arrow_types[_column_kind(column)]) for column in columns])
+
+
+class StreamingParquetWriter(StreamingCsvWriter):
+    """Anexa linhas (dicionários) a um Parquet, um row group por lote."""
+
+    def __init__(self, path, columns, batch_size=1000, compression=DEFAULT_COMPRESSION):
+        super().__init__(path, columns, batch_size)
+        self.compression = compression
+        self._pa, self._pq = require_pyarrow()
+        self.schema = build_schema(self.columns)
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self._pq.ParquetWriter(str(self.path), self.schema, compression=self.compression)
+
+    def _write_rows(self, rows):
+        arrays = []
+        for field in self.schema:
+            convert = _CONVERTERS[_column_kind(field.name)]
+            values = [convert(row.get(field.name)) for row in rows]
+            arrays.append(self._pa.array(values, type=field.type))
+        self._file.write_table(self._pa.Table.from_arrays(arrays, schema=self.schema))
+
+
+class OrderedParquetWriter(OrderedCsvWriter, StreamingParquetWriter):
+    """Versão thread-safe que recebe linhas fora de ordem (índice, linha)."""
+
+    def __init__(self, path, columns, batch_size=1000, compression=DEFAULT_COMPRESSION):
+        super().__init__(path, columns, batch_size)
+        self.compression = compression
+
+
+def open_writer(path, columns, output_format='csv', ordered=False):
+    """Writer em streaming para o formato pedido (csv ou parquet)."""
+    if output_format == 'parquet':
+        return OrderedParquetWriter(path, columns) if ordered else StreamingParquetWriter(path, columns)
+    return OrderedCsvWriter(path, columns) if ordered else StreamingCsvWriter(path, columns)
@@ -0,0 +1,78 @@
+"""
+Cronômetro por fase do scraping.
+
+Cada fase (inicialização do navegador, navegação, loop do "Ver mais",
+page_source, parsing, gravação...) acumula suas durações; no fim da execução
+o resumo com p50/p95/máximo vai para um JSON ao lado do arquivo de saída.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+def _percentile(sorted_values, fraction):
+    """Percentil por vizinho mais próximo (valores já ordenados)."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class PhaseTimer:
+    """Acumula durações por nome de fase (thread-safe, compartilhado entre workers)."""
+
+    def __init__(self):
+        self.durations = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            self.durations.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def phase(self, name):
+        """Cronometra o bloco como uma ocorrência da fase `name` (mesmo se ele falhar)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def summary(self):
+        """Resumo por fase: quantidade, total, p50, p95 e máximo (segundos)."""
+        with self._lock:
+            snapshot = {name: sorted(values) for name, values in self.durations.items() if values}
+
+        return {
+            name: {
+                'count': len(values),
+                'total': round(sum(values), 6),
+                'p50': round(_percentile(values, 0.50), 6),
+                'p95': round(_percentile(values, 0.95), 6),
+                'max': round(values[-1], 6),
+            }
+            for name, values in snapshot.items()
+        }
+
+    def print_summary(self):
+        """Imprime as fases em ordem de tempo total."""
+        summary = self.summary()
+        if not summary:
+            return
+
+        print("Tempos por fase:")
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]['total']):
+            print(f"  {name}: {stats['count']}x, total {stats['total']:.2f}s, "
+                  f"p50 {stats['p50']:.3f}s, p95 {stats['p95']:.3f}s, máx {stats['max']:.3f}s")
+
+    def write(self, path, **extra):
+        """Grava o resumo em JSON (campos extras, como o arquivo de saída, vão junto)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {**extra, 'phases': self.summary()}
+        path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        return path
+
+
+def timings_path(output_path):
+    """Arquivo de tempos ao lado da saída: <nome>_timings.json."""
+    return output_path.with_name(f"{output_path.stem}_timings.json")
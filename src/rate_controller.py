@@ -0,0 +1,136 @@
+"""
+Controle adaptativo de ritmo dos workers de detalhes.
+
+Um token bucket limita as páginas por segundo e um limite de concorrência
+define quantos workers podem estar numa página ao mesmo tempo. A cada janela
+de páginas concluídas o controlador ajusta os dois no esquema AIMD: se a
+taxa de erro (endereço vazio, erro na extração) ou a latência mediana passam
+do limite, corta pela metade; senão, soma um worker e um passo de taxa.
+Assim o ritmo sobe até o maior valor sustentável e recua quando o site
+começa a bloquear ou a demorar. Cada decisão é impressa e guardada.
+"""
+
+import statistics
+import threading
+import time
+
+
+class RateController:
+    """Token bucket + concorrência AIMD, compartilhado pelos workers (thread-safe)."""
+
+    def __init__(self, max_workers, max_rate=2.0, target_latency=8.0, max_error_rate=0.2,
+                 window=10, min_rate=0.05, clock=time.monotonic):
+        if max_rate <= 0:
+            raise ValueError(f"max_rate deve ser positivo: {max_rate}")
+
+        self.max_workers = max(1, int(max_workers))
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self.window = max(1, int(window))
+        self._clock = clock  # relógio monotônico em segundos (trocável nos testes)
+
+        # Começa devagar: 1 worker e metade da taxa máxima
+        self.limit = 1
+        self.rate = max(self.min_rate, max_rate / 2)
+        self.rate_step = max_rate / 10
+
+        self.active = 0
+        self.tokens = 1.0
+        self.decisions = []
+        self._epoch = 0  # muda a cada ajuste; páginas iniciadas antes não contam na janela nova
+        self._refilled_at = clock()
+        self._window_start = self._refilled_at
+        self._outcomes = []
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        capacity = max(1.0, float(self.limit))
+        self.tokens = min(capacity, self.tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def acquire(self):
+        """
+        Bloqueia até haver vaga de concorrência e um token; ocupa a vaga.
+
+        Returns:
+            int: época do ajuste atual (repassar para release)
+        """
+        with self._cond:
+            while True:
+                if self.active < self.limit:
+                    now = self._clock()
+                    self._refill(now)
+                    if self.tokens >= 1.0:
+                        self.tokens -= 1.0
+                        self.active += 1
+                        return self._epoch
+                    wait = (1.0 - self.tokens) / self.rate
+                else:
+                    wait = None
+                self._cond.wait(wait)
+
+    def release(self, epoch, latency, ok):
+        """Libera a vaga e registra o resultado da página (latência em s, sucesso)."""
+        with self._cond:
+            self.active -= 1
+            # Página iniciada sob o limite anterior: não pesa na avaliação do novo
+            if epoch == self._epoch:
+                self._outcomes.append((latency, ok))
+                if len(self._outcomes) >= self.window:
+                    self._adjust()
+            self._cond.notify_all()
+
+    def _adjust(self):
+        """Fecha a janela e aplica o AIMD (chamado com o lock)."""
+        now = self._clock()
+        outcomes, self._outcomes = self._outcomes, []
+        elapsed, self._window_start = now - self._window_start, now
+
+        error_rate = sum(1 for _, ok in outcomes if not ok) / len(outcomes)
+        p50 = statistics.median(latency for latency, _ in outcomes)
+        throughput = len(outcomes) / elapsed if elapsed > 0 else 0.0
+        old_limit, old_rate = self.limit, self.rate
+
+        if error_rate > self.max_error_rate:
+            reason = f"erro {error_rate:.0%} > {self.max_error_rate:.0%}"
+        elif p50 > self.target_latency:
+            reason = f"p50 {p50:.2f}s > {self.target_latency:g}s"
+        else:
+            reason = None
+
+        if reason:
+            action = 'reduz'
+            self.limit = max(1, self.limit // 2)
+            self.rate = max(self.min_rate, self.rate / 2)
+        else:
+            action = 'aumenta'
+            reason = 'dentro dos limites'
+            self.limit = min(self.max_workers, self.limit + 1)
+            self.rate = min(self.max_rate, self.rate + self.rate_step)
+        self.tokens = min(self.tokens, max(1.0, float(self.limit)))
+        if (old_limit, old_rate) != (self.limit, self.rate):
+            self._epoch += 1
+
+        decision = {
+            'pages': len(outcomes), 'error_rate': round(error_rate, 3), 'p50': round(p50, 3),
+            'throughput': round(throughput, 3), 'action': action, 'reason': reason,
+            'workers': [old_limit, self.limit], 'rate': [round(old_rate, 3), round(self.rate, 3)],
+        }
+        self.decisions.append(decision)
+        if (old_limit, old_rate) == (self.limit, self.rate):
+            return  # já no teto: registrado no histórico, sem poluir o log
+        print(f"[ritmo] {len(outcomes)} páginas: erro {error_rate:.0%}, p50 {p50:.2f}s, "
+              f"{throughput * 60:.1f} pág/min → {action} ({reason}): "
+              f"workers {old_limit}→{self.limit}, taxa {old_rate:.2f}→{self.rate:.2f} pág/s")
+
+    def summary(self):
+        """Estado final e histórico das decisões (vai para o JSON de tempos)."""
+        with self._cond:
+            return {
+                'max_workers': self.max_workers, 'max_rate': self.max_rate,
+                'target_latency': self.target_latency, 'max_error_rate': self.max_error_rate,
+                'window': self.window, 'final_workers': self.limit, 'final_rate': round(self.rate, 3),
+                'decisions': list(self.decisions),
+            }
@@ -1,31 +1,193 @@
 import pandas as pd
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 from pathlib import Path
 from datetime import datetime
 import os
 import re
+import queue
+import threading
+
+from .waits import WaitEngine, page_ready, address_present, payment_present
+from .dom_scripts import DETAILS_EXTRACTION_JS
+from .html_parser import HtmlParser, DETAIL_CLASSES
+from .http_fetcher import HttpDetailFetcher
+from .journal import DetailJournal
+from .driver_resolver import resolve_driver_path, launch_chrome
+from .browser_profile import BROWSER_PROFILES, apply_profile, enable_blocking
+from .parquet_sink import OUTPUT_FORMATS, open_writer, output_suffix, require_pyarrow
+from .detail_cache import DetailCache
+from .merchant_ids import merchant_id, rebase_url, SeenSet
+from .phase_timer import PhaseTimer, timings_path
+from .metrics import DetailMetrics, MetricsExporter
+from .rate_controller import RateController
+from .retry_policy import RetryPolicy, DEFAULT_BASE_DELAY, classify
+
+
+# Ordem das colunas do CSV de detalhes
+DETAIL_COLUMNS = [
+    'URL', 'Restaurante', 'Pedido_Minimo', 'Endereco', 'Bairro', 'Cidade', 'UF', 'CEP',
+    'Pag_Site_Debito', 'Pag_Site_Credito', 'Pag_Site_PIX', 'Pag_Site_Vale_Refeicao',
+    'Pag_Entrega_Debito', 'Pag_Entrega_Credito', 'Pag_Entrega_PIX', 'Pag_Entrega_Vale_Refeicao',
+    'Pag_Entrega_Dinheiro', 'Data_Scraping'
+]
+
+# Pagamentos quando a aba não abre (ou na nova tentativa, que lê só o básico)
+NO_PAYMENT_METHODS = {
+    'pag_site_debito': False,
+    'pag_site_credito': False,
+    'pag_site_pix': False,
+    'pag_site_vale_refeicao': False,
+    'pag_entrega_debito': False,
+    'pag_entrega_credito': False,
+    'pag_entrega_pix': False,
+    'pag_entrega_vale_refeicao': False,
+    'pag_entrega_dinheiro': False
+}
+
+# XPaths do botão "Ver mais" do "Sobre" e da aba "Pagamento" (o primeiro com espera, os demais de reserva)
+ABOUT_SEE_MORE_XPATHS = (
+    '//button[@class="merchant-details-about__description-see-more-button"]',
+    '//button[contains(text(), "Ver mais")]',
+)
+# Ao interromper: espera (s) pelos workers terminarem a página atual antes de
+# fechar os navegadores deles à força
+WORKER_STOP_TIMEOUT = 15
+
+# Tentativas de abrir um Chrome novo depois de uma queda; sem navegador, o worker encerra
+BROWSER_RESTART_ATTEMPTS = 2
+
+PAYMENT_TAB_XPATHS = (
+    '//button[contains(text(), "Pagamento")]',
+    '//button[@role="tab" and contains(text(), "Pagamento")]',
+    '//button[contains(@class, "marmita-tab") and contains(text(), "Pagamento")]',
+)
 
 
 class RestaurantDetailsScraper:
     """Classe para extrair detalhes completos dos restaurantes do iFood."""
     
-    def __init__(self, csv_directory="reports", timeout=10):
+    EXTRACTION_MODES = ('soup', 'js')
+    FETCH_MODES = ('browser', 'http')
+    
+    def __init__(self, csv_directory="reports", timeout=10, workers=1, wait_timeouts=None,
+                 extraction_mode='soup', parser_backend='html.parser', fetch_mode='browser',
+                 http_concurrency=8, resume=False, cache_ttl_hours=None, cache_max_entries=50000,
+                 seen_set_path=None, output_format='csv', browser_profile='default', blocklist=None,
+                 driver_path=None, offline=False, base_url=None, metrics_file=None, metrics_port=None,
+                 metrics_interval=15.0, adaptive=False, max_rate=2.0, target_latency=8.0, max_error_rate=0.2,
+                 max_retries=1, step_retries=None, retry_budget=None, retry_delay=DEFAULT_BASE_DELAY):
+        if extraction_mode not in self.EXTRACTION_MODES:
+            raise ValueError(f"Modo de extração inválido: {extraction_mode} (use {', '.join(self.EXTRACTION_MODES)})")
+        if fetch_mode not in self.FETCH_MODES:
+            raise ValueError(f"Modo de busca inválido: {fetch_mode} (use {', '.join(self.FETCH_MODES)})")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Formato de saída inválido: {output_format} (use {', '.join(OUTPUT_FORMATS)})")
+        if output_format == 'parquet':
+            require_pyarrow()
+        if browser_profile not in BROWSER_PROFILES:
+            raise ValueError(f"Perfil de navegador inválido: {browser_profile} (use {', '.join(BROWSER_PROFILES)})")
+        
         self.csv_directory = Path(csv_directory)
         self.timeout = timeout
+        self.workers = max(1, int(workers))
+        self.extraction_mode = extraction_mode
+        self.fetch_mode = fetch_mode
+        self.output_format = output_format
+        self.browser_profile = browser_profile
+        self.base_url = base_url  # None = URLs do CSV; outro host = servidor local (mock_ifood_server.py)
+        self.blocklist = blocklist
+        self.record_network = False  # log 'performance' (usado no comparativo de perfis)
+        self.http_concurrency = http_concurrency
+        self.resume = resume
+        self.journal = None
+        
+        # Cache de detalhes entre execuções (desligado quando cache_ttl_hours é None)
+        self.cache_ttl_hours = cache_ttl_hours
+        self.cache_max_entries = cache_max_entries
+        self.cache = None
+        
+        # Restaurantes já raspados por outros shards (arquivo compartilhado)
+        self.seen = SeenSet(Path(seen_set_path)) if seen_set_path else None
+        
+        self.html_parser = HtmlParser(parser_backend, only_classes=DETAIL_CLASSES)
+        
+        # Esperas por condição: o timeout é o limite padrão de cada alvo
+        self.waits = WaitEngine({
+            'page': timeout, 'address': timeout, 'payment': timeout,
+            **(wait_timeouts or {})
+        })
+        
+        # Cada worker (thread) tem seu próprio navegador
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._browsers = set()            # navegadores abertos em qualquer thread
+        self._threads = []                # workers da execução atual
+        self._stop = threading.Event()    # interrupção: workers não pegam nova tarefa
+        self._driver_path = driver_path
+        self.offline = offline
+        self.browser_startups = []  # segundos de cada inicialização do Chrome
+        self.timer = PhaseTimer()   # durações por fase (details.*, save_data...)
+        
+        # Métricas Prometheus: arquivo .prom e/ou endpoint HTTP (desligado se ambos None)
+        self.metrics = DetailMetrics(self._counters)
+        self.metrics_file = metrics_file
+        self.metrics_port = metrics_port
+        self.metrics_interval = metrics_interval
+        self._exporter = None
+        
+        # Ritmo adaptativo: workers vira o teto da concorrência (desligado = todos em paralelo, sem limite de taxa)
+        self.rate_controller = RateController(self.workers, max_rate=max_rate, target_latency=target_latency,
+                                              max_error_rate=max_error_rate) if adaptive else None
+        
+        # Retry por tipo de falha: backoff com jitter, orçamento por etapa e global
+        self.retry_policy = RetryPolicy(max_retries, step_retries=step_retries, budget=retry_budget,
+                                        base_delay=retry_delay)
+        
         self.browser = None
         self.df_original = None
-        self.restaurants_data = []
+        self.output_path = None
+        self._sink = None
         self.processed = 0
         self.success = 0
         self.errors = 0
     
+    @property
+    def browser(self):
+        """Navegador da thread atual."""
+        return getattr(self._local, 'browser', None)
+    
+    @browser.setter
+    def browser(self, value):
+        self._local.browser = value
+    
+    def _increment(self, counter, fetched=False):
+        """
+        Incrementa um contador (processed/success/errors) de forma thread-safe.
+        
+        fetched=True marca um restaurante buscado agora (navegador ou HTTP), o
+        único que conta na vazão das métricas; cache e journal não contam.
+        """
+        with self._lock:
+            value = getattr(self, counter) + 1
+            setattr(self, counter, value)
+        if counter == 'processed' and fetched:
+            self.metrics.mark_processed()
+        return value
+    
+    def _counters(self):
+        """Contadores atuais (lidos pelo exportador de métricas)."""
+        with self._lock:
+            return {'processed': self.processed, 'success': self.success, 'errors': self.errors}
+    
+    def _get_driver_path(self):
+        """Resolve o ChromeDriver uma única vez por processo (cache local, sem rede se possível)."""
+        return resolve_driver_path(self._driver_path, self.offline)
+    
     def _setup_browser(self):
         """Inicializa Chrome com configurações otimizadas."""
         options = webdriver.ChromeOptions()
@@ -36,28 +198,49 @@ class RestaurantDetailsScraper:
         options.add_argument('--log-level=3')
         options.add_experimental_option('excludeSwitches', ['enable-logging'])
         options.add_experimental_option('useAutomationExtension', False)
+        apply_profile(options, self.browser_profile)
+        
+        if self.record_network:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
         
-        self.browser = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options
-        )
+        self._get_driver_path()  # fora do tempo de inicialização
+        start = time.perf_counter()
+        self.browser = launch_chrome(options, self._driver_path, self.offline)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._browsers.add(self.browser)
+            self.browser_startups.append(elapsed)
+        self.timer.record('browser_startup', elapsed)
+        self.metrics.inc('browser_starts')
+        if getattr(self._local, 'started', False):
+            self.metrics.inc('browser_restarts')
+        self._local.started = True
+        enable_blocking(self.browser, self.browser_profile, self.blocklist)
         
         self.browser.set_page_load_timeout(30)
     
+    def _page_url(self, url):
+        """URL a abrir: a do CSV, ou com o host trocado por base_url."""
+        return rebase_url(url, self.base_url) if self.base_url else url
+    
     def _find_latest_csv(self):
-        """Encontra o CSV mais recente no diretório."""
+        """Encontra a listagem mais recente (CSV ou Parquet) no diretório."""
         if not self.csv_directory.exists():
             raise FileNotFoundError(f"Diretório não encontrado: {self.csv_directory}")
         
-        csv_files = list(self.csv_directory.glob("bd_scrap_ifood_*.csv"))
+        csv_files = (list(self.csv_directory.glob("bd_scrap_ifood_*.csv"))
+                     + list(self.csv_directory.glob("bd_scrap_ifood_*.parquet")))
         
         if not csv_files:
-            raise FileNotFoundError("Nenhum arquivo bd_scrap_ifood_*.csv encontrado")
+            raise FileNotFoundError("Nenhum arquivo bd_scrap_ifood_*.csv (ou .parquet) encontrado")
         
         latest_file = max(csv_files, key=os.path.getmtime)
         
-        # Carregar e validar CSV
-        self.df_original = pd.read_csv(latest_file)
+        # Carregar e validar listagem (só as colunas usadas daqui em diante)
+        if latest_file.suffix == '.parquet':
+            self.df_original = pd.read_parquet(latest_file, columns=['URL', 'Restaurante'])
+        else:
+            self.df_original = pd.read_csv(latest_file)
         
         if len(self.df_original) == 0:
             raise ValueError("CSV está vazio")
@@ -81,30 +264,82 @@ class RestaurantDetailsScraper:
             pass
         return 0.0
     
+    def _click_first(self, step, xpaths):
+        """
+        Clica no primeiro botão encontrado: o 1º XPath com espera (até 10s), os demais como reserva.
+        
+        Falhas passam pela política de retry da etapa; queda do navegador sobe para a página.
+        
+        Returns:
+            bool: True se clicou
+        """
+        def attempt(_):
+            error = None
+            for i, xpath in enumerate(xpaths):
+                try:
+                    if i == 0:
+                        button = WebDriverWait(self.browser, 10).until(EC.element_to_be_clickable((By.XPATH, xpath)))
+                    else:
+                        button = self.browser.find_element(By.XPATH, xpath)
+                    self.browser.execute_script("arguments[0].click();", button)
+                    return True
+                except (TimeoutException, NoSuchElementException) as e:
+                    error = e
+            raise error
+        
+        try:
+            return self._retry(step, attempt)
+        except Exception as e:
+            if classify(e) == 'crash':
+                raise
+            return False
+    
     def _click_payment_tab(self):
         """Clica na aba de pagamento."""
-        try:
-            wait = WebDriverWait(self.browser, 10)
-            payment_tab = wait.until(
-                EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "Pagamento")]'))
-            )
-            self.browser.execute_script("arguments[0].click();", payment_tab)
-            time.sleep(4)
-            return True
-        except:
+        return self._click_first('payment_tab', PAYMENT_TAB_XPATHS)
+    
+    def _retry(self, step, fn):
+        """Executa fn(tentativa) pela política de retry da etapa."""
+        return self.retry_policy.run(step, fn, on_retry=self._on_retry)
+    
+    def _on_retry(self, step, kind, attempt, delay):
+        """Antes de cada nova tentativa: conta nas métricas e reabre o Chrome se ele caiu."""
+        self.metrics.inc('retries')
+        self.timer.record('details.retry_backoff', delay)
+        if kind == 'crash':
+            self._restart_browser()
+    
+    def _restart_browser(self):
+        """
+        Descarta o navegador da thread (sessão perdida) e abre outro.
+        
+        Se nenhuma das BROWSER_RESTART_ATTEMPTS tentativas abrir o Chrome, a
+        thread fica sem navegador (self.browser None) e o erro sobe para a página.
+        """
+        self._quit_browser()
+        for attempt in range(1, BROWSER_RESTART_ATTEMPTS + 1):
             try:
-                payment_tab = self.browser.find_element(By.XPATH, '//button[@role="tab" and contains(text(), "Pagamento")]')
-                self.browser.execute_script("arguments[0].click();", payment_tab)
-                time.sleep(4)
-                return True
-            except:
-                try:
-                    payment_tab = self.browser.find_element(By.XPATH, '//button[contains(@class, "marmita-tab") and contains(text(), "Pagamento")]')
-                    self.browser.execute_script("arguments[0].click();", payment_tab)
-                    time.sleep(4)
-                    return True
-                except:
-                    return False
+                self._setup_browser()
+                return
+            except Exception as e:
+                print(f"⚠️ Falha ao reabrir o navegador ({attempt}/{BROWSER_RESTART_ATTEMPTS}): {e}")
+                self._quit_browser()  # pode ter aberto o Chrome antes de falhar
+        raise RuntimeError(f"Navegador não reabriu após {BROWSER_RESTART_ATTEMPTS} tentativas")
+    
+    def _quit_browser(self, browser=None):
+        """Fecha um navegador (padrão: o da thread atual) e o tira do registro."""
+        own = browser is None
+        browser = self.browser if own else browser
+        if browser is None:
+            return
+        with self._lock:
+            self._browsers.discard(browser)
+        try:
+            browser.quit()
+        except Exception:
+            pass
+        if own:
+            self.browser = None
     
     def _extract_payment_methods(self, soup):
         """Extrai métodos de pagamento."""
@@ -165,131 +400,156 @@ class RestaurantDetailsScraper:
         
         return payment_data
     
+    def _extract_in_browser(self, sections):
+        """
+        Extrai campos direto do DOM vivo com um único script injetado.
+        
+        Args:
+            sections: seções a ler ('minimum_order', 'address', 'payment')
+        
+        Returns:
+            dict: mesmas chaves de _extract_minimum_order/_get_address_info/_extract_payment_methods
+        """
+        result = self.browser.execute_script(DETAILS_EXTRACTION_JS, list(sections))
+        # O Selenium devolve número JS inteiro como int (15.0 -> 15); o modo soup grava float
+        if 'pedido_minimo' in result:
+            result['pedido_minimo'] = float(result['pedido_minimo'])
+        return result
+    
+    def _extract_paced(self, url, name):
+        """_extract_details_with_retry respeitando o controle de ritmo (quando ligado)."""
+        if not self.rate_controller:
+            return self._extract_details_with_retry(url, name)
+        
+        controller = self.rate_controller
+        epoch = controller.acquire()
+        start = time.perf_counter()
+        details = None
+        try:
+            details = self._extract_details_with_retry(url, name)
+            return details
+        finally:
+            ok = details is not None and details['endereco'] not in ('Não encontrado', 'Erro na extração')
+            controller.release(epoch, time.perf_counter() - start, ok)
+            self.metrics.set_gauge('concurrency_limit', controller.limit, 'Workers liberados pelo controle de ritmo.')
+            self.metrics.set_gauge('rate_limit', round(controller.rate, 3), 'Páginas por segundo liberadas pelo controle de ritmo.')
+    
+    def _page_document(self):
+        """Lê o page_source e faz o parsing (cada etapa cronometrada à parte)."""
+        with self.timer.phase('details.page_source'):
+            html_content = self.browser.page_source
+        with self.timer.phase('details.parse_html'):
+            return self.html_parser.parse(html_content)
+    
     def _extract_details_with_retry(self, url, name):
         """Extrai detalhes completos de um restaurante com retry."""
+        start = time.perf_counter()
         try:
-            # PASSO 1: Entrar no link e extrair pedido mínimo
-            self.browser.get(url)
-            time.sleep(7)
-            
-            html_content_initial = self.browser.page_source
-            soup_initial = BeautifulSoup(html_content_initial, 'html.parser')
-            pedido_minimo = self._extract_minimum_order(soup_initial)
+            return self._extract_details_steps(url)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timer.record('details.total', elapsed)
+            self.metrics.observe_page(elapsed, 'browser')
+    
+    def _extract_details_steps(self, url):
+        """Passos 1-3 de _extract_details_with_retry; falhas passam pela política de retry da etapa 'page'."""
+        def attempt(number):
+            if number == 0:
+                return self._extract_full(url)
+            # Nova tentativa: extrair pelo menos o básico
+            with self.timer.phase('details.retry'):
+                return self._extract_basic(url)
+        
+        try:
+            result = self._retry('page', attempt)
+        except Exception:
+            self._increment('errors')
+            return {
+                'pedido_minimo': 0.0,
+                'endereco': 'Erro na extração',
+                'bairro': 'Erro na extração',
+                'cidade': 'Erro na extração',
+                'uf': 'Erro na extração',
+                'cep': 'Erro na extração',
+                **NO_PAYMENT_METHODS
+            }
+        
+        if result['endereco'] != 'Não encontrado':
+            self._increment('success')
+        else:
+            self._increment('errors')
+        
+        return result
+    
+    def _extract_full(self, url):
+        """Pedido mínimo, endereço (após "Ver mais") e pagamentos (após a aba "Pagamento")."""
+        # PASSO 1: Entrar no link e extrair pedido mínimo
+        with self.timer.phase('details.step1_page'):
+            self.browser.get(self._page_url(url))
+            self.waits.until(self.browser, 'page', page_ready())
             
-            # PASSO 2: Clicar "Ver mais" e extrair endereço
-            try:
-                wait = WebDriverWait(self.browser, 10)
-                ver_mais_btn = wait.until(
-                    EC.element_to_be_clickable((By.XPATH, '//button[@class="merchant-details-about__description-see-more-button"]'))
-                )
-                self.browser.execute_script("arguments[0].click();", ver_mais_btn)
-                time.sleep(4)
-            except:
-                try:
-                    ver_mais_btn = self.browser.find_element(By.XPATH, '//button[contains(text(), "Ver mais")]')
-                    self.browser.execute_script("arguments[0].click();", ver_mais_btn)
-                    time.sleep(4)
-                except:
-                    pass
+            if self.extraction_mode == 'soup':
+                soup_initial = self._page_document()
+                pedido_minimo = self._extract_minimum_order(soup_initial)
+        
+        # PASSO 2: Clicar "Ver mais" e extrair endereço
+        with self.timer.phase('details.step2_address'):
+            self._click_first('about', ABOUT_SEE_MORE_XPATHS)
             
             # Extrair endereço APÓS clicar "Ver mais"
-            html_content_address = self.browser.page_source
-            soup_address = BeautifulSoup(html_content_address, 'html.parser')
-            address_info = self._get_address_info(soup_address)
-            
-            # PASSO 3: Clicar "Pagamento" e extrair métodos de pagamento
+            self.waits.until(self.browser, 'address', address_present())
+            if self.extraction_mode == 'js':
+                # Pedido mínimo e endereço lidos juntos (antes de trocar de aba)
+                address_info = self._extract_in_browser(['minimum_order', 'address'])
+                pedido_minimo = address_info.pop('pedido_minimo')
+            else:
+                soup_address = self._page_document()
+                address_info = self._get_address_info(soup_address)
+        
+        # PASSO 3: Clicar "Pagamento" e extrair métodos de pagamento
+        with self.timer.phase('details.step3_payment'):
             payment_clicked = self._click_payment_tab()
             
             # Extrair pagamentos APÓS clicar na aba
             if payment_clicked:
-                time.sleep(3)  # Aguardar carregamento
-                html_content_payment = self.browser.page_source
-                soup_payment = BeautifulSoup(html_content_payment, 'html.parser')
-                payment_methods = self._extract_payment_methods(soup_payment)
-            else:
-                payment_methods = {
-                    'pag_site_debito': False,
-                    'pag_site_credito': False,
-                    'pag_site_pix': False,
-                    'pag_site_vale_refeicao': False,
-                    'pag_entrega_debito': False,
-                    'pag_entrega_credito': False,
-                    'pag_entrega_pix': False,
-                    'pag_entrega_vale_refeicao': False,
-                    'pag_entrega_dinheiro': False
-                }
-            
-            # Combinar todos os dados
-            result = {
-                'pedido_minimo': pedido_minimo,
-                **address_info,
-                **payment_methods
-            }
-            
-            if address_info['endereco'] != 'Não encontrado':
-                self.success += 1
+                self.waits.until(self.browser, 'payment', payment_present())
+                if self.extraction_mode == 'js':
+                    payment_methods = self._extract_in_browser(['payment'])
+                else:
+                    soup_payment = self._page_document()
+                    payment_methods = self._extract_payment_methods(soup_payment)
             else:
-                self.errors += 1
-            
-            return result
+                payment_methods = dict(NO_PAYMENT_METHODS)
+        
+        # Combinar todos os dados
+        return {
+            'pedido_minimo': pedido_minimo,
+            **address_info,
+            **payment_methods
+        }
+    
+    def _extract_basic(self, url):
+        """Nova tentativa: recarrega a página e lê só pedido mínimo e endereço."""
+        self.browser.get(self._page_url(url))
+        self.waits.until(self.browser, 'page', page_ready())
+        
+        if self.extraction_mode == 'js':
+            address_info = self._extract_in_browser(['minimum_order', 'address'])
+            pedido_minimo = address_info.pop('pedido_minimo')
+        else:
+            soup = self._page_document()
             
-        except Exception:
-            # Retry simples
-            try:
-                time.sleep(5)
-                self.browser.get(url)
-                time.sleep(8)
-                
-                # Tentar extrair pelo menos o básico
-                html_content = self.browser.page_source
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                pedido_minimo = self._extract_minimum_order(soup)
-                address_info = self._get_address_info(soup)
-                
-                result = {
-                    'pedido_minimo': pedido_minimo,
-                    **address_info,
-                    'pag_site_debito': False,
-                    'pag_site_credito': False,
-                    'pag_site_pix': False,
-                    'pag_site_vale_refeicao': False,
-                    'pag_entrega_debito': False,
-                    'pag_entrega_credito': False,
-                    'pag_entrega_pix': False,
-                    'pag_entrega_vale_refeicao': False,
-                    'pag_entrega_dinheiro': False
-                }
-                
-                if address_info['endereco'] != 'Não encontrado':
-                    self.success += 1
-                else:
-                    self.errors += 1
-                
-                return result
-                
-            except Exception:
-                self.errors += 1
-                return {
-                    'pedido_minimo': 0.0,
-                    'endereco': 'Erro na extração',
-                    'bairro': 'Erro na extração',
-                    'cidade': 'Erro na extração',
-                    'uf': 'Erro na extração',
-                    'cep': 'Erro na extração',
-                    'pag_site_debito': False,
-                    'pag_site_credito': False,
-                    'pag_site_pix': False,
-                    'pag_site_vale_refeicao': False,
-                    'pag_entrega_debito': False,
-                    'pag_entrega_credito': False,
-                    'pag_entrega_pix': False,
-                    'pag_entrega_vale_refeicao': False,
-                    'pag_entrega_dinheiro': False
-                }
+            pedido_minimo = self._extract_minimum_order(soup)
+            address_info = self._get_address_info(soup)
+        
+        return {
+            'pedido_minimo': pedido_minimo,
+            **address_info,
+            **NO_PAYMENT_METHODS
+        }
     
     def _get_address_info(self, soup):
-        """Extrai informações de endereço usando Beautiful Soup."""
+        """Extrai informações de endereço do documento parseado."""
         default_data = {
             'endereco': 'Não encontrado',
             'bairro': 'Não encontrado', 
@@ -366,26 +626,312 @@ class RestaurantDetailsScraper:
                 'cep': 'Erro na extração'
             }
     
+    def _open_output(self):
+        """Cria a saída em streaming (linhas gravadas na ordem do CSV original)."""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f"details_bd_scrap_ifood_{timestamp}{output_suffix(self.output_format)}"
+        self.output_path = self.csv_directory / filename
+        self._sink = open_writer(self.output_path, DETAIL_COLUMNS, self.output_format, ordered=True)
+    
     def _save_data(self):
-        """Salva os dados coletados em CSV."""
-        if not self.restaurants_data:
+        """Finaliza a saída (grava o último lote) e retorna o caminho."""
+        self._sink.close()
+        
+        if self._sink.rows_written == 0:
             return None
+        return self.output_path
+    
+    def _write_timings(self):
+        """Grava o resumo por fase (p50/p95/máx) ao lado do arquivo de saída."""
+        if not self.output_path or not self.timer.durations:
+            return
+        try:
+            path = self.timer.write(timings_path(self.output_path), output=str(self.output_path),
+                                    fetch_mode=self.fetch_mode, extraction_mode=self.extraction_mode,
+                                    workers=self.workers, processed=self.processed,
+                                    success=self.success, errors=self.errors,
+                                    rate_controller=self.rate_controller.summary() if self.rate_controller else None,
+                                    retry_policy=self.retry_policy.summary())
+            print(f"Tempos por fase: {path}")
+        except Exception as e:
+            print(f"Erro ao gravar tempos: {e}")
+    
+    def _build_row(self, url, nome, details, current_time):
+        """Monta a linha final do CSV a partir dos detalhes extraídos."""
+        return {
+            'URL': url,
+            'Restaurante': nome,
+            'Pedido_Minimo': details['pedido_minimo'],
+            'Endereco': details['endereco'],
+            'Bairro': details['bairro'],
+            'Cidade': details['cidade'],
+            'UF': details['uf'],
+            'CEP': details['cep'],
+            'Pag_Site_Debito': details['pag_site_debito'],
+            'Pag_Site_Credito': details['pag_site_credito'],
+            'Pag_Site_PIX': details['pag_site_pix'],
+            'Pag_Site_Vale_Refeicao': details['pag_site_vale_refeicao'],
+            'Pag_Entrega_Debito': details['pag_entrega_debito'],
+            'Pag_Entrega_Credito': details['pag_entrega_credito'],
+            'Pag_Entrega_PIX': details['pag_entrega_pix'],
+            'Pag_Entrega_Vale_Refeicao': details['pag_entrega_vale_refeicao'],
+            'Pag_Entrega_Dinheiro': details['pag_entrega_dinheiro'],
+            'Data_Scraping': current_time
+        }
+    
+    def _record(self, index, row, source='scraped'):
+        """
+        Registra uma linha concluída no CSV de saída.
         
-        df_final = pd.DataFrame(self.restaurants_data)
+        Linhas novas (source='scraped') também vão para o journal e o cache;
+        as vindas do cache só para o journal; as do journal, para nenhum.
+        """
+        success = row['Endereco'] not in ['Não encontrado', 'Erro na extração']
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"details_bd_scrap_ifood_{timestamp}.csv"
-        output_path = self.csv_directory / filename
+        if self.journal and source != 'journal':
+            self.journal.append(row)
+        if self.cache and source == 'scraped' and success:
+            self.cache.put(row['URL'], row)
+        if self.seen is not None and success:
+            self.seen.add(merchant_id(row['URL']))
+        self._sink.put(index, row)
+    
+    def _serve_from_cache(self, tasks):
+        """
+        Preenche com o cache as tarefas cujo restaurante ainda está dentro do TTL.
         
-        # Garantir que diretório existe
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        Returns:
+            list: tarefas que precisam ser buscadas (novas ou expiradas)
+        """
+        pending = []
         
-        df_final.to_csv(output_path, index=False, encoding='utf-8-sig')
+        for task in tasks:
+            index, url, nome = task
+            cached = self.cache.get(url)
+            if cached is None:
+                pending.append(task)
+                continue
+            
+            self._record(index, {**cached, 'URL': url, 'Restaurante': nome}, source='cache')
+            self._increment('success')
+            self._increment('processed')
+        
+        print(f"Cache: {len(tasks) - len(pending)} restaurantes reaproveitados, {len(pending)} a buscar")
+        return pending
+    
+    def _restore_from_journal(self, tasks):
+        """
+        Reaproveita as linhas já concluídas em uma execução anterior.
+        
+        Returns:
+            list: tarefas ainda pendentes
+        """
+        done = self.journal.load() if self.resume else {}
+        pending = []
+        
+        for task in tasks:
+            index, url, _ = task
+            if url in done:
+                self._record(index, done[url], source='journal')
+                self._increment('processed')
+                self._increment('success' if done[url]['Endereco'] not in ['Não encontrado', 'Erro na extração'] else 'errors')
+            else:
+                pending.append(task)
         
-        return output_path
+        if len(pending) < len(tasks):
+            print(f"Retomando: {len(tasks) - len(pending)} restaurantes recuperados do journal, {len(pending)} pendentes")
+        return pending
+    
+    def _load_tasks(self):
+        """
+        Lista de tarefas (índice, URL, Restaurante) na ordem do CSV.
+        
+        Restaurantes repetidos (mesmo id, mesmo com URLs diferentes) entram uma
+        única vez, e os já raspados por outro shard (seen set) são pulados.
+        """
+        tasks = []
+        seen_in_run = set()
+        duplicates = skipped = 0
+        
+        for url, nome in zip(self.df_original['URL'], self.df_original['Restaurante']):
+            mid = merchant_id(url)
+            if mid in seen_in_run:
+                duplicates += 1
+                continue
+            seen_in_run.add(mid)
+            
+            if self.seen is not None and mid in self.seen:
+                skipped += 1
+                continue
+            
+            tasks.append((len(tasks), url, nome))
+        
+        if duplicates:
+            print(f"Duplicados removidos: {duplicates}")
+        if skipped:
+            print(f"Já raspados por outro shard: {skipped}")
+        return tasks
+    
+    def _worker(self, worker_id, tasks, total, current_time):
+        """Consome a fila compartilhada usando um navegador próprio."""
+        try:
+            self._setup_browser()
+        except Exception as e:
+            print(f"[worker {worker_id}] Falha ao inicializar navegador: {e}")
+            return
+        
+        try:
+            while not self._stop.is_set():
+                if self.browser is None:
+                    print(f"[worker {worker_id}] Navegador não reabriu; worker encerrado")
+                    return
+                try:
+                    index, url, nome = tasks.get_nowait()
+                except queue.Empty:
+                    return
+                
+                details = self._extract_paced(url, nome)
+                if self._stop.is_set() and details['endereco'] == 'Erro na extração':
+                    return  # navegador fechado na interrupção: a página fica para o --resume
+                self._record(index, self._build_row(url, nome, details, current_time))
+                
+                processed = self._increment('processed', fetched=True)
+                status = "Sucesso" if details['endereco'] not in ['Não encontrado', 'Erro na extração'] else "Erro"
+                print(f"[{processed}/{total}] [worker {worker_id}] {nome[:35]}... {status}")
+        finally:
+            self._quit_browser()
+    
+    def _run_workers(self, tasks, total, current_time):
+        """Processa as tarefas com N navegadores independentes em paralelo."""
+        task_queue = queue.Queue()
+        for task in tasks:
+            task_queue.put(task)
+        
+        n_workers = min(self.workers, len(tasks))
+        print(f"Iniciando {n_workers} workers...")
+        
+        # daemon só como última garantia: _stop_workers para e espera todos
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(worker_id, task_queue, total, current_time),
+                name=f"details-worker-{worker_id}",
+                daemon=True
+            )
+            for worker_id in range(1, n_workers + 1)
+        ]
+        self._threads = threads
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Todos os workers sem navegador: o journal fica para o --resume
+        if not task_queue.empty() and not self._stop.is_set():
+            raise RuntimeError(f"{task_queue.qsize()} restaurantes sem navegador disponível "
+                               f"(use --resume para continuar)")
+        
+        if task_queue.qsize() == len(tasks):
+            raise RuntimeError("Nenhum worker conseguiu inicializar o navegador")
+    
+    def _stop_workers(self, timeout=WORKER_STOP_TIMEOUT):
+        """
+        Para os workers e fecha todos os navegadores (antes de fechar CSV e journal).
+        
+        Os workers terminam a página atual; quem passar de `timeout` tem o
+        navegador fechado, o que aborta a página em andamento.
+        """
+        self._stop.set()
+        alive = [thread for thread in self._threads if thread.is_alive()]
+        if alive:
+            print(f"Parando {len(alive)} workers...")
+        deadline = time.monotonic() + timeout
+        for thread in alive:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        
+        with self._lock:
+            browsers = list(self._browsers)
+        for browser in browsers:
+            self._quit_browser(browser)
+        
+        for thread in alive:
+            thread.join(timeout)
+            if thread.is_alive():
+                print(f"⚠️ {thread.name} não terminou")
+        self._threads = []
+    
+    def _scrape_sequential(self, tasks, total, current_time):
+        """Processa as tarefas uma a uma no navegador da thread atual."""
+        print("Inicializando navegador...")
+        self._setup_browser()
+        
+        for index, url, nome in tasks:
+            if self.browser is None:
+                raise RuntimeError("Navegador não reabriu após queda do Chrome (use --resume para continuar)")
+            processed = self._increment('processed')
+            nome_curto = nome[:35]
+            print(f"[{processed}/{total}] {nome_curto}...", end=" ")
+            
+            # Extrair detalhes
+            details = self._extract_paced(url, nome)
+            self._record(index, self._build_row(url, nome, details, current_time))
+            self.metrics.mark_processed()  # vazão: página concluída (o contador acima sobe antes, para o log)
+            
+            # Status visual
+            if details['endereco'] not in ['Não encontrado', 'Erro na extração']:
+                print("Sucesso")
+            else:
+                print("Erro")
+    
+    def _fetch_over_http(self, tasks, total, current_time):
+        """
+        Busca os detalhes via HTTP (sem navegador).
+        
+        Returns:
+            list: tarefas que precisam do Selenium
+        """
+        fetcher = HttpDetailFetcher(self, concurrency=self.http_concurrency, timeout=self.timeout)
+        tasks_by_index = {task[0]: task for task in tasks}
+        pending = []
+        
+        print(f"Buscando via HTTP ({fetcher.concurrency} conexões)...")
+        try:
+            for index, details in fetcher.fetch_many(tasks):
+                _, url, nome = tasks_by_index[index]
+                if details is None:
+                    pending.append(tasks_by_index[index])
+                    continue
+                
+                self._record(index, self._build_row(url, nome, details, current_time))
+                self._increment('success')
+                processed = self._increment('processed', fetched=True)
+                print(f"[{processed}/{total}] [http] {nome[:35]}... Sucesso")
+        finally:
+            fetcher.close()
+        
+        print(f"HTTP: {len(tasks) - len(pending)} resolvidos, {len(pending)} para o navegador\n")
+        return pending
+    
+    def _scrape_with_browser(self, tasks, total, current_time):
+        """Processa as tarefas no Selenium (sequencial ou com workers)."""
+        if self.rate_controller:
+            rc = self.rate_controller
+            print(f"Ritmo adaptativo: até {rc.max_workers} workers e {rc.max_rate:g} pág/s "
+                  f"(p50 alvo {rc.target_latency:g}s, erro máx {rc.max_error_rate:.0%})")
+        if self.workers > 1:
+            self._run_workers(tasks, total, current_time)
+        else:
+            self._scrape_sequential(tasks, total, current_time)
     
     def scrape_details(self):
-        """Executa o scraping completo de detalhes."""
+        """
+        Executa o scraping completo de detalhes.
+        
+        Returns:
+            str | None: caminho do arquivo gerado, ou None se não havia nada a raspar
+            (ex.: todos os restaurantes já estão no seen set de outros shards)
+        """
+        run_start = time.perf_counter()
         try:
             print("INICIANDO SCRAPING DE DETALHES COMPLETOS")
             
@@ -393,61 +939,61 @@ class RestaurantDetailsScraper:
             csv_file = self._find_latest_csv()
             print(f"CSV carregado: {csv_file.name} ({len(self.df_original)} restaurantes)")
             
-            # 2. Inicializar navegador
-            print("Inicializando navegador...")
-            self._setup_browser()
-            
-            # 3. Processar restaurantes
+            # 2. Processar restaurantes (linhas vão direto para o CSV, na ordem original)
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            total = len(self.df_original)
+            tasks = self._load_tasks()
+            total = len(tasks)
+            if not tasks:
+                print("Nada a raspar: todos os restaurantes da listagem já foram processados")
+                return None
+            self._open_output()
+            
+            self.metrics.start_run(total)
+            if self.metrics_file or self.metrics_port is not None:
+                self._exporter = MetricsExporter(self.metrics, textfile=self.metrics_file, port=self.metrics_port,
+                                                 interval=self.metrics_interval).start()
             
             print(f"🔄 Processando {total} restaurantes...\n")
             
-            for i in range(total):
-                url = self.df_original.iloc[i]['URL']
-                nome = self.df_original.iloc[i]['Restaurante']
-                
-                self.processed += 1
-                nome_curto = nome[:35]
-                print(f"[{self.processed}/{total}] {nome_curto}...", end=" ")
-                
-                # Extrair detalhes
-                details = self._extract_details_with_retry(url, nome)
-                
-                # Adicionar aos dados
-                self.restaurants_data.append({
-                    'URL': url,
-                    'Restaurante': nome,
-                    'Pedido_Minimo': details['pedido_minimo'],
-                    'Endereco': details['endereco'],
-                    'Bairro': details['bairro'],
-                    'Cidade': details['cidade'],
-                    'UF': details['uf'],
-                    'CEP': details['cep'],
-                    'Pag_Site_Debito': details['pag_site_debito'],
-                    'Pag_Site_Credito': details['pag_site_credito'],
-                    'Pag_Site_PIX': details['pag_site_pix'],
-                    'Pag_Site_Vale_Refeicao': details['pag_site_vale_refeicao'],
-                    'Pag_Entrega_Debito': details['pag_entrega_debito'],
-                    'Pag_Entrega_Credito': details['pag_entrega_credito'],
-                    'Pag_Entrega_PIX': details['pag_entrega_pix'],
-                    'Pag_Entrega_Vale_Refeicao': details['pag_entrega_vale_refeicao'],
-                    'Pag_Entrega_Dinheiro': details['pag_entrega_dinheiro'],
-                    'Data_Scraping': current_time
-                })
-                
-                # Status visual
-                if details['endereco'] not in ['Não encontrado', 'Erro na extração']:
-                    print("Sucesso")
-                else:
-                    print("Erro")
+            # Journal: cada linha concluída é gravada na hora (retomável com resume=True)
+            self.journal = DetailJournal(self.csv_directory / f"details_journal_{csv_file.stem}.jsonl")
+            pending = self._restore_from_journal(tasks)
+            self.journal.open(resume=self.resume)
+            
+            # Cache: restaurantes ainda dentro do TTL não voltam ao navegador
+            if self.cache_ttl_hours and pending:
+                self.cache = DetailCache(self.csv_directory / 'details_cache.sqlite',
+                                         ttl_hours=self.cache_ttl_hours, max_entries=self.cache_max_entries)
+                pending = self._serve_from_cache(pending)
+            
+            if self.fetch_mode == 'http' and pending:
+                with self.timer.phase('fetch_over_http'):
+                    pending = self._fetch_over_http(pending, total, current_time)
+            
+            # Selenium apenas para o que o HTTP não resolveu
+            if pending:
+                with self.timer.phase('scrape_with_browser'):
+                    self._scrape_with_browser(pending, total, current_time)
             
-            # 4. Salvar dados
-            output_path = self._save_data()
+            # 3. Salvar dados (o journal só é descartado depois do CSV final)
+            with self.timer.phase('save_data'):
+                output_path = self._save_data()
+            self.journal.remove()
+            if output_path is None:
+                self.output_path = None  # sem arquivo de saída: sem JSON de tempos
+                print("Nenhuma linha gravada")
+                return None
             
             print(f"\n SCRAPING CONCLUÍDO!")
             print(f"Sucessos: {self.success}/{total}")
             print(f"Erros: {self.errors}/{total}")
+            self.waits.print_summary()
+            self.retry_policy.print_summary()
+            if self.browser_startups:
+                print(f"Inicialização do navegador: {len(self.browser_startups)}x, "
+                      f"média {sum(self.browser_startups) / len(self.browser_startups):.2f}s, "
+                      f"máx {max(self.browser_startups):.2f}s")
+            self.timer.print_summary()
             print(f"Arquivo salvo: {output_path.name}")
             
             return str(output_path)
@@ -457,8 +1003,20 @@ class RestaurantDetailsScraper:
             raise
             
         finally:
-            if self.browser:
-                self.browser.quit()
+            # Workers e navegadores primeiro: ninguém mais escreve no CSV/journal
+            self._stop_workers()
+            if self._sink:
+                self._sink.close()
+            self.timer.record('scrape_details', time.perf_counter() - run_start)
+            self._write_timings()
+            if self._exporter:
+                self._exporter.stop()
+            if self.journal:
+                self.journal.close()
+            if self.cache:
+                self.cache.close()
+            if self.seen is not None:
+                self.seen.close()
 
 
 # Exemplo de uso
@@ -0,0 +1,154 @@
+"""
+Política de retry das etapas do Selenium.
+
+Cada falha é classificada pelo tipo da exceção (timeout, elemento stale,
+elemento inexistente, queda do WebDriver) e cada etapa define quais tipos
+valem nova tentativa: o que é permanente (ex.: a aba de pagamento não existe)
+falha na hora, sem esperas. As novas tentativas usam backoff exponencial com
+jitter e gastam do orçamento da etapa (por chamada) e de um orçamento global
+da execução; com o global esgotado, nenhuma falha é mais repetida.
+"""
+
+import random
+import threading
+import time
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException, NoSuchElementException, NoSuchWindowException,
+    StaleElementReferenceException, TimeoutException, WebDriverException
+)
+from urllib3.exceptions import HTTPError as DriverConnectionError
+
+
+# Tipos de falha
+FAILURE_KINDS = ('timeout', 'stale', 'missing', 'crash', 'other')
+
+# Etapas e os tipos de falha que cada uma repete
+STEP_RETRY_ON = {
+    'page': {'timeout', 'stale', 'crash'},  # página do restaurante inteira (passos 1-3)
+    'about': {'stale'},                     # botão "Ver mais" do "Sobre"
+    'payment_tab': {'stale'},               # aba "Pagamento" (ausente = a página não tem a aba)
+    'ver_mais': {'missing', 'stale'},       # "Ver mais" da listagem (pode ainda estar renderizando)
+}
+
+# Backoff: base * 2^tentativa, limitado a MAX_DELAY, com jitter de até metade do valor
+DEFAULT_BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+
+# Mensagens do WebDriver que indicam sessão do Chrome perdida
+_CRASH_MARKERS = (
+    'invalid session id', 'session deleted', 'chrome not reachable', 'disconnected',
+    'target window already closed', 'tab crashed', 'no such window',
+)
+
+
+def classify(exc):
+    """Tipo da falha: timeout, stale, missing, crash ou other."""
+    if isinstance(exc, TimeoutException):
+        return 'timeout'
+    if isinstance(exc, StaleElementReferenceException):
+        return 'stale'
+    if isinstance(exc, NoSuchElementException):
+        return 'missing'
+    if isinstance(exc, (InvalidSessionIdException, NoSuchWindowException, DriverConnectionError, ConnectionError)):
+        return 'crash'
+    if isinstance(exc, WebDriverException) and any(marker in (exc.msg or '').lower() for marker in _CRASH_MARKERS):
+        return 'crash'
+    return 'other'
+
+
+class RetryPolicy:
+    """Backoff com jitter, orçamento por etapa e orçamento global (thread-safe, compartilhado entre workers)."""
+
+    def __init__(self, retries=1, step_retries=None, budget=None, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=MAX_DELAY, rng=random, sleep=time.sleep):
+        unknown = set(step_retries or {}) - set(STEP_RETRY_ON)
+        if unknown:
+            raise ValueError(f"Etapa de retry inválida: {', '.join(sorted(unknown))} "
+                             f"(use {', '.join(STEP_RETRY_ON)})")
+        if budget is not None and budget < 0:
+            raise ValueError(f"budget não pode ser negativo: {budget}")
+
+        self.retries = {step: retries for step in STEP_RETRY_ON}
+        self.retries.update(step_retries or {})
+        self.budget = budget  # None = sem limite global
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng      # jitter (random.Random com seed nos testes)
+        self._sleep = sleep  # espera entre tentativas (trocável nos testes)
+
+        self.spent = 0
+        self.waited = 0.0
+        self.stats = {}  # "etapa.tipo" -> {'retries': n, 'gave_up': n}
+        self._exhausted_logged = False
+        self._lock = threading.Lock()
+
+    def delay(self, attempt):
+        """Espera antes da tentativa extra nº attempt (0, 1, ...): backoff exponencial com jitter."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return ceiling / 2 + self._rng.uniform(0, ceiling / 2)
+
+    def _take(self, step, kind, attempt):
+        """Reserva uma tentativa extra; False se a falha não deve ser repetida."""
+        key = f"{step}.{kind}"
+        with self._lock:
+            stats = self.stats.setdefault(key, {'retries': 0, 'gave_up': 0})
+            allowed = kind in STEP_RETRY_ON[step] and attempt < self.retries[step]
+            if allowed and self.budget is not None and self.spent >= self.budget:
+                allowed = False
+                if not self._exhausted_logged:
+                    self._exhausted_logged = True
+                    print(f"⚠️ Orçamento global de retries esgotado ({self.budget}); novas falhas não são repetidas")
+            if allowed:
+                self.spent += 1
+                stats['retries'] += 1
+            else:
+                stats['gave_up'] += 1
+            return allowed
+
+    def run(self, step, fn, on_retry=None):
+        """
+        Executa fn(tentativa) repetindo as falhas que a etapa aceita.
+
+        Args:
+            step: etapa (chave de STEP_RETRY_ON)
+            fn: função que recebe o número da tentativa (0 = primeira)
+            on_retry: chamada como on_retry(step, kind, attempt, delay) antes de cada espera
+
+        Returns:
+            o retorno de fn; a última exceção sobe quando não há mais tentativas
+        """
+        attempt = 0
+        while True:
+            try:
+                return fn(attempt)
+            except Exception as e:
+                kind = classify(e)
+                if not self._take(step, kind, attempt):
+                    raise
+                delay = 0.0 if kind == 'stale' else self.delay(attempt)  # stale: só localizar de novo
+                if on_retry:
+                    on_retry(step, kind, attempt, delay)
+                if delay:
+                    self._sleep(delay)
+                    with self._lock:
+                        self.waited += delay
+                attempt += 1
+
+    def summary(self):
+        """Configuração e contagens por etapa/tipo (vai para o JSON de tempos)."""
+        with self._lock:
+            return {
+                'retries': dict(self.retries), 'budget': self.budget, 'base_delay': self.base_delay,
+                'max_delay': self.max_delay, 'spent': self.spent, 'waited': round(self.waited, 3),
+                'by_step': {key: dict(value) for key, value in sorted(self.stats.items())},
+            }
+
+    def print_summary(self):
+        """Imprime as novas tentativas e desistências por etapa/tipo."""
+        with self._lock:
+            items = sorted(self.stats.items())
+        if not items:
+            return
+        details = ', '.join(f"{key} {s['retries']}/{s['retries'] + s['gave_up']}" for key, s in items)
+        print(f"Retries: {self.spent} (espera {self.waited:.1f}s) - repetidas/falhas: {details}")
@@ -0,0 +1,106 @@
+"""
+Esperas orientadas a condição para as páginas de restaurante do iFood.
+
+Substitui os time.sleep fixos: cada espera retorna assim que o elemento-alvo
+aparece no DOM (ou quando o limite configurado estoura) e registra quanto
+tempo realmente levou.
+"""
+
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# Limites máximos (segundos) de cada espera
+DEFAULT_WAIT_TIMEOUTS = {
+    'page': 10,      # página do restaurante carregada (pedido mínimo / "Sobre")
+    'address': 10,   # bloco "Endereço" após clicar "Ver mais"
+    'payment': 10,   # conteúdo da aba "Pagamento"
+}
+
+_ADDRESS_PRESENT_JS = """
+    return Array.from(document.querySelectorAll('div.merchant-details-about__info')).some(div => {
+        const title = div.querySelector('p.merchant-details-about__info-title');
+        return !!title && title.textContent.includes('Endereço');
+    });
+"""
+
+
+def page_ready():
+    """Página do restaurante renderizada: pedido mínimo ou botão "Ver mais" do "Sobre"."""
+    return EC.any_of(
+        EC.presence_of_element_located((By.CSS_SELECTOR, 'div.merchant-info__minimum-order')),
+        EC.presence_of_element_located((By.CSS_SELECTOR, 'button.merchant-details-about__description-see-more-button'))
+    )
+
+
+def address_present():
+    """Bloco merchant-details-about__info com o título "Endereço" presente."""
+    return lambda driver: driver.execute_script(_ADDRESS_PRESENT_JS)
+
+
+def payment_present():
+    """Conteúdo da aba de pagamento (merchant-details-payment) presente."""
+    return EC.presence_of_element_located((By.CSS_SELECTOR, 'div.merchant-details-payment'))
+
+
+class WaitEngine:
+    """Executa esperas por condição e acumula as durações por alvo."""
+
+    def __init__(self, timeouts=None, poll_frequency=0.1):
+        self.timeouts = {**DEFAULT_WAIT_TIMEOUTS, **(timeouts or {})}
+        self.poll_frequency = poll_frequency
+        self.durations = {}
+        self.expired = {}
+        self._lock = threading.Lock()
+
+    def until(self, browser, name, condition):
+        """
+        Espera a condição `name` ficar verdadeira.
+
+        Returns:
+            bool: True se a condição foi atendida, False se o limite estourou
+        """
+        start = time.perf_counter()
+        try:
+            WebDriverWait(browser, self.timeouts[name], poll_frequency=self.poll_frequency).until(condition)
+            ok = True
+        except TimeoutException:
+            ok = False
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.durations.setdefault(name, []).append(elapsed)
+            if not ok:
+                self.expired[name] = self.expired.get(name, 0) + 1
+
+        return ok
+
+    def summary(self):
+        """Resumo por alvo: quantidade, média, máximo e limites estourados."""
+        with self._lock:
+            return {
+                name: {
+                    'count': len(values),
+                    'mean': sum(values) / len(values),
+                    'max': max(values),
+                    'timeouts': self.expired.get(name, 0),
+                    'limit': self.timeouts[name]
+                }
+                for name, values in self.durations.items() if values
+            }
+
+    def print_summary(self):
+        """Imprime o tempo gasto em cada espera."""
+        summary = self.summary()
+        if not summary:
+            return
+
+        print("Tempos de espera:")
+        for name, stats in summary.items():
+            print(f"  {name}: {stats['count']} esperas, média {stats['mean']:.2f}s, "
+                  f"máx {stats['max']:.2f}s (limite {stats['limit']}s, estouros: {stats['timeouts']})")
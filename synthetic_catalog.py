@@ -0,0 +1,37 @@
+"""
+Listas dos restaurantes sintéticos, compartilhadas pelo gerador de fixtures
+(generate_fixtures.py) e pelo servidor local (mock_ifood_server.py).
+
+Os dois sorteiam destas listas com random.Random e seed fixa: mudar a ordem
+ou o conteúdo muda os bytes do corpus (regrave as fixtures e a baseline do
+benchmark) e o catálogo do mock.
+"""
+
+import unicodedata
+
+
+CATEGORIES = ['Lanches', 'Pizza', 'Japonesa', 'Brasileira', 'Açaí', 'Doces & Bolos', 'Marmita', 'Árabe',
+              'Italiana', 'Saudável', 'Padaria', 'Sorvetes', 'Carnes', 'Chinesa', 'Mexicana']
+NAMES = ['Burger', 'Pizzaria', 'Sushi', 'Cantina', 'Empório', 'Casa do', 'Bistrô', 'Lanchonete',
+         'Açaiteria', 'Churrascaria', 'Padaria', 'Restaurante']
+SUFFIXES = ['Central', 'do Zé', 'Bella Napoli', 'Tokyo', 'Sabor Mineiro', 'da Praça', 'Express',
+            'Gourmet', 'Família', 'Delícia', 'Prime', 'da Vila']
+CITIES = [('Uberlandia', 'MG'), ('São Paulo', 'SP'), ('Belo Horizonte', 'MG')]
+DISTRICTS = ['Tubalina', 'Centro', 'Santa Mônica', 'Jardim Karaíba', 'Tibery', 'Martins', 'Savassi', 'Pinheiros']
+STREETS = ['Avenida Sílvio Rugani', 'Rua Duque de Caxias', 'Avenida Rondon Pacheco', 'Rua Goiás',
+           'Avenida João Naves de Ávila', 'Rua Bernardo Guimarães']
+
+# Formas de pagamento: código do feed -> subtipo exibido na aba "Pagamento"
+PAYMENT_LABELS = {'CREDIT': 'Crédito', 'DEBIT': 'Débito', 'PIX': 'Pix', 'MEAL_VOUCHER': 'Vale-refeição', 'CASH': 'Dinheiro'}
+# Títulos das seções da aba "Pagamento" (os que o extrator de pagamentos procura)
+PAYMENT_TITLES = {'site': 'Pagamento pelo site', 'entrega': 'Pagamento na entrega'}
+
+
+def slug(text):
+    """Texto como aparece nas URLs: sem acentos, minúsculo, espaços viram hífen."""
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode().lower().replace(' ', '-')
+
+
+def city_slug(city, uf):
+    """Primeiro trecho do caminho do restaurante (ex.: uberlandia-mg)."""
+    return f"{slug(city)}-{uf.lower()}"
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Testes dos padrões de bloqueio do perfil lean (src/browser_profile.py).
+
+O Network.setBlockedURLs casa cada padrão com a URL inteira, com '*' como
+único curinga; o mesmo casamento é reproduzido aqui para checar que mídia e
+analytics são bloqueados sem pegar requisições da própria página.
+
+Uso:
+    python test_browser_profile.py
+"""
+
+import re
+import sys
+
+from src.browser_profile import blocked_url_patterns
+from tests_support import run
+
+
+def is_blocked(url, patterns):
+    """Casamento do Chrome: padrão inteiro contra a URL, '*' = qualquer sequência."""
+    return any(re.fullmatch('.*'.join(map(re.escape, pattern.split('*'))), url) for pattern in patterns)
+
+
+BLOCKED = [
+    'https://static.ifood-static.com.br/image/upload/logosgde/logo.png',
+    'https://static.ifood-static.com.br/image/upload/t_medium/pratos/burger.jpg?w=200&h=200',
+    'https://www.ifood.com.br/favicon.ico',
+    'https://www.ifood.com.br/static/icons/sprite.svg',
+    'https://fonts.ifood.com.br/ifood-sans.woff2',
+    'https://static-images.ifood.com.br/image/upload/banner',
+    'https://www.google-analytics.com/g/collect?v=2',
+    'https://ifood.app.link/abc123',
+    'https://app.link/',
+    'https://bam.nr-data.net/1/abc',
+]
+
+FIRST_PARTY = [
+    'https://www.ifood.com.br/delivery/uberlandia-mg/svg-burger/0b2e7a9c-4a3f-4c8e-9a51-6f3d2b1c0e11',
+    'https://www.ifood.com.br/delivery/uberlandia-mg/pico-lanches/5d8f1e2a-7b6c-4d3e-8f9a-0b1c2d3e4f50',
+    'https://www.ifood.com.br/_next/static/chunks/icons.svgloader.js',
+    'https://marketplace.ifood.com.br/v2/cardstack/home?icon=.svg&page=1',
+    'https://www.ifood.com.br/restaurantes?redirect=app.link',
+    'https://happ.links.ifood.com.br/promo',
+    'https://www.ifood.com.br/static/app.js',
+]
+
+
+def test_media_and_analytics_are_blocked():
+    patterns = blocked_url_patterns()
+    missed = [url for url in BLOCKED if not is_blocked(url, patterns)]
+    assert not missed, missed
+
+
+def test_first_party_requests_are_not_blocked():
+    patterns = blocked_url_patterns()
+    wrong = [url for url in FIRST_PARTY if is_blocked(url, patterns)]
+    assert not wrong, wrong
+
+
+def test_custom_blocklist_replaces_analytics_domains():
+    patterns = blocked_url_patterns(['tracker.example.com'])
+    assert is_blocked('https://cdn.tracker.example.com/t.js', patterns)
+    assert not is_blocked('https://www.google-analytics.com/g/collect', patterns)
+    assert is_blocked('https://www.ifood.com.br/logo.png', patterns)  # mídia continua bloqueada
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
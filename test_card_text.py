@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Testes da normalização em lote dos textos dos cards (src/card_text.py).
+
+normalize_info/normalize_footer precisam devolver exatamente o mesmo que
+_process_info_text/_process_footer_text texto a texto. A comparação roda
+sobre os cards do corpus (fixtures/listing), sobre textos de borda e sobre
+textos aleatórios com seed fixa, e confere que os textos canônicos passam
+mesmo pelas regexes (sem cair no caminho escalar).
+
+Uso:
+    python test_card_text.py
+"""
+
+import random
+import sys
+from pathlib import Path
+
+from src.card_text import normalize_info, normalize_footer
+from src.ifood_scraper import IFoodScraper
+from tests_support import run
+
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'listing'
+
+INFO_EDGES = [
+    '', ' ', '•', '••', '• •', 'Novo • Lanches • 2,9 km', 'Novo•Lanches•2,9km', '4.6 • Lanches • 2,9 km',
+    '4.6 • Lanches • 2.9 km', '4.6\n • Lanches • 2,9 km', '4.6 • Lanches', '4.6 Lanches 2,9 km',
+    '4.6 • • 2,9 km', '4.6 • Lanches • km', '4.6 • Lanches • 2,9', '4.6 • Lanches • 2,9 km • Cupom',
+    '4.6\xa0•\xa0Lanches\xa0•\xa02,9\xa0km', '4,6 • Lanches • 2,9 km', '4..6 • Lanches • 2,9 km',
+    '٤.٦ • Lanches • ٢,٩ km', '4.6 • Doces & Bolos • 12 km', '5 • Pizza • 0,3 km', '4.6 • Lanches • 1.234,5 km',
+    'Grátis • Lanches • 2,9 km', '4.6 • Lanches • Grátis',
+]
+
+FOOTER_EDGES = [
+    '', ' ', '•', 'Grátis', 'R$ 9,99', '20-30 min', '20-30 min • Grátis', '20-30 min • grátis',
+    '20-30 min • Gratis', '20-30 min • GRÁTIS', '20-30 min•R$9,99', '20 min • R$ 9,99', '20-30 min • R$ 9.99',
+    '20 - 30 min • R$ 9,99', '20-30 min • R$ 1.234,56', '20-30 • R$ 9,99', 'min • R$ 9,99', '-30 min • R$ 9,99',
+    '20-30-40 min • R$ 9,99', '+15 min • R$ 9,99', '20-30 min • R$', '20-30 min • 9,99', '20-30 min • R$ 9,99 • Cupom',
+    '20-30\xa0min\xa0•\xa0R$\xa09,99', '20-30 min • R$\xa09,99', '٢٠-٣٠ min • R$ 9,99', '20-30 min 9,99',
+    '20-30 min • Entrega grátis', '99999999999 min • R$ 9,99',
+]
+
+
+def fixture_texts():
+    """Textos de info e footer de todos os cards das listagens do corpus."""
+    scraper = IFoodScraper()
+    infos, footers = [], []
+    for path in sorted(FIXTURES.glob('*.html')):
+        doc = scraper.html_parser.parse(path.read_text(encoding='utf-8'))
+        for container in doc.find_all('div', class_='merchant-list-v2__item-wrapper'):
+            info = container.find('div', class_='merchant-v2__info')
+            footer = container.find('div', class_='merchant-v2__footer')
+            infos.append(info.text if info else '')
+            footers.append(footer.text if footer else '')
+    return infos, footers
+
+
+# Variações de cada campo (válidas e quebradas), combinadas ao acaso
+INFO_FIELDS = [
+    ['4.6', '5', 'Novo', '', '4,6', '٤.٦', '4..6', ' 4.6\n', '!'],
+    [' • ', '•', '\xa0•\xa0', ' - ', ''],
+    ['Lanches', 'Doces & Bolos', '', ' '],
+    [' • ', '•', '\xa0•\xa0', ' - ', ''],
+    ['2,9 km', '2.9km', '12 km', 'km', '2,9', '1.234,5 km', '٢,٩ km', '2,9\xa0km'],
+    ['', ' • Cupom', ' •', '\n'],
+]
+FOOTER_FIELDS = [
+    ['20-30', '20', '20 - 30', '-30', '20-30-40', '+15', '٢٠', '', '99999999999'],
+    [' min', 'min', '\xa0min', ''],
+    [' • ', '•', '\xa0•\xa0', ' '],
+    ['R$ 9,99', 'R$9.99', 'R$\xa09,99', 'Grátis', 'grátis', 'Gratis', 'R$ 1.234,56', 'R$', '9,99', 'Entrega grátis'],
+    ['', ' • Cupom', ' •'],
+]
+
+
+def random_texts(fields, count, seed):
+    """Textos com um pedaço de cada campo, para cair ora na regex, ora no escalar."""
+    rng = random.Random(seed)
+    return [''.join(rng.choice(options) for options in fields) for _ in range(count)]
+
+
+def assert_same(batch, scalar, texts):
+    """Lote e escalar iguais, inclusive no tipo (int x float)."""
+    expected = [scalar(text) for text in texts]
+    got = batch(texts, scalar)
+    diffs = [(text, e, g) for text, e, g in zip(texts, expected, got) if repr(e) != repr(g)]
+    assert len(got) == len(texts) and not diffs, diffs[:5]
+
+
+def test_fixture_cards_match_scalar():
+    scraper = IFoodScraper()
+    infos, footers = fixture_texts()
+    assert len(infos) == 420
+    assert_same(normalize_info, scraper._process_info_text, infos)
+    assert_same(normalize_footer, scraper._process_footer_text, footers)
+
+
+def test_fixture_cards_take_the_batch_path():
+    delegated = []
+    normalize_info([t for t in fixture_texts()[0] if t], delegated.append)
+    normalize_footer([t for t in fixture_texts()[1] if t], delegated.append)
+    assert delegated == [], delegated[:5]
+
+
+def test_edge_strings_match_scalar():
+    scraper = IFoodScraper()
+    assert_same(normalize_info, scraper._process_info_text, INFO_EDGES)
+    assert_same(normalize_footer, scraper._process_footer_text, FOOTER_EDGES)
+
+
+def test_random_strings_match_scalar():
+    scraper = IFoodScraper()
+    info_texts = random_texts(INFO_FIELDS, 20000, seed=1)
+    footer_texts = random_texts(FOOTER_FIELDS, 20000, seed=2)
+    assert_same(normalize_info, scraper._process_info_text, info_texts)
+    assert_same(normalize_footer, scraper._process_footer_text, footer_texts)
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Teste de regressão do tempo de inicialização dos CLIs.
+
+`--help` e erros de argumento não podem carregar pandas, selenium, bs4 etc.
+O tempo de import dos módulos carregados pelo CLI (além dos que o próprio
+interpretador já carrega) precisa caber no orçamento.
+
+Uso:
+    python test_cli_startup.py
+    CLI_IMPORT_BUDGET_MS=50 python test_cli_startup.py
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).parent
+CLIS = ['main.py', 'main_details.py']
+
+# Orçamento (ms) para os imports feitos pelo CLI até o argparse responder
+IMPORT_BUDGET_MS = float(os.environ.get('CLI_IMPORT_BUDGET_MS', 100))
+
+# Não podem aparecer antes do argparse
+HEAVY_MODULES = ['pandas', 'numpy', 'selenium', 'bs4', 'webdriver_manager', 'requests', 'pyarrow', 'lxml', 'selectolax']
+
+
+def import_times(*args):
+    """
+    Roda o Python com -X importtime.
+
+    Returns:
+        tuple: (dict módulo -> tempo próprio em µs, código de saída)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=ROOT, capture_output=True, text=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(self_us)
+    return times, result.returncode
+
+
+def check_cli(script, *args, expected_code):
+    """Verifica módulos pesados e orçamento de import de uma chamada do CLI."""
+    baseline, _ = import_times('-c', 'pass')
+    times, code = import_times(script, *args)
+
+    assert code == expected_code, f"{script} {' '.join(args)}: saída {code}, esperado {expected_code}"
+
+    heavy = sorted({name.split('.')[0] for name in times} & set(HEAVY_MODULES))
+    assert not heavy, f"{script} {' '.join(args)} importou módulos pesados: {', '.join(heavy)}"
+
+    spent_ms = sum(us for name, us in times.items() if name not in baseline) / 1000
+    assert spent_ms <= IMPORT_BUDGET_MS, (
+        f"{script} {' '.join(args)}: imports levaram {spent_ms:.1f}ms (orçamento {IMPORT_BUDGET_MS:.0f}ms)"
+    )
+    return spent_ms
+
+
+def test_help_is_fast():
+    for script in CLIS:
+        check_cli(script, '--help', expected_code=0)
+
+
+def test_argument_error_is_fast():
+    for script in CLIS:
+        check_cli(script, '--opcao-inexistente', expected_code=2)
+
+
+def test_invalid_step_retries_is_argument_error():
+    # Etapa desconhecida: erro do argparse (código 2), não traceback depois dos imports pesados
+    check_cli('main_details.py', '--step-retries', 'checkout=1', expected_code=2)
+    check_cli('main_details.py', '--step-retries', 'page=x', expected_code=2)
+
+
+def main():
+    print(f"⏱️ Orçamento de imports: {IMPORT_BUDGET_MS:.0f}ms")
+    failures = 0
+
+    cases = [(script, args, code) for script in CLIS
+             for args, code in ((['--help'], 0), (['--opcao-inexistente'], 2))]
+    cases += [('main_details.py', ['--step-retries', step], 2) for step in ('checkout=1', 'page=x')]
+
+    for script, args, code in cases:
+        try:
+            spent_ms = check_cli(script, *args, expected_code=code)
+            print(f"✅ {script} {' '.join(args)}: {spent_ms:.1f}ms")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {e}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Testes da escrita de CSV em streaming (src/csv_sink.py).
+
+Cobre os lotes do StreamingCsvWriter e a gravação em ordem do
+OrderedCsvWriter com linhas chegando fora de ordem (inclusive de várias
+threads) e índices que nunca chegam.
+
+Uso:
+    python test_csv_sink.py
+"""
+
+import csv
+import random
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from src.csv_sink import StreamingCsvWriter, OrderedCsvWriter
+from tests_support import run
+
+
+COLUMNS = ['URL', 'Restaurante']
+
+
+def row(i):
+    return {'URL': f'https://www.ifood.com.br/delivery/x/r{i}', 'Restaurante': f'Restaurante {i}'}
+
+
+def read_names(path):
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return [r['Restaurante'] for r in csv.DictReader(f)]
+
+
+def test_streaming_writes_in_batches():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'out.csv'
+        writer = StreamingCsvWriter(path, COLUMNS, batch_size=3)
+
+        writer.write(row(0))
+        writer.write(row(1))
+        assert not path.exists() and writer.rows_written == 0  # cabeçalho só no primeiro lote
+
+        writer.write(row(2))
+        assert writer.rows_written == 3
+        assert read_names(path) == ['Restaurante 0', 'Restaurante 1', 'Restaurante 2']
+
+        writer.write(row(3))
+        writer.close()
+        assert writer.rows_written == 4
+        assert read_names(path)[-1] == 'Restaurante 3'
+
+
+def test_streaming_without_rows_creates_no_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'out.csv'
+        with StreamingCsvWriter(path, COLUMNS) as writer:
+            pass
+        assert writer.rows_written == 0 and not path.exists()
+
+
+def test_ordered_waits_for_missing_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'out.csv'
+        writer = OrderedCsvWriter(path, COLUMNS, batch_size=1)
+
+        writer.put(2, row(2))
+        writer.put(1, row(1))
+        assert writer.rows_written == 0  # índice 0 ainda não chegou
+
+        writer.put(0, row(0))
+        assert writer.rows_written == 3
+        writer.put(3, row(3))
+        writer.close()
+        assert read_names(path) == [f'Restaurante {i}' for i in range(4)]
+
+
+def test_ordered_close_appends_orphans_in_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'out.csv'
+        writer = OrderedCsvWriter(path, COLUMNS, batch_size=2)
+
+        for i in (0, 5, 3, 1):  # 2 e 4 nunca chegam
+            writer.put(i, row(i))
+        writer.close()
+        assert read_names(path) == ['Restaurante 0', 'Restaurante 1', 'Restaurante 3', 'Restaurante 5']
+
+
+def test_ordered_with_concurrent_workers():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'out.csv'
+        writer = OrderedCsvWriter(path, COLUMNS, batch_size=7)
+        indexes = list(range(500))
+        random.Random(42).shuffle(indexes)
+        chunks = [indexes[i::8] for i in range(8)]
+
+        threads = [threading.Thread(target=lambda c=chunk: [writer.put(i, row(i)) for i in c]) for chunk in chunks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.close()
+
+        assert read_names(path) == [f'Restaurante {i}' for i in range(500)]
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Testes do cache SQLite de detalhes (src/detail_cache.py).
+
+Com relógio falso: a linha vale até o fim do TTL e some depois dele, uma
+linha vencida é substituída pela nova, as vencidas são apagadas ao reabrir
+o arquivo e, acima de max_entries, saem as mais antigas. A chave é o UUID
+do restaurante, então variantes da mesma URL acham a mesma linha.
+
+Uso:
+    python test_detail_cache.py
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+from src.detail_cache import DetailCache
+from tests_support import run
+
+
+URL = 'https://www.ifood.com.br/delivery/uberlandia-mg/burger-central/0b2e7a9c-4a3f-4c8e-9a51-6f3d2b1c0e11'
+HOUR = 3600
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_750_000_000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def url(n):
+    return f'https://www.ifood.com.br/delivery/uberlandia-mg/r{n}/{n:08x}-0000-4000-8000-000000000000'
+
+
+def stored_keys(path):
+    with sqlite3.connect(str(path)) as conn:
+        return [key for (key,) in conn.execute("SELECT key FROM details ORDER BY stored_at")]
+
+
+def test_row_expires_after_ttl():
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = FakeClock()
+        cache = DetailCache(Path(tmp) / 'cache.sqlite', ttl_hours=2, clock=clock)
+        cache.put(URL, {'Endereco': 'Rua X, 1'})
+
+        clock.advance(2 * HOUR)  # ainda no limite do TTL
+        assert cache.get(URL) == {'Endereco': 'Rua X, 1'}
+
+        clock.advance(1)
+        assert cache.get(URL) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.close()
+
+
+def test_stale_row_is_replaced():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'cache.sqlite'
+        clock = FakeClock()
+        cache = DetailCache(path, ttl_hours=1, clock=clock)
+        cache.put(URL, {'Endereco': 'Rua Velha, 1'})
+
+        clock.advance(3 * HOUR)
+        assert cache.get(URL) is None
+        cache.put(URL, {'Endereco': 'Rua Nova, 2'})
+
+        assert cache.get(URL) == {'Endereco': 'Rua Nova, 2'}
+        assert len(stored_keys(path)) == 1
+
+        # A linha nova vale um TTL inteiro a partir da troca
+        clock.advance(HOUR)
+        assert cache.get(URL) == {'Endereco': 'Rua Nova, 2'}
+        cache.close()
+
+
+def test_expired_rows_are_purged_on_open():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'cache.sqlite'
+        clock = FakeClock()
+        cache = DetailCache(path, ttl_hours=1, clock=clock)
+        cache.put(url(1), {'Endereco': 'A'})
+        clock.advance(2 * HOUR)
+        cache.put(url(2), {'Endereco': 'B'})
+        cache.close()
+
+        cache = DetailCache(path, ttl_hours=1, clock=clock)
+        assert stored_keys(path) == ['00000002-0000-4000-8000-000000000000']
+        cache.close()
+
+
+def test_oldest_rows_are_evicted():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'cache.sqlite'
+        clock = FakeClock()
+        cache = DetailCache(path, ttl_hours=24, max_entries=2, clock=clock)
+        for n in (1, 2, 3):
+            cache.put(url(n), {'Endereco': str(n)})
+            clock.advance(60)
+
+        assert cache.get(url(1)) is None
+        assert cache.get(url(2)) == {'Endereco': '2'} and cache.get(url(3)) == {'Endereco': '3'}
+        cache.close()
+
+
+def test_url_variants_share_the_row():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DetailCache(Path(tmp) / 'cache.sqlite', clock=FakeClock())
+        cache.put(URL, {'Endereco': 'Rua X, 1'})
+
+        for variant in (URL + '?utm_source=app', URL + '/', URL.upper(), URL.replace('burger-central', 'burger-central-tubalina')):
+            assert cache.get(variant) == {'Endereco': 'Rua X, 1'}, variant
+        cache.close()
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
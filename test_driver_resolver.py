@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Testes da resolução do ChromeDriver (src/driver_resolver.py), sem Chrome e sem rede.
+
+Um HOME temporário recebe drivers falsos (executáveis vazios) nos caches do
+webdriver-manager; webdriver.Chrome e o ChromeDriverManager são trocados por
+falsos. Cobre o caminho em cache que ficou incompatível após uma atualização
+do Chrome: o cache é descartado e o driver é resolvido de novo uma vez.
+
+Uso:
+    python test_driver_resolver.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import types
+from contextlib import contextmanager
+from pathlib import Path
+
+from selenium.common.exceptions import SessionNotCreatedException
+
+import src.driver_resolver as resolver
+from tests_support import run
+
+
+MISMATCH = ("session not created: This version of ChromeDriver only supports Chrome version 114\n"
+            "Current browser version is 126.0.6478.126")
+
+
+def fake_driver(directory, version):
+    path = directory / '.wdm' / 'drivers' / 'chromedriver' / 'linux64' / version / 'chromedriver'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('#!/bin/sh\n')
+    path.chmod(0o755)
+    return str(path)
+
+
+class FakeWebdriver:
+    """webdriver.Chrome que recusa os drivers da lista `incompatible`."""
+
+    def __init__(self, incompatible=()):
+        self.incompatible = set(incompatible)
+        self.launched = []
+
+    def Chrome(self, service, options):
+        self.launched.append(service.path)
+        if service.path in self.incompatible:
+            raise SessionNotCreatedException(MISMATCH)
+        return types.SimpleNamespace(driver_path=service.path)
+
+
+@contextmanager
+def sandbox(downloaded=None, incompatible=()):
+    """HOME/PATH temporários, cache isolado e estado do módulo zerado."""
+    saved_env = {key: os.environ.get(key) for key in ('HOME', 'PATH', resolver.DRIVER_ENV_VAR)}
+    saved = (resolver.DRIVER_CACHE_FILE, resolver.webdriver, sys.modules.get('webdriver_manager.chrome'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp)
+        os.environ['HOME'] = tmp
+        os.environ['PATH'] = str(home / 'bin')
+        os.environ.pop(resolver.DRIVER_ENV_VAR, None)
+        resolver.DRIVER_CACHE_FILE = home / '.cache' / 'desafio-ifood' / 'chromedriver.json'
+        resolver.webdriver = FakeWebdriver(incompatible)
+        resolver._resolved.clear()
+        resolver._sources.clear()
+        resolver._rejected.clear()
+
+        downloads = []
+        manager = types.ModuleType('webdriver_manager.chrome')
+        manager.ChromeDriverManager = lambda: types.SimpleNamespace(
+            install=lambda: downloads.append(downloaded) or downloaded)
+        sys.modules['webdriver_manager.chrome'] = manager
+        try:
+            yield home, downloads
+        finally:
+            resolver.DRIVER_CACHE_FILE, resolver.webdriver, module = saved
+            if module is None:
+                sys.modules.pop('webdriver_manager.chrome', None)
+            else:
+                sys.modules['webdriver_manager.chrome'] = module
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            resolver._resolved.clear()
+            resolver._sources.clear()
+            resolver._rejected.clear()
+
+
+def write_cache(path):
+    resolver.DRIVER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    resolver.DRIVER_CACHE_FILE.write_text(json.dumps({'path': path}))
+
+
+def test_cached_path_wins_and_is_memoized():
+    with sandbox() as (home, _):
+        stale = fake_driver(home, '114.0.5735.90')
+        write_cache(stale)
+        assert resolver.resolve_driver_path() == stale
+        assert resolver.resolve_driver_path() == stale
+
+
+def test_mismatch_online_drops_cache_and_downloads():
+    with sandbox() as (home, downloads):
+        stale = fake_driver(home, '114.0.5735.90')
+        fresh = str(home / 'downloaded' / 'chromedriver')
+        Path(fresh).parent.mkdir()
+        Path(fresh).write_text('')
+        write_cache(stale)
+        resolver.webdriver.incompatible.add(stale)
+        sys.modules['webdriver_manager.chrome'].ChromeDriverManager = lambda: types.SimpleNamespace(
+            install=lambda: downloads.append(fresh) or fresh)
+
+        browser = resolver.launch_chrome(options=None)
+        assert browser.driver_path == fresh
+        assert resolver.webdriver.launched == [stale, fresh]
+        assert downloads == [fresh]
+        assert json.loads(resolver.DRIVER_CACHE_FILE.read_text())['path'] == fresh
+
+        # Próximos navegadores usam o driver novo direto
+        assert resolver.launch_chrome(options=None).driver_path == fresh
+
+
+def test_mismatch_offline_uses_other_local_driver():
+    with sandbox() as (home, downloads):
+        fresh = fake_driver(home, '126.0.6478.126')
+        stale = fake_driver(home, '114.0.5735.90')
+        write_cache(stale)
+        resolver.webdriver.incompatible.add(stale)
+
+        browser = resolver.launch_chrome(options=None, offline=True)
+        assert browser.driver_path == fresh
+        assert downloads == []
+
+
+def test_mismatch_is_retried_only_once():
+    with sandbox() as (home, _):
+        stale = fake_driver(home, '114.0.5735.90')
+        write_cache(stale)
+        resolver.webdriver.incompatible.add(stale)
+
+        try:
+            resolver.launch_chrome(options=None, offline=True)  # nenhum outro driver local
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError("esperava FileNotFoundError sem driver compatível")
+        assert resolver.webdriver.launched == [stale]
+        assert not resolver.DRIVER_CACHE_FILE.exists()
+
+
+def test_explicit_driver_path_is_never_replaced():
+    with sandbox() as (home, downloads):
+        pinned = fake_driver(home, '114.0.5735.90')
+        resolver.webdriver.incompatible.add(pinned)
+
+        try:
+            resolver.launch_chrome(options=None, driver_path=pinned)
+        except SessionNotCreatedException:
+            pass
+        else:
+            raise AssertionError("esperava SessionNotCreatedException com --driver-path")
+        assert resolver.webdriver.launched == [pinned] and downloads == []
+
+
+def test_offline_does_not_touch_selenium_manager_env():
+    with sandbox() as (home, _):
+        write_cache(fake_driver(home, '126.0.6478.126'))
+        os.environ.pop('SE_OFFLINE', None)
+        resolver.resolve_driver_path(offline=True)
+        assert 'SE_OFFLINE' not in os.environ
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Teste de uma execução de detalhes sem nada a raspar.
+
+Um shard cujo seen set já tem todos os restaurantes da listagem termina sem
+erro: sem arquivo de saída, sem JSON de tempos e com código de saída 0 no
+main_details.py. Nenhum navegador é aberto.
+
+Uso:
+    python test_empty_run.py
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from src.merchant_ids import SeenSet, merchant_id
+from src.restaurant_details_scraper import RestaurantDetailsScraper
+from tests_support import run
+
+
+ROOT = Path(__file__).parent
+URLS = [
+    'https://www.ifood.com.br/delivery/uberlandia-mg/lanchonete-a/0b2e7a9c-4a3f-4c8e-9a51-6f3d2b1c0e11',
+    'https://www.ifood.com.br/delivery/uberlandia-mg/pizzaria-b/5d8f1e2a-7b6c-4d3e-8f9a-0b1c2d3e4f50',
+    'https://www.ifood.com.br/delivery/uberlandia-mg/acai-c/9a7b6c5d-4e3f-4a1b-8c2d-3e4f5a6b7c8d',
+]
+
+
+def prepare(directory):
+    """Listagem com 3 restaurantes e um seen set que já contém todos eles."""
+    pd.DataFrame({'URL': URLS, 'Restaurante': ['A', 'B', 'C']}).to_csv(
+        directory / 'bd_scrap_ifood_10_20250615_120000.csv', index=False)
+
+    seen_path = directory / 'seen.bin'
+    seen = SeenSet(seen_path)
+    for url in URLS:
+        seen.add(merchant_id(url))
+    seen.close()
+    return seen_path
+
+
+def outputs(directory):
+    return sorted(path.name for path in directory.iterdir() if path.name.startswith('details_'))
+
+
+def test_scraper_returns_none_without_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        seen_path = prepare(tmp)
+
+        scraper = RestaurantDetailsScraper(csv_directory=tmp, seen_set_path=seen_path)
+        assert scraper.scrape_details() is None
+        assert scraper.browser is None
+        assert outputs(tmp) == [], outputs(tmp)
+
+
+def test_cli_exits_cleanly():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        seen_path = prepare(tmp)
+
+        result = subprocess.run(
+            [sys.executable, 'main_details.py', '--directory', str(tmp), '--seen-set', str(seen_path)],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert 'Nada a raspar' in result.stdout
+        assert outputs(tmp) == [], outputs(tmp)
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
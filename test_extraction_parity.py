@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Paridade entre as extrações soup e js dos detalhes (--extraction).
+
+As páginas de fixtures/merchant passam pelos extratores Python
+(_extract_minimum_order, _get_address_info, _extract_payment_methods) e pelo
+DETAILS_EXTRACTION_JS num Chrome headless; os dicionários precisam ser
+iguais, inclusive no tipo (Pedido_Minimo sempre float). Sem Chrome/ChromeDriver
+o teste no navegador é pulado; a conversão do número do JS roda sempre.
+
+Uso:
+    python test_extraction_parity.py
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+from src.restaurant_details_scraper import RestaurantDetailsScraper
+from tests_support import run, Skip
+
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'merchant'
+SECTIONS = ['minimum_order', 'address', 'payment']
+
+
+class FakeBrowser:
+    """Devolve o que o Selenium devolveria para um script (número JS inteiro vira int)."""
+
+    def __init__(self, result):
+        self.result = result
+
+    def execute_script(self, script, *args):
+        return dict(self.result)
+
+
+def soup_details(scraper, html):
+    soup = scraper.html_parser.parse(html)
+    return {'pedido_minimo': scraper._extract_minimum_order(soup),
+            **scraper._get_address_info(soup), **scraper._extract_payment_methods(soup)}
+
+
+def test_js_minimum_order_is_float():
+    scraper = RestaurantDetailsScraper()
+    for value in (0, 15, 45.5):
+        scraper.browser = FakeBrowser({'pedido_minimo': value, 'endereco': 'Rua X, 1'})
+        result = scraper._extract_in_browser(['minimum_order', 'address'])
+        assert repr(result['pedido_minimo']) == repr(float(value)), result
+
+    scraper.browser = FakeBrowser({'pag_site_pix': True})
+    assert scraper._extract_in_browser(['payment']) == {'pag_site_pix': True}
+
+
+def test_soup_and_js_match_on_fixtures():
+    pages = sorted(FIXTURES.glob('*.html'))
+    assert pages, "fixtures/merchant vazio"
+
+    scraper = RestaurantDetailsScraper(browser_profile='lean', offline=True)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            scraper._setup_browser()
+    except Exception as e:
+        raise Skip(f"Chrome indisponível ({type(e).__name__})")
+
+    try:
+        diffs = {}
+        for page in pages:
+            expected = soup_details(scraper, page.read_text(encoding='utf-8'))
+            scraper.browser.get(page.resolve().as_uri())
+            got = scraper._extract_in_browser(SECTIONS)
+            wrong = {key: (expected[key], got.get(key)) for key in expected if repr(expected[key]) != repr(got.get(key))}
+            if wrong or set(got) != set(expected):
+                diffs[page.name] = wrong or sorted(set(got) ^ set(expected))
+        assert not diffs, diffs
+    finally:
+        scraper.browser.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Testes do modo --fetch http (src/http_fetcher.py), sem rede.
+
+A sessão HTTP é trocada por uma falsa que serve as páginas de fixtures/merchant/
+ou HTML com estado embutido (__NEXT_DATA__) em formato inesperado: um
+restaurante ruim vai para o fallback com Selenium sem derrubar os demais.
+
+Uso:
+    python test_http_fetcher.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from src.restaurant_details_scraper import RestaurantDetailsScraper
+from src.http_fetcher import HttpDetailFetcher
+from tests_support import run
+
+
+ROOT = Path(__file__).parent
+FULL_PAGE = (ROOT / 'fixtures' / 'merchant' / 'merchant_full.html').read_text(encoding='utf-8')
+
+
+def next_data_page(state):
+    """Página sem endereço renderizado, só com o estado embutido."""
+    return (f'<html><body><script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>'
+            '</body></html>')
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+        self.headers = {'Content-Type': 'text/html; charset=utf-8'}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Responde pelo final da URL; uma exceção como resposta é levantada no get."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, timeout=None):
+        page = self.pages[url.rsplit('/', 1)[-1]]
+        if isinstance(page, Exception):
+            raise page
+        return FakeResponse(page)
+
+    def close(self):
+        pass
+
+
+def make_fetcher(pages):
+    fetcher = HttpDetailFetcher(RestaurantDetailsScraper(), concurrency=2)
+    fetcher.session = FakeSession(pages)
+    return fetcher
+
+
+def test_full_page_is_resolved():
+    details = make_fetcher({'ok': FULL_PAGE}).fetch('https://www.ifood.com.br/delivery/x/ok')
+    assert details is not None and details['endereco'] != 'Não encontrado'
+
+
+def test_malformed_state_falls_back():
+    bad_street = next_data_page({'props': {'address': {'streetName': 123, 'city': 'Uberlândia'}}})
+    bad_payment = next_data_page({'props': {'paymentMethods': ['PIX', None]}})
+    fetcher = make_fetcher({'street': bad_street, 'payment': bad_payment})
+
+    assert fetcher.fetch('https://www.ifood.com.br/delivery/x/street') is None
+    assert fetcher.fetch('https://www.ifood.com.br/delivery/x/payment') is None
+
+
+def test_unexpected_request_error_falls_back():
+    fetcher = make_fetcher({'boom': UnicodeError('bad url')})
+    assert fetcher.fetch('https://www.ifood.com.br/delivery/x/boom') is None
+
+
+def test_one_bad_merchant_does_not_abort_the_batch():
+    bad = next_data_page({'props': {'address': {'streetName': ['Rua'], 'city': 'Uberlândia'}}})
+    fetcher = make_fetcher({'ok1': FULL_PAGE, 'bad': bad, 'ok2': FULL_PAGE})
+    tasks = [(0, 'https://www.ifood.com.br/delivery/x/ok1', 'A'),
+             (1, 'https://www.ifood.com.br/delivery/x/bad', 'B'),
+             (2, 'https://www.ifood.com.br/delivery/x/ok2', 'C')]
+
+    results = dict(fetcher.fetch_many(tasks))
+    assert sorted(results) == [0, 1, 2]
+    assert results[1] is None
+    assert results[0] is not None and results[2] is not None
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Testes do journal de detalhes (src/journal.py) e da retomada com --resume.
+
+Cobre a leitura com linha final truncada, o isolamento dessa linha ao
+reabrir e a reconstrução da saída na ordem do CSV de entrada quando parte
+das linhas vem do journal e parte é raspada de novo (fora de ordem).
+
+Uso:
+    python test_journal.py
+"""
+
+import csv
+import sys
+import tempfile
+from pathlib import Path
+
+from src.journal import DetailJournal
+from src.csv_sink import OrderedCsvWriter
+from src.restaurant_details_scraper import RestaurantDetailsScraper, DETAIL_COLUMNS
+from tests_support import run
+
+
+def detail_row(i, endereco=None):
+    row = {column: '' for column in DETAIL_COLUMNS}
+    row.update({'URL': f'https://www.ifood.com.br/delivery/x/r{i}/{i:08d}', 'Restaurante': f'R{i}',
+                'Endereco': endereco or f'Rua {i}, {i}'})
+    return row
+
+
+def test_load_skips_truncated_line_and_last_write_wins():
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = DetailJournal(Path(tmp) / 'journal.jsonl')
+        journal.open()
+        journal.append(detail_row(0, 'Não encontrado'))
+        journal.append(detail_row(1))
+        journal.append(detail_row(0))
+        journal.close()
+        with open(journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"URL": "https://www.ifood.com.br/delivery/x/r2/000')  # queda no meio da escrita
+
+        rows = journal.load()
+        assert sorted(rows) == [detail_row(0)['URL'], detail_row(1)['URL']]
+        assert rows[detail_row(0)['URL']]['Endereco'] == 'Rua 0, 0'
+
+
+def test_resume_isolates_truncated_line():
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = DetailJournal(Path(tmp) / 'journal.jsonl')
+        journal.open()
+        journal.append(detail_row(0))
+        journal.close()
+        with open(journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"URL": "trunc')
+
+        journal.open(resume=True)
+        journal.append(detail_row(1))
+        journal.close()
+
+        assert sorted(journal.load()) == [detail_row(0)['URL'], detail_row(1)['URL']]
+
+
+def test_open_without_resume_starts_over():
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = DetailJournal(Path(tmp) / 'journal.jsonl')
+        journal.open()
+        journal.append(detail_row(0))
+        journal.close()
+
+        journal.open(resume=False)
+        journal.close()
+        assert journal.load() == {}
+
+
+def test_resume_rebuilds_output_in_input_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        rows = [detail_row(i) for i in range(6)]
+        tasks = [(i, row['URL'], row['Restaurante']) for i, row in enumerate(rows)]
+
+        # Execução anterior concluiu 1, 4 e 2 (nessa ordem) antes de cair
+        previous = DetailJournal(tmp / 'journal.jsonl')
+        previous.open()
+        for i in (1, 4, 2):
+            previous.append(rows[i])
+        previous.close()
+
+        scraper = RestaurantDetailsScraper(csv_directory=tmp, resume=True)
+        scraper.journal = DetailJournal(tmp / 'journal.jsonl')
+        scraper._sink = OrderedCsvWriter(tmp / 'out.csv', DETAIL_COLUMNS, batch_size=1)
+
+        pending = scraper._restore_from_journal(tasks)
+        assert [task[0] for task in pending] == [0, 3, 5]
+        assert scraper.processed == 3 and scraper.success == 3
+
+        # Workers terminam fora de ordem
+        scraper.journal.open(resume=True)
+        for index in (5, 3, 0):
+            scraper._record(index, rows[index])
+        scraper._sink.close()
+        scraper.journal.close()
+
+        with open(tmp / 'out.csv', encoding='utf-8-sig', newline='') as f:
+            written = [row['Restaurante'] for row in csv.DictReader(f)]
+        assert written == [f'R{i}' for i in range(6)], written
+        assert len(scraper.journal.load()) == 6
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Testes do modo network da listagem (src/merchant_feed.py), sem navegador.
+
+As linhas saem da resposta de fixtures/feed/ (escrita à mão no formato do
+feed) e a leitura dos logs de rede usa um navegador falso: o corpo de uma
+resposta só pode ser lido depois do Network.loadingFinished. A mesma resposta
+também passa pelo mock_ifood_server.py --feed-dir: lida por HTTP e, com
+Chrome/ChromeDriver disponíveis, pelo modo --source network de ponta a ponta
+(sem Chrome esse teste é pulado).
+
+Uso:
+    python test_merchant_feed.py
+"""
+
+import contextlib
+import io
+import json
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from mock_ifood_server import MockIFood
+from src.merchant_feed import read_performance_log, rows_from_payloads
+from tests_support import run, Skip
+
+
+ROOT = Path(__file__).parent
+FEED_FIXTURE = ROOT / 'fixtures' / 'feed' / 'cardstack_home_page_1.json'
+FEED_URL = 'https://marketplace.ifood.com.br/v2/cardstack/home?page=1'
+USER_LOCATION = {'delivery_lat': -18.9187, 'delivery_lng': -48.2772, 'geohash': '6uyr'}
+
+
+class FakeBrowser:
+    """Logs 'performance' em lotes; getResponseBody falha enquanto a resposta não terminou."""
+
+    def __init__(self, batches, body):
+        self.batches = list(batches)
+        self.body = body
+        self.finished = set()
+        self.body_requests = []
+
+    def get_log(self, kind):
+        events = self.batches.pop(0) if self.batches else []
+        for event in events:
+            if event['method'] == 'Network.loadingFinished':
+                self.finished.add(event['params']['requestId'])
+        return [{'message': json.dumps({'message': event})} for event in events]
+
+    def execute_cdp_cmd(self, command, params):
+        self.body_requests.append(params['requestId'])
+        if params['requestId'] not in self.finished:
+            raise RuntimeError('No resource with given identifier found')
+        body = self.body if isinstance(self.body, str) else json.dumps(self.body)
+        return {'body': body, 'base64Encoded': False}
+
+
+def response_received(request_id, url=FEED_URL, mime='application/json'):
+    return {'method': 'Network.responseReceived',
+            'params': {'requestId': request_id, 'response': {'url': url, 'mimeType': mime}}}
+
+
+def loading_finished(request_id):
+    return {'method': 'Network.loadingFinished', 'params': {'requestId': request_id}}
+
+
+def load_fixture():
+    return json.loads(FEED_FIXTURE.read_text(encoding='utf-8'))
+
+
+def test_rows_from_recorded_feed():
+    rows = rows_from_payloads([load_fixture()], '2025-06-15 12:00:00', USER_LOCATION)
+
+    assert [row['Restaurante'] for row in rows] == ["McDonald's - Tabajaras", 'Pizzaria Bella Napoli', 'Açaí da Praça']
+
+    mcdonalds, pizzaria, acai = rows
+    assert mcdonalds['URL'] == ('https://www.ifood.com.br/delivery/uberlandia-mg/mcdonalds-tabajaras/'
+                                '0b2e7a9c-4a3f-4c8e-9a51-6f3d2b1c0e11')
+    assert (mcdonalds['Nota'], mcdonalds['Tipo de comida'], mcdonalds['Distancia']) == (4.6, 'Lanches', 2.9)
+    assert (mcdonalds['Tempo Min'], mcdonalds['Tempo Max']) == (20, 30)
+    assert mcdonalds['User_Latitude'] == -18.9187 and mcdonalds['Geohash'] == '6uyr'
+
+    # Slug lido do campo action, categoria como objeto, tempo único, frete grátis
+    assert pizzaria['URL'].endswith('/delivery/uberlandia-mg/pizzaria-bella-napoli-centro/'
+                                    '5d8f1e2a-7b6c-4d3e-8f9a-0b1c2d3e4f50')
+    assert pizzaria['Tipo de comida'] == 'Pizza'
+    assert (pizzaria['Tempo Min'], pizzaria['Tempo Max']) == (45, 45)
+    assert pizzaria['Preco do Frete'] == 0.0
+
+    # Sem nota: 0.0, como o caminho do DOM
+    assert acai['Nota'] == 0.0
+
+
+def test_fees_are_converted_from_cents():
+    rows = rows_from_payloads([load_fixture()], '2025-06-15 12:00:00', USER_LOCATION)
+    fees = {row['Restaurante']: row['Preco do Frete'] for row in rows}
+
+    assert fees["McDonald's - Tabajaras"] == 9.99   # deliveryFee.value = 999
+    assert fees['Açaí da Praça'] == 6.49             # deliveryInfo.fee = 649
+
+
+def test_repeated_payloads_do_not_duplicate_merchants():
+    payload = load_fixture()
+    rows = rows_from_payloads([payload, payload], '2025-06-15 12:00:00', USER_LOCATION)
+    assert len(rows) == 3
+
+
+def test_body_is_read_only_after_loading_finished():
+    browser = FakeBrowser([[response_received('1')], [loading_finished('1')]], load_fixture())
+    pending = {}
+
+    assert read_performance_log(browser, pending=pending) == []
+    assert browser.body_requests == [] and pending == {'1': FEED_URL}
+
+    payloads = read_performance_log(browser, pending=pending)
+    assert len(payloads) == 1 and pending == {}
+    assert len(rows_from_payloads(payloads, '2025-06-15 12:00:00', USER_LOCATION)) == 3
+
+
+def test_unrelated_responses_are_ignored():
+    browser = FakeBrowser([[
+        response_received('1', url='https://www.ifood.com.br/static/app.js', mime='application/javascript'),
+        response_received('2', mime='text/html'),
+        loading_finished('1'), loading_finished('2'),
+    ]], load_fixture())
+
+    assert read_performance_log(browser, pending={}) == []
+    assert browser.body_requests == []
+
+
+def test_failed_responses_are_dropped():
+    browser = FakeBrowser([[
+        response_received('1'),
+        {'method': 'Network.loadingFailed', 'params': {'requestId': '1', 'errorText': 'net::ERR_FAILED'}},
+    ]], load_fixture())
+    pending = {}
+
+    assert read_performance_log(browser, pending=pending) == []
+    assert pending == {} and browser.body_requests == []
+
+
+@contextlib.contextmanager
+def feed_server():
+    """Mock servindo fixtures/feed/ como feed da listagem, numa porta livre."""
+    mock = MockIFood(merchants=0, feed_dir=FEED_FIXTURE.parent, port=0)
+    mock.start()
+    try:
+        yield mock
+    finally:
+        mock.stop()
+
+
+def test_mock_serves_feed_fixture():
+    with feed_server() as mock:
+        url = f'{mock.base_url}/v1/merchants?page=0'
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode('utf-8')
+        assert body == FEED_FIXTURE.read_text(encoding='utf-8')
+
+        try:
+            urllib.request.urlopen(f'{mock.base_url}/v1/merchants?page=1', timeout=5)
+            raise AssertionError("esperava 404 depois do último arquivo")
+        except urllib.error.HTTPError as e:
+            assert e.code == 404
+
+        # Resposta do mock pelo mesmo caminho do modo network (padrão de URL padrão + logs de rede)
+        browser = FakeBrowser([[response_received('1', url=url), loading_finished('1')]], body)
+        payloads = read_performance_log(browser, pending={})
+        rows = rows_from_payloads(payloads, '2025-06-15 12:00:00', USER_LOCATION, mock.base_url)
+
+    expected = rows_from_payloads([load_fixture()], '2025-06-15 12:00:00', USER_LOCATION)
+    assert [row['URL'] for row in rows] == [row['URL'].replace('https://www.ifood.com.br', mock.base_url)
+                                            for row in expected]
+    assert [{**row, 'URL': None} for row in rows] == [{**row, 'URL': None} for row in expected]
+
+
+def test_network_source_against_mock():
+    from src.ifood_scraper import IFoodScraper
+
+    with feed_server() as mock:
+        scraper = IFoodScraper(n_scrolls=0, listing_source='network', browser_profile='lean',
+                               offline=True, base_url=mock.base_url)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scraper._setup_browser()
+        except Exception as e:
+            raise Skip(f"Chrome indisponível ({type(e).__name__})")
+
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scraper._load_restaurants()
+                rows = scraper._extract_feed_data()
+        finally:
+            scraper.browser.quit()
+
+    names = [row['Restaurante'] for row in rows]
+    assert names == ["McDonald's - Tabajaras", 'Pizzaria Bella Napoli', 'Açaí da Praça'], names
+    assert all(row['URL'].startswith(f'{mock.base_url}/delivery/') for row in rows)
+
+
+def test_flush_tries_pending_bodies():
+    browser = FakeBrowser([[response_received('1')]], load_fixture())
+    browser.finished.add('1')  # terminou, mas o evento ainda não chegou ao log
+
+    payloads = read_performance_log(browser, pending={}, flush=True)
+    assert len(payloads) == 1
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Testes da identificação de restaurantes (src/merchant_ids.py).
+
+O UUID do restaurante precisa sair igual de todas as variantes da URL
+(query string, barra final, maiúsculas, slug trocado, http), a URL canônica
+e a troca de host (--base-url) não podem perder o caminho, e o seen set
+(--seen-set) precisa ser lido por outro shard: ids de um processo aparecem
+no seguinte, sem repetir registros e ignorando um registro truncado.
+
+Uso:
+    python test_merchant_ids.py
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from src.merchant_ids import SeenSet, canonical_url, merchant_id, rebase_url
+from src.restaurant_details_scraper import RestaurantDetailsScraper
+from tests_support import run
+
+
+MID = '0b2e7a9c-4a3f-4c8e-9a51-6f3d2b1c0e11'
+URL = f'https://www.ifood.com.br/delivery/uberlandia-mg/burger-central/{MID}'
+
+
+def test_merchant_id_from_url_variants():
+    variants = [
+        URL,
+        URL + '?utm_source=app&prato=123',
+        URL + '/',
+        URL + '/#cardapio',
+        URL.upper(),
+        URL.replace('https://', 'http://'),
+        URL.replace('burger-central', 'burger-central-tubalina'),
+        f'  {URL}  ',
+    ]
+    wrong = {variant: merchant_id(variant) for variant in variants if merchant_id(variant) != MID}
+    assert not wrong, wrong
+
+
+def test_merchant_id_uses_last_uuid_of_the_path():
+    other = '5d8f1e2a-7b6c-4d3e-8f9a-0b1c2d3e4f50'
+    assert merchant_id(f'https://www.ifood.com.br/delivery/{other}/burger/{MID}') == MID
+    assert merchant_id(f'{URL}?merchant={other}') == MID  # UUID da query string não conta
+
+
+def test_merchant_id_without_uuid_is_canonical_url():
+    url = 'HTTPS://WWW.iFood.com.br/delivery/uberlandia-mg/sem-id/?utm_source=app#topo'
+    assert merchant_id(url) == 'https://www.ifood.com.br/delivery/uberlandia-mg/sem-id'
+    assert merchant_id(url) == merchant_id('https://www.ifood.com.br/delivery/uberlandia-mg/sem-id')
+
+
+def test_canonical_url():
+    assert canonical_url(URL + '/?utm_source=app#topo') == URL
+    assert canonical_url(URL.replace('www.ifood.com.br', 'WWW.IFOOD.COM.BR')) == URL
+    assert canonical_url('https://www.ifood.com.br/Delivery/X') == 'https://www.ifood.com.br/Delivery/X'  # caminho intacto
+
+
+def test_rebase_url_keeps_path_and_query():
+    assert rebase_url(URL + '?x=1', 'http://127.0.0.1:8765/') == f'http://127.0.0.1:8765/delivery/uberlandia-mg/burger-central/{MID}?x=1'
+    assert rebase_url(URL, 'http://localhost:9000/mock') == f'http://localhost:9000/mock/delivery/uberlandia-mg/burger-central/{MID}'
+    assert merchant_id(rebase_url(URL, 'http://127.0.0.1:8765')) == MID
+
+
+def test_seen_set_round_trip_across_shards():
+    no_uuid = merchant_id('https://www.ifood.com.br/delivery/uberlandia-mg/sem-id')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'shared' / 'seen.bin'
+
+        shard_a = SeenSet(path)
+        shard_a.add(MID)
+        shard_a.add(no_uuid)
+        shard_a.add(MID)  # repetido: não grava de novo
+        shard_a.close()
+        assert path.stat().st_size == 2 * SeenSet.RECORD_SIZE
+
+        shard_b = SeenSet(path)
+        assert MID in shard_b and no_uuid in shard_b and len(shard_b) == 2
+        assert merchant_id(URL.upper() + '?x=1') in shard_b
+        shard_b.add('5d8f1e2a-7b6c-4d3e-8f9a-0b1c2d3e4f50')
+        shard_b.close()
+
+        shard_c = SeenSet(path)
+        assert len(shard_c) == 3 and '5d8f1e2a-7b6c-4d3e-8f9a-0b1c2d3e4f50' in shard_c
+        assert '9a7b6c5d-4e3f-4a1b-8c2d-3e4f5a6b7c8d' not in shard_c
+        shard_c.close()
+
+
+def test_seen_set_ignores_truncated_record():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'seen.bin'
+        seen = SeenSet(path)
+        seen.add(MID)
+        seen.close()
+        with open(path, 'ab') as f:
+            f.write(b'\x01\x02\x03')  # processo morto no meio de uma gravação
+
+        seen = SeenSet(path)
+        assert len(seen) == 1 and MID in seen
+        seen.add('5d8f1e2a-7b6c-4d3e-8f9a-0b1c2d3e4f50')
+        seen.close()
+        assert path.stat().st_size == 2 * SeenSet.RECORD_SIZE
+
+        seen = SeenSet(path)
+        assert len(seen) == 2
+        seen.close()
+
+
+def test_load_tasks_dedups_and_skips_other_shards():
+    other = '5d8f1e2a-7b6c-4d3e-8f9a-0b1c2d3e4f50'
+    done = '9a7b6c5d-4e3f-4a1b-8c2d-3e4f5a6b7c8d'
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'seen.bin'
+        seen = SeenSet(path)
+        seen.add(done)  # já raspado por outro shard
+        seen.close()
+
+        scraper = RestaurantDetailsScraper(csv_directory=tmp, seen_set_path=path)
+        scraper.df_original = pd.DataFrame({
+            'URL': [URL, URL + '?utm_source=app', f'https://www.ifood.com.br/delivery/x/outro/{other}',
+                    f'https://www.ifood.com.br/delivery/x/feito/{done.upper()}', URL.replace('burger-central', 'b')],
+            'Restaurante': ['A', 'A (repetido)', 'B', 'C', 'A (slug novo)'],
+        })
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            tasks = scraper._load_tasks()
+        scraper.seen.close()
+
+    assert [(index, nome) for index, _, nome in tasks] == [(0, 'A'), (1, 'B')]
+    assert 'Duplicados removidos: 2' in out.getvalue()
+    assert 'Já raspados por outro shard: 1' in out.getvalue()
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
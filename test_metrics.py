@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Testes das métricas Prometheus dos detalhes (src/metrics.py).
+
+Com relógio falso: o texto do .prom (HELP/TYPE de cada métrica, buckets
+cumulativos do histograma, +Inf igual ao _count), a vazão que só aparece com
+a janela cheia ou amostras suficientes, e as linhas vindas do journal/cache
+que não contam como restaurantes buscados.
+
+Uso:
+    python test_metrics.py
+"""
+
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+from src.metrics import DetailMetrics, PREFIX
+from src.journal import DetailJournal
+from src.csv_sink import OrderedCsvWriter
+from src.restaurant_details_scraper import RestaurantDetailsScraper, DETAIL_COLUMNS
+from tests_support import run
+
+
+SAMPLE_LINE = re.compile(r'^(?P<name>[a-z_]+)(?P<labels>\{[^}]*\})? (?P<value>\S+)$')
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeCache:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get(self, url):
+        return self.rows.get(url)
+
+
+def metrics(counters=None, **kwargs):
+    clock = FakeClock()
+    values = counters or {'processed': 0, 'success': 0, 'errors': 0}
+    return DetailMetrics(lambda: values, clock=clock, **kwargs), clock
+
+
+def parse(text):
+    """{nome{labels}: valor} e {nome: tipo} do texto de exposição."""
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith('# TYPE '):
+            _, _, name, kind = line.split(' ')
+            types[name] = kind
+        elif line and not line.startswith('#'):
+            m = SAMPLE_LINE.match(line)
+            assert m, f"linha inválida: {line!r}"
+            samples[m['name'] + (m['labels'] or '')] = float(m['value'])
+    return samples, types
+
+
+def test_render_has_help_type_and_values():
+    m, _ = metrics({'processed': 7, 'success': 5, 'errors': 2})
+    m.start_run(10)
+    m.inc('retries', 3)
+    m.set_gauge('rate_limit', 1.5, 'Páginas por segundo liberadas.')
+    text = m.render()
+    samples, types = parse(text)
+
+    assert text.endswith('\n')
+    for name, kind in (('processed_total', 'counter'), ('retries_total', 'counter'), ('page_seconds', 'histogram'),
+                       ('tasks', 'gauge'), ('restaurants_per_minute', 'gauge'), ('rate_limit', 'gauge')):
+        assert types.get(f'{PREFIX}_{name}') == kind, name
+        assert f'# HELP {PREFIX}_{name} ' in text, name
+    assert samples[f'{PREFIX}_processed_total'] == 7 and samples[f'{PREFIX}_errors_total'] == 2
+    assert samples[f'{PREFIX}_retries_total'] == 3 and samples[f'{PREFIX}_tasks'] == 10
+    assert samples[f'{PREFIX}_rate_limit'] == 1.5
+
+
+def test_histogram_buckets_are_cumulative():
+    m, _ = metrics(buckets=(1, 5))
+    for seconds in (0.5, 3, 3, 40):
+        m.observe_page(seconds, 'browser')
+    m.observe_page(0.2, 'http')
+    samples, _ = parse(m.render())
+
+    name = f'{PREFIX}_page_seconds'
+    assert samples[f'{name}_bucket{{source="browser",le="1.0"}}'] == 1
+    assert samples[f'{name}_bucket{{source="browser",le="5.0"}}'] == 3
+    assert samples[f'{name}_bucket{{source="browser",le="+Inf"}}'] == 4 == samples[f'{name}_count{{source="browser"}}']
+    assert samples[f'{name}_sum{{source="browser"}}'] == 46.5
+    assert samples[f'{name}_count{{source="http"}}'] == 1
+
+
+def test_rate_absent_until_enough_samples():
+    m, clock = metrics(rate_window=60, rate_min_samples=10)
+    m.start_run(100)
+    for _ in range(5):
+        clock.advance(0.01)
+        m.mark_processed()
+
+    assert m.per_minute() is None
+    samples, types = parse(m.render())
+    assert f'{PREFIX}_restaurants_per_minute' not in samples
+    assert types[f'{PREFIX}_restaurants_per_minute'] == 'gauge'
+
+    for _ in range(5):
+        clock.advance(1.0)
+        m.mark_processed()
+    assert round(m.per_minute(), 6) == round(10 * 60 / 5.05, 6)  # 10 páginas em 5,05 s (janela ainda incompleta)
+
+
+def test_rate_uses_full_window_once_filled():
+    m, clock = metrics(rate_window=60, rate_min_samples=10)
+    m.start_run(100)
+    for _ in range(3):
+        clock.advance(40)
+        m.mark_processed()
+
+    # 120 s: janela cheia, só as páginas dos últimos 60 s (80 s e 120 s) contam
+    assert m.per_minute() == 2.0, m.per_minute()
+    clock.advance(120)
+    assert m.per_minute() == 0.0
+
+
+def test_write_textfile_is_atomic():
+    m, _ = metrics()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'sub' / 'ifood.prom'
+        m.write_textfile(path)
+        assert path.read_text(encoding='utf-8') == m.render()
+        assert [p.name for p in path.parent.iterdir()] == ['ifood.prom']
+
+
+def test_journal_and_cache_rows_are_not_throughput():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        rows = [{**{c: '' for c in DETAIL_COLUMNS}, 'URL': f'https://www.ifood.com.br/delivery/x/r{i}/{i:08d}',
+                 'Restaurante': f'R{i}', 'Endereco': f'Rua {i}'} for i in range(3)]
+        tasks = [(i, row['URL'], row['Restaurante']) for i, row in enumerate(rows)]
+
+        journal = DetailJournal(tmp / 'journal.jsonl')
+        journal.open()
+        for row in rows[:2]:
+            journal.append(row)
+        journal.close()
+
+        scraper = RestaurantDetailsScraper(csv_directory=tmp, resume=True)
+        scraper.journal = DetailJournal(tmp / 'journal.jsonl')
+        scraper._sink = OrderedCsvWriter(tmp / 'out.csv', DETAIL_COLUMNS)
+        scraper.metrics.start_run(len(tasks))
+
+        pending = scraper._restore_from_journal(tasks)
+        assert len(pending) == 1
+        scraper.journal.open(resume=True)
+        scraper.cache = FakeCache({rows[2]['URL']: rows[2]})
+        assert scraper._serve_from_cache(pending) == []
+        assert scraper.processed == 3 and len(scraper.metrics._completed) == 0
+
+        scraper._increment('processed', fetched=True)
+        assert scraper.processed == 4 and len(scraper.metrics._completed) == 1
+        scraper._sink.close()
+        scraper.journal.close()
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Testes da saída Parquet (src/parquet_sink.py), lendo o arquivo gravado.
+
+O schema do arquivo precisa ser o declarado, seja qual for o tipo de entrada
+(número do JS como int, texto vindo do journal): Pedido_Minimo float,
+Pag_* bool, datas como timestamp, Tempo Min/Max inteiros, Cidade/UF como
+dicionário e compressão zstd em todas as colunas. Sem pyarrow os testes são
+pulados.
+
+Uso:
+    python test_parquet_sink.py
+"""
+
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from src.parquet_sink import DEFAULT_COMPRESSION, open_writer, require_pyarrow
+from src.restaurant_details_scraper import DETAIL_COLUMNS
+from tests_support import run, Skip
+
+
+def pyarrow_or_skip():
+    try:
+        return require_pyarrow()
+    except ImportError:
+        raise Skip("pyarrow não instalado")
+
+
+def is_naive_timestamp(pa, arrow_type):
+    # Parquet não tem unidade de segundos: o timestamp('s') declarado volta como ms
+    return pa.types.is_timestamp(arrow_type) and arrow_type.tz is None
+
+
+def detail_row(n, **values):
+    row = {column: False for column in DETAIL_COLUMNS if column.startswith('Pag_')}
+    row.update({'URL': f'https://www.ifood.com.br/delivery/x/r{n}/{n:08d}', 'Restaurante': f'R{n}',
+                'Pedido_Minimo': 15.0, 'Endereco': f'Rua {n}, 10', 'Bairro': 'Centro', 'Cidade': 'Uberlandia',
+                'UF': 'MG', 'CEP': '38400-000', 'Data_Scraping': '2025-06-15 12:00:00'})
+    row.update(values)
+    return row
+
+
+def test_detail_file_has_declared_schema():
+    pa, pq = pyarrow_or_skip()
+    rows = [
+        detail_row(0, Pedido_Minimo=15, Pag_Site_PIX=True),            # número inteiro do --extraction js
+        detail_row(1, Pedido_Minimo='0', Pag_Site_PIX='True', Pag_Entrega_Dinheiro='False'),  # texto do journal
+        detail_row(2, Pedido_Minimo='25,5', Cidade='São Paulo', UF='SP'),
+        detail_row(3, Pedido_Minimo='N/A', Data_Scraping=''),
+        detail_row(4, Pag_Entrega_Dinheiro=1),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'detalhes.parquet'
+        sink = open_writer(path, DETAIL_COLUMNS, 'parquet', ordered=True)
+        sink.batch_size = 2  # mais de um row group
+        for index in (3, 0, 4, 1, 2):
+            sink.put(index, rows[index])
+        sink.close()
+
+        parquet = pq.ParquetFile(str(path))
+        schema = parquet.schema_arrow
+        table = parquet.read()
+        compressions = {parquet.metadata.row_group(g).column(c).compression
+                        for g in range(parquet.num_row_groups) for c in range(parquet.metadata.num_columns)}
+
+    assert schema.names == DETAIL_COLUMNS
+    assert schema.field('Pedido_Minimo').type == pa.float64()
+    assert all(schema.field(c).type == pa.bool_() for c in DETAIL_COLUMNS if c.startswith('Pag_'))
+    assert is_naive_timestamp(pa, schema.field('Data_Scraping').type)
+    assert pa.types.is_dictionary(schema.field('Cidade').type) and pa.types.is_dictionary(schema.field('UF').type)
+    assert schema.field('CEP').type == pa.string()
+    assert compressions == {DEFAULT_COMPRESSION.upper()}, compressions
+    assert parquet.num_row_groups > 1
+
+    data = table.to_pydict()
+    assert data['Restaurante'] == ['R0', 'R1', 'R2', 'R3', 'R4']  # ordem do índice
+    assert data['Pedido_Minimo'] == [15.0, 0.0, 25.5, None, 15.0]
+    assert data['Pag_Site_PIX'] == [True, True, False, False, False]
+    assert data['Pag_Entrega_Dinheiro'] == [False, False, False, False, True]
+    assert data['Data_Scraping'][0] == datetime(2025, 6, 15, 12, 0, 0) and data['Data_Scraping'][3] is None
+    assert data['Cidade'] == ['Uberlandia', 'Uberlandia', 'São Paulo', 'Uberlandia', 'Uberlandia']
+
+
+def test_listing_file_has_declared_schema():
+    pa, pq = pyarrow_or_skip()
+    columns = ['Data', 'URL', 'Restaurante', 'Nota', 'Tipo de comida', 'Distancia', 'Tempo Min', 'Tempo Max',
+               'Preco do Frete']
+    rows = [
+        {'Data': '2025-06-15 12:00:00', 'URL': 'u0', 'Restaurante': 'A', 'Nota': 4.6, 'Tipo de comida': 'Lanches',
+         'Distancia': '2,9', 'Tempo Min': 20, 'Tempo Max': '30', 'Preco do Frete': 9.99},
+        {'Data': '2025-06-15 12:00:00', 'URL': 'u1', 'Restaurante': 'B', 'Nota': 'N/A', 'Tipo de comida': 'Lanches',
+         'Distancia': 1.2, 'Tempo Min': 45.0, 'Tempo Max': 45, 'Preco do Frete': 0},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'listagem.parquet'
+        with open_writer(path, columns, 'parquet') as sink:
+            for row in rows:
+                sink.write(row)
+        table = pq.read_table(str(path))
+
+    schema = table.schema
+    assert is_naive_timestamp(pa, schema.field('Data').type)
+    assert schema.field('Tempo Min').type == pa.int16() and schema.field('Tempo Max').type == pa.int16()
+    assert all(schema.field(c).type == pa.float64() for c in ('Nota', 'Distancia', 'Preco do Frete'))
+    assert pa.types.is_dictionary(schema.field('Tipo de comida').type)
+
+    data = table.to_pydict()
+    assert data['Nota'] == [4.6, None] and data['Distancia'] == [2.9, 1.2]
+    assert data['Tempo Min'] == [20, 45] and data['Tempo Max'] == [30, 45]
+    assert data['Preco do Frete'] == [9.99, 0.0]
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Testes dos tempos por fase (src/phase_timer.py) nos caminhos de falha.
+
+Uma fase que levanta exceção também entra no resumo, então p50/p95/máx
+incluem as páginas que falharam: a página de detalhes com timeout conta em
+details.total, no passo em que falhou e no histograma das métricas, e uma
+listagem que falha no carregamento ainda grava `scrape` no JSON de tempos.
+
+Uso:
+    python test_phase_timer.py
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from selenium.common.exceptions import TimeoutException
+
+from src.ifood_scraper import IFoodScraper
+from src.phase_timer import PhaseTimer, timings_path
+from src.restaurant_details_scraper import RestaurantDetailsScraper
+from tests_support import run
+
+
+class TimeoutBrowser:
+    """Navegador cuja página nunca carrega."""
+
+    def get(self, url):
+        raise TimeoutException('timeout: page load')
+
+
+def test_failed_phase_is_recorded():
+    timer = PhaseTimer()
+    for fails in (False, True, True):
+        try:
+            with timer.phase('step'):
+                if fails:
+                    raise ValueError('falhou')
+        except ValueError:
+            pass
+
+    assert timer.summary()['step']['count'] == 3
+
+
+def test_failed_detail_page_is_timed():
+    scraper = RestaurantDetailsScraper(max_retries=0, retry_delay=0)
+    scraper.browser = TimeoutBrowser()
+
+    details = scraper._extract_details_with_retry('https://www.ifood.com.br/delivery/x/r/1', 'R')
+
+    assert details['endereco'] == 'Erro na extração' and scraper.errors == 1
+    summary = scraper.timer.summary()
+    assert summary['details.total']['count'] == 1
+    assert summary['details.step1_page']['count'] == 1
+    assert scraper.metrics.render().count('_page_seconds_count{source="browser"} 1') == 1
+
+
+def test_failed_listing_run_is_timed():
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / 'bd_scrap_ifood_10_20250615_120000.csv'
+        scraper = IFoodScraper(output_path=output)
+        scraper._setup_browser = lambda: None
+
+        def broken_load():
+            raise RuntimeError('listagem não abriu')
+
+        scraper._load_restaurants = broken_load
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert scraper.scrape() is False
+
+        summary = scraper.timer.summary()
+        assert summary['scrape']['count'] == 1 and summary['load_restaurants']['count'] == 1
+        phases = json.loads(timings_path(output).read_text(encoding='utf-8'))['phases']
+        assert 'scrape' in phases and 'load_restaurants' in phases
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
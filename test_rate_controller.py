@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Testes do ritmo adaptativo dos workers (src/rate_controller.py).
+
+Relógio falso e condição falsa (o wait avança o relógio em vez de dormir):
+cobre a reposição do token bucket, a espera por token, o passo aditivo, o
+corte pela metade por erro ou latência, o teto e as páginas de uma época
+anterior que não entram na janela nova.
+
+Uso:
+    python test_rate_controller.py
+"""
+
+import contextlib
+import io
+import sys
+
+from src.rate_controller import RateController
+from tests_support import run
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeCondition:
+    """Condition sem threads: wait(t) só avança o relógio falso."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.waits = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def wait(self, timeout=None):
+        assert timeout is not None, "esperaria para sempre por uma vaga"
+        self.waits.append(timeout)
+        self.clock.advance(timeout)
+
+    def notify_all(self):
+        pass
+
+
+def controller(**kwargs):
+    clock = FakeClock()
+    ctrl = RateController(clock=clock, **kwargs)
+    ctrl._cond = FakeCondition(clock)
+    return ctrl, clock
+
+
+def page(ctrl, clock, latency=1.0, ok=True):
+    """Uma página completa: espera o token, ocupa a vaga por `latency` s e libera."""
+    epoch = ctrl.acquire()
+    clock.advance(latency)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ctrl.release(epoch, latency, ok)
+
+
+def test_starts_with_one_worker_and_half_rate():
+    ctrl, _ = controller(max_workers=8, max_rate=2.0)
+    assert (ctrl.limit, ctrl.rate, ctrl.tokens) == (1, 1.0, 1.0)
+
+
+def test_bucket_refills_at_rate_up_to_capacity():
+    ctrl, clock = controller(max_workers=4, max_rate=2.0)
+    ctrl.acquire()
+    assert ctrl.tokens == 0.0
+
+    clock.advance(0.25)
+    ctrl._refill(clock())
+    assert ctrl.tokens == 0.25
+
+    clock.advance(60)
+    ctrl._refill(clock())
+    assert ctrl.tokens == 1.0  # capacidade = limite de workers (1)
+
+
+def test_acquire_waits_for_next_token():
+    ctrl, clock = controller(max_workers=4, max_rate=2.0)
+    ctrl.limit = 2
+    ctrl.acquire()
+    clock.advance(0.25)
+    ctrl.acquire()
+    assert ctrl._cond.waits == [0.75], ctrl._cond.waits  # falta 0,75 token a 1 pág/s
+    assert ctrl.active == 2
+
+
+def test_additive_increase_after_good_window():
+    ctrl, clock = controller(max_workers=4, max_rate=2.0, window=2)
+    page(ctrl, clock)
+    assert ctrl.decisions == []
+    page(ctrl, clock)
+
+    assert (ctrl.limit, round(ctrl.rate, 3)) == (2, 1.2)
+    decision = ctrl.decisions[-1]
+    assert decision['action'] == 'aumenta' and decision['workers'] == [1, 2]
+    assert decision['rate'] == [1.0, 1.2] and decision['pages'] == 2
+
+
+def test_error_rate_halves_limit_and_rate():
+    ctrl, clock = controller(max_workers=8, max_rate=2.0, window=4, max_error_rate=0.2)
+    ctrl.limit, ctrl.rate = 6, 1.6
+    for ok in (True, False, True, True):  # 25% de erro
+        page(ctrl, clock, ok=ok)
+
+    assert (ctrl.limit, ctrl.rate) == (3, 0.8)
+    assert ctrl.decisions[-1]['action'] == 'reduz' and ctrl.decisions[-1]['reason'].startswith('erro')
+
+
+def test_slow_pages_halve_down_to_minimum():
+    ctrl, clock = controller(max_workers=4, max_rate=0.2, window=1, target_latency=5.0, min_rate=0.05)
+    for _ in range(4):
+        page(ctrl, clock, latency=9.0)
+
+    assert (ctrl.limit, ctrl.rate) == (1, 0.05)
+    assert ctrl.decisions[0]['reason'].startswith('p50')
+    assert ctrl.decisions[0]['rate'] == [0.1, 0.05]
+
+
+def test_ceiling_keeps_epoch_and_records_decision():
+    ctrl, clock = controller(max_workers=1, max_rate=1.0, window=1)
+    ctrl.rate = 1.0
+    epoch = ctrl._epoch
+    page(ctrl, clock)
+
+    assert (ctrl.limit, ctrl.rate, ctrl._epoch) == (1, 1.0, epoch)
+    assert ctrl.decisions[-1]['workers'] == [1, 1]
+
+
+def test_pages_from_previous_epoch_do_not_count():
+    ctrl, clock = controller(max_workers=4, max_rate=2.0, window=2, target_latency=5.0)
+    page(ctrl, clock)
+    page(ctrl, clock)
+    assert ctrl.limit == 2
+
+    old = ctrl.acquire()  # começa sob o limite 2, termina depois do corte
+    page(ctrl, clock, latency=9.0)
+    page(ctrl, clock, latency=9.0)
+    assert ctrl.limit == 1 and len(ctrl.decisions) == 2
+
+    ctrl.release(old, 0.5, True)
+    page(ctrl, clock)
+    assert len(ctrl.decisions) == 2  # só 1 página da época atual na janela
+    page(ctrl, clock)
+    assert len(ctrl.decisions) == 3 and ctrl.decisions[-1]['pages'] == 2
+
+
+def test_throughput_uses_window_duration():
+    ctrl, clock = controller(max_workers=4, max_rate=2.0, window=2)
+    page(ctrl, clock, latency=1.0)
+    page(ctrl, clock, latency=1.0)
+    assert ctrl.decisions[-1]['throughput'] == 1.0  # 2 páginas em 2 s
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
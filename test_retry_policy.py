@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Testes da política de retry das etapas do Selenium (src/retry_policy.py).
+
+Sem navegador e sem esperas: o jitter vem de um random.Random com seed (ou
+de um falso que devolve os extremos) e o sleep só anota a espera. Cobre a
+classificação das exceções, falhas permanentes, stale sem espera, limites
+do backoff e o esgotamento dos orçamentos por etapa e global.
+
+Uso:
+    python test_retry_policy.py
+"""
+
+import contextlib
+import io
+import random
+import sys
+import threading
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException, NoSuchElementException, NoSuchWindowException,
+    StaleElementReferenceException, TimeoutException, WebDriverException
+)
+from urllib3.exceptions import ProtocolError
+
+from src.retry_policy import RetryPolicy, STEP_RETRY_ON, classify
+from tests_support import run
+
+
+class EdgeRng:
+    """uniform(a, b) sempre no extremo escolhido."""
+
+    def __init__(self, high):
+        self.high = high
+
+    def uniform(self, a, b):
+        return b if self.high else a
+
+
+def policy(**kwargs):
+    sleeps = []
+    kwargs.setdefault('rng', random.Random(7))
+    return RetryPolicy(sleep=sleeps.append, **kwargs), sleeps
+
+
+def failing(*errors, result='ok'):
+    """fn(tentativa) que levanta os erros na ordem e depois devolve `result`; anota as tentativas."""
+    calls = []
+
+    def fn(attempt):
+        calls.append(attempt)
+        if attempt < len(errors):
+            raise errors[attempt]
+        return result
+    return fn, calls
+
+
+def raises(fn, exc_type):
+    try:
+        fn()
+    except exc_type:
+        return True
+    return False
+
+
+def test_classify():
+    cases = [
+        (TimeoutException(), 'timeout'),
+        (StaleElementReferenceException(), 'stale'),
+        (NoSuchElementException(), 'missing'),
+        (InvalidSessionIdException(), 'crash'),
+        (NoSuchWindowException(), 'crash'),
+        (ProtocolError('Connection aborted.'), 'crash'),
+        (ConnectionRefusedError(), 'crash'),
+        (WebDriverException('unknown error: Chrome not reachable'), 'crash'),
+        (WebDriverException('tab crashed'), 'crash'),
+        (WebDriverException('element click intercepted'), 'other'),
+        (WebDriverException(), 'other'),
+        (ValueError('x'), 'other'),
+    ]
+    wrong = [(type(exc).__name__, kind, classify(exc)) for exc, kind in cases if classify(exc) != kind]
+    assert not wrong, wrong
+
+
+def test_retries_until_success_with_backoff():
+    retry, sleeps = policy(retries=2)
+    fn, calls = failing(TimeoutException(), TimeoutException())
+
+    assert retry.run('page', fn) == 'ok'
+    assert calls == [0, 1, 2]
+    assert len(sleeps) == 2 and 0.5 <= sleeps[0] <= 1.0 and 1.0 <= sleeps[1] <= 2.0, sleeps
+    assert retry.spent == 2 and retry.waited == sum(sleeps)
+    assert retry.stats == {'page.timeout': {'retries': 2, 'gave_up': 0}}
+
+
+def test_step_budget_exhausted_raises_last_error():
+    retry, sleeps = policy(retries=2)
+    fn, calls = failing(*[TimeoutException()] * 5)
+
+    assert raises(lambda: retry.run('page', fn), TimeoutException)
+    assert calls == [0, 1, 2] and len(sleeps) == 2
+    assert retry.stats['page.timeout'] == {'retries': 2, 'gave_up': 1}
+
+
+def test_step_retries_override_default():
+    retry, _ = policy(retries=3, step_retries={'page': 0})
+    fn, calls = failing(TimeoutException())
+    assert raises(lambda: retry.run('page', fn), TimeoutException)
+    assert calls == [0] and retry.retries['about'] == 3
+
+
+def test_permanent_failure_is_not_retried():
+    retry, sleeps = policy(retries=3)
+    fn, calls = failing(NoSuchElementException())  # página sem a aba "Pagamento"
+
+    assert raises(lambda: retry.run('payment_tab', fn), NoSuchElementException)
+    assert calls == [0] and sleeps == [] and retry.spent == 0
+    assert retry.stats['payment_tab.missing'] == {'retries': 0, 'gave_up': 1}
+
+
+def test_stale_retries_without_delay():
+    retry, sleeps = policy(retries=1)
+    fn, calls = failing(StaleElementReferenceException())
+    seen = []
+
+    assert retry.run('about', fn, on_retry=lambda *args: seen.append(args)) == 'ok'
+    assert calls == [0, 1] and sleeps == []
+    assert seen == [('about', 'stale', 0, 0.0)]
+
+
+def test_global_budget_stops_all_steps():
+    retry, _ = policy(retries=5, budget=2)
+    out = io.StringIO()
+
+    with contextlib.redirect_stdout(out):
+        fn, calls = failing(*[TimeoutException()] * 5)
+        assert raises(lambda: retry.run('page', fn), TimeoutException)
+        assert calls == [0, 1, 2]
+
+        fn, calls = failing(StaleElementReferenceException())
+        assert raises(lambda: retry.run('about', fn), StaleElementReferenceException)
+        assert calls == [0]
+
+    assert retry.spent == 2
+    assert out.getvalue().count('Orçamento global de retries esgotado') == 1
+
+
+def test_zero_budget_never_retries():
+    retry, sleeps = policy(retries=3, budget=0)
+    fn, calls = failing(StaleElementReferenceException())
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert raises(lambda: retry.run('ver_mais', fn), StaleElementReferenceException)
+    assert calls == [0] and retry.spent == 0
+
+
+def test_global_budget_is_shared_between_threads():
+    retry, _ = policy(retries=100, budget=10)
+
+    def worker():
+        fn, _ = failing(*[StaleElementReferenceException()] * 200)
+        try:
+            retry.run('about', fn)
+        except StaleElementReferenceException:
+            pass
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert retry.spent == 10
+    assert retry.stats['about.stale'] == {'retries': 10, 'gave_up': 8}
+
+
+def test_backoff_bounds_and_cap():
+    low = RetryPolicy(base_delay=1.0, max_delay=30.0, rng=EdgeRng(high=False))
+    high = RetryPolicy(base_delay=1.0, max_delay=30.0, rng=EdgeRng(high=True))
+
+    assert [low.delay(a) for a in range(7)] == [0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 15.0]
+    assert [high.delay(a) for a in range(7)] == [1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0]
+
+
+def test_seeded_jitter_is_reproducible():
+    first = RetryPolicy(rng=random.Random(3))
+    second = RetryPolicy(rng=random.Random(3))
+    assert [first.delay(a) for a in range(5)] == [second.delay(a) for a in range(5)]
+
+
+def test_invalid_configuration():
+    assert raises(lambda: RetryPolicy(step_retries={'checkout': 1}), ValueError)
+    assert raises(lambda: RetryPolicy(budget=-1), ValueError)
+
+
+def test_cli_steps_are_policy_steps():
+    # main_details.py valida --step-retries sem importar este módulo (CLI sem selenium)
+    from main_details import RETRY_STEPS
+    assert set(RETRY_STEPS) <= set(STEP_RETRY_ON), set(RETRY_STEPS) - set(STEP_RETRY_ON)
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Testes da parada dos workers de detalhes (RestaurantDetailsScraper).
+
+Navegadores falsos no lugar do Chrome: ao interromper (Ctrl+C ou exceção),
+os workers param de pegar tarefas, quem está preso numa página tem o
+navegador fechado, todos os navegadores são fechados e só depois disso o
+CSV e o journal são fechados. Depois de uma queda do Chrome, a reabertura
+é tentada de novo e, se o navegador não volta, o worker encerra em vez de
+falhar em todas as páginas seguintes.
+
+Uso:
+    python test_worker_shutdown.py
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+
+import src.restaurant_details_scraper as details_module
+from src.restaurant_details_scraper import RestaurantDetailsScraper
+from tests_support import run
+
+
+OK = {'pedido_minimo': 10.0, 'endereco': 'Rua X, 1', 'bairro': 'Centro', 'cidade': 'Uberlandia',
+      'uf': 'MG', 'cep': '38400-000', **details_module.NO_PAYMENT_METHODS}
+FAILED = {**OK, 'endereco': 'Erro na extração'}
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def quit(self):
+        self.closed.set()
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+
+@contextlib.contextmanager
+def fake_chrome(fails=lambda n: False):
+    """
+    launch_chrome/resolve_driver_path falsos; devolve a lista de navegadores abertos.
+
+    fails(n) decide se a n-ésima abertura (a partir de 0) falha.
+    """
+    opened = []
+    launches = []
+    saved = details_module.launch_chrome, details_module.resolve_driver_path
+
+    def launch(*args, **kwargs):
+        launches.append(len(launches))
+        if fails(launches[-1]):
+            raise WebDriverException('unknown error: Chrome failed to start')
+        opened.append(FakeBrowser())
+        return opened[-1]
+
+    details_module.launch_chrome = launch
+    details_module.resolve_driver_path = lambda *args: '/fake/chromedriver'
+    try:
+        yield opened
+    finally:
+        details_module.launch_chrome, details_module.resolve_driver_path = saved
+
+
+def scraper_with_pages(tmp, workers, extract=None, **kwargs):
+    """Scraper com `extract(url)` no lugar da página e gravações anotadas em `events`."""
+    scraper = RestaurantDetailsScraper(csv_directory=tmp, workers=workers, **kwargs)
+    events = []
+    if extract:
+        scraper._extract_paced = lambda url, name: extract(scraper, url)
+    record = scraper._record
+
+    def recording(index, row, source='scraped'):
+        events.append(('put', index))
+        record(index, row, source)
+
+    scraper._record = recording
+    return scraper, events
+
+
+def write_listing(tmp, count):
+    urls = [f'https://www.ifood.com.br/delivery/x/r{i}/{i:08x}-0000-4000-8000-000000000000' for i in range(count)]
+    pd.DataFrame({'URL': urls, 'Restaurante': [f'R{i}' for i in range(count)]}).to_csv(
+        tmp / 'bd_scrap_ifood_10_20250615_120000.csv', index=False)
+
+
+def test_stop_workers_waits_and_quits_every_browser():
+    with tempfile.TemporaryDirectory() as tmp, fake_chrome() as opened:
+        def extract(scraper, url):
+            time.sleep(0.01)
+            return OK
+
+        scraper, events = scraper_with_pages(Path(tmp), 3, extract)
+        scraper._sink = details_module.open_writer(Path(tmp) / 'out.csv', details_module.DETAIL_COLUMNS, 'csv', ordered=True)
+        tasks = [(i, f'https://www.ifood.com.br/delivery/x/r{i}/{i:08d}', f'R{i}') for i in range(500)]
+        runner = threading.Thread(target=scraper._run_workers, args=(tasks, len(tasks), 'agora'))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            runner.start()
+            while len(events) < 10:
+                time.sleep(0.005)
+            scraper._stop_workers(timeout=5)
+            written = len(events)
+            runner.join(5)
+
+        assert not runner.is_alive() and not any(t.is_alive() for t in threading.enumerate() if t.name.startswith('details-worker'))
+        assert len(opened) == 3 and all(b.closed.is_set() for b in opened)
+        assert scraper._browsers == set()
+        assert len(events) == written < len(tasks)  # nada gravado depois da parada
+        scraper._sink.close()
+
+
+def test_stuck_page_is_aborted_and_not_recorded():
+    with tempfile.TemporaryDirectory() as tmp, fake_chrome() as opened:
+        def extract(scraper, url):
+            # Página que só termina quando o navegador é fechado (como um get() travado)
+            scraper.browser.closed.wait(10)
+            return FAILED
+
+        scraper, events = scraper_with_pages(Path(tmp), 2, extract)
+        tasks = [(i, f'https://www.ifood.com.br/delivery/x/r{i}/{i:08d}', f'R{i}') for i in range(4)]
+        runner = threading.Thread(target=scraper._run_workers, args=(tasks, len(tasks), 'agora'))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            runner.start()
+            while len(opened) < 2:
+                time.sleep(0.005)
+            start = time.monotonic()
+            scraper._stop_workers(timeout=0.2)
+            runner.join(5)
+
+        assert time.monotonic() - start < 5
+        assert not runner.is_alive() and all(b.closed.is_set() for b in opened)
+        assert events == []  # erro causado pela parada não vai para CSV/journal
+
+
+def test_interrupted_run_closes_output_after_workers():
+    with tempfile.TemporaryDirectory() as tmp, fake_chrome() as opened:
+        tmp = Path(tmp)
+        write_listing(tmp, 200)
+        first_page = threading.Event()
+
+        def extract(scraper, url):
+            first_page.set()
+            time.sleep(0.01)
+            return OK
+
+        scraper, events = scraper_with_pages(tmp, 3, extract)
+        run_workers = scraper._run_workers
+
+        def interrupted(tasks, total, current_time):
+            threading.Thread(target=run_workers, args=(tasks, total, current_time)).start()
+            first_page.wait(5)
+            raise KeyboardInterrupt  # Ctrl+C na thread principal
+
+        scraper._run_workers = interrupted
+        open_output = scraper._open_output
+
+        def tracked_output():
+            open_output()
+            close = scraper._sink.close
+            scraper._sink.close = lambda: (events.append(('close', None)), close())[1]
+
+        scraper._open_output = tracked_output
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                scraper.scrape_details()
+            except KeyboardInterrupt:
+                pass
+            else:
+                raise AssertionError("esperava KeyboardInterrupt")
+
+        assert events and events[-1] == ('close', None), events[-3:]
+        assert events.count(('close', None)) == 1
+        assert len(opened) == 3 and all(b.closed.is_set() for b in opened)
+        assert not any(t.is_alive() for t in threading.enumerate() if t.name.startswith('details-worker'))
+
+
+def crash(url):
+    raise InvalidSessionIdException('invalid session id')
+
+
+def test_restart_tries_again_when_chrome_fails_to_open():
+    with fake_chrome(fails=lambda n: n == 1) as opened:
+        scraper = RestaurantDetailsScraper()
+        with contextlib.redirect_stdout(io.StringIO()):
+            scraper._setup_browser()
+            scraper._restart_browser()
+
+        assert len(opened) == 2 and opened[0].closed.is_set()
+        assert scraper.browser is opened[1] and scraper._browsers == {opened[1]}
+
+
+def test_worker_without_browser_stops_instead_of_failing_every_page():
+    both_open = threading.Barrier(2)
+    broken = threading.Event()
+
+    def crash_both(url):
+        both_open.wait(5)  # os dois workers já abriram o navegador
+        broken.set()
+        crash(url)
+
+    with tempfile.TemporaryDirectory() as tmp, fake_chrome(fails=lambda n: broken.is_set()) as opened:
+        scraper, events = scraper_with_pages(Path(tmp), 2, retry_delay=0)
+        scraper._extract_full = crash_both  # Chrome cai na 1ª página de cada worker e não reabre
+        scraper._sink = details_module.open_writer(Path(tmp) / 'out.csv', details_module.DETAIL_COLUMNS, 'csv', ordered=True)
+        tasks = [(i, f'https://www.ifood.com.br/delivery/x/r{i}/{i:08d}', f'R{i}') for i in range(6)]
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            try:
+                scraper._run_workers(tasks, len(tasks), 'agora')
+            except RuntimeError as e:
+                assert '4 restaurantes sem navegador' in str(e), e
+            else:
+                raise AssertionError("esperava RuntimeError com tarefas sobrando")
+
+        assert len(events) == 2 and scraper.errors == 2  # só a página em que o Chrome caiu
+        assert 'AttributeError' not in out.getvalue()
+        assert out.getvalue().count('worker encerrado') == 2
+        assert len(opened) == 2 and all(b.closed.is_set() for b in opened) and scraper._browsers == set()
+        scraper._sink.close()
+
+
+def test_sequential_run_stops_without_browser():
+    with tempfile.TemporaryDirectory() as tmp, fake_chrome(fails=lambda n: n >= 1):
+        scraper, events = scraper_with_pages(Path(tmp), 1, retry_delay=0)
+        scraper._extract_full = crash
+        scraper._sink = details_module.open_writer(Path(tmp) / 'out.csv', details_module.DETAIL_COLUMNS, 'csv', ordered=True)
+        tasks = [(i, f'https://www.ifood.com.br/delivery/x/r{i}/{i:08d}', f'R{i}') for i in range(3)]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                scraper._scrape_sequential(tasks, len(tasks), 'agora')
+            except RuntimeError as e:
+                assert 'não reabriu' in str(e), e
+            else:
+                raise AssertionError("esperava RuntimeError sem navegador")
+
+        assert len(events) == 1 and scraper.errors == 1
+        scraper._sink.close()
+
+
+if __name__ == "__main__":
+    sys.exit(run(globals()))
@@ -0,0 +1,47 @@
+"""
+Executor comum dos scripts de teste (test_*.py).
+
+Cada script roda as próprias funções test_* sem depender do pytest:
+
+    if __name__ == "__main__":
+        sys.exit(run(globals()))
+
+Uma exceção qualquer (não só AssertionError) conta como falha daquele teste
+e os demais continuam rodando. Um teste que depende de algo ausente (Chrome,
+pyarrow...) levanta Skip e aparece como pulado, sem contar como falha.
+"""
+
+import traceback
+import unittest
+
+
+class Skip(unittest.SkipTest):
+    """Teste pulado: falta uma dependência opcional do ambiente (o pytest também o trata como skip)."""
+
+
+def run(namespace):
+    """
+    Executa as funções test_* de `namespace` (o globals() do script), na ordem
+    em que foram definidas, imprimindo ✅/❌ por teste.
+
+    Returns:
+        int: 1 se algum teste falhou, 0 caso contrário (código de saída)
+    """
+    tests = [(name, fn) for name, fn in namespace.items() if name.startswith('test_') and callable(fn)]
+    failures = 0
+
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✅ {name}")
+        except Skip as e:
+            print(f"⏭️ {name}: {e}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {name}: {e}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {name}: {type(e).__name__}: {e}")
+            traceback.print_exc()
+
+    return 1 if failures else 0